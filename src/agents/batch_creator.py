@@ -0,0 +1,237 @@
+"""Batch API character creation for non-interactive bulk requests."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import logfire
+from openai import AsyncOpenAI
+from pydantic_ai.profiles.openai import OpenAIJsonSchemaTransformer
+
+from agents.character_creator import (
+    CHARACTER_CREATION_PROMPT,
+    CharacterCreationRequest,
+    build_character_prompt,
+)
+
+BATCH_ENDPOINT = '/v1/chat/completions'
+BATCH_TERMINAL_STATUSES = {'completed', 'failed', 'expired', 'cancelled'}
+
+# Strict-mode output schema, transformed the same way NativeOutput(strict=True) does it
+CHARACTER_OUTPUT_SCHEMA = OpenAIJsonSchemaTransformer(
+    CharacterCreationRequest.model_json_schema(), strict=True
+).walk()
+
+
+class BatchCharacterCreator:
+    """
+    Creates characters through the OpenAI Batch API.
+
+    Renders the same system prompt, user prompt and output schema the character
+    creation agent would send, but submits all of them as a single batch job.
+    Batch jobs are billed at a discount and are not latency-sensitive, which
+    suits bulk character creation during scenario setup.
+    """
+
+    def __init__(
+        self,
+        client: Optional[AsyncOpenAI] = None,
+        model_name: Optional[str] = None,
+        poll_interval: float = 30.0,
+        max_poll_interval: float = 300.0
+    ):
+        """
+        Initialize the batch character creator.
+
+        Args:
+            client: OpenAI client, created from OPENAI_API_KEY if omitted
+            model_name: Model to run the batch with, defaults to LLM_MODEL
+            poll_interval: Initial delay in seconds between batch status checks
+            max_poll_interval: Upper bound for the exponential poll backoff
+        """
+        self.client = client or AsyncOpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        self.model_name = model_name or os.getenv('LLM_MODEL', 'gpt-4o-mini')
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+
+    def build_request_line(self, index: int, character_concept: str, story_context: str = "") -> Dict[str, Any]:
+        """
+        Build one batch request line for a character concept.
+
+        Args:
+            index: Position of the concept, used for the custom_id
+            character_concept: Basic concept or description of the character
+            story_context: Additional story context for character creation
+
+        Returns:
+            Batch request dictionary for the chat completions endpoint
+        """
+        return {
+            'custom_id': f'char-{index}',
+            'method': 'POST',
+            'url': BATCH_ENDPOINT,
+            'body': {
+                'model': self.model_name,
+                'messages': [
+                    {'role': 'system', 'content': CHARACTER_CREATION_PROMPT},
+                    {'role': 'user', 'content': build_character_prompt(character_concept, story_context)},
+                ],
+                'response_format': {
+                    'type': 'json_schema',
+                    'json_schema': {
+                        'name': 'CharacterCreationRequest',
+                        'schema': CHARACTER_OUTPUT_SCHEMA,
+                        'strict': True,
+                    },
+                },
+            },
+        }
+
+    def write_batch_file(self, character_concepts: List[str], story_context: str = "") -> Path:
+        """
+        Write all character requests to a temporary JSONL batch file.
+
+        Args:
+            character_concepts: List of character concepts
+            story_context: Additional story context for character creation
+
+        Returns:
+            Path to the written batch file
+        """
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False, encoding='utf-8') as f:
+            for i, concept in enumerate(character_concepts):
+                f.write(json.dumps(self.build_request_line(i, concept, story_context)) + '\n')
+        return Path(f.name)
+
+    async def submit_batch(self, batch_file: Path) -> str:
+        """
+        Upload a batch file and create the batch job.
+
+        Args:
+            batch_file: Path to the JSONL batch file
+
+        Returns:
+            ID of the created batch
+        """
+        with open(batch_file, 'rb') as f:
+            uploaded = await self.client.files.create(file=f, purpose='batch')
+
+        batch = await self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window='24h'
+        )
+        return batch.id
+
+    async def wait_for_batch(self, batch_id: str) -> Any:
+        """
+        Poll a batch until it reaches a terminal status.
+
+        Args:
+            batch_id: ID of the batch to poll
+
+        Returns:
+            The final batch object
+        """
+        delay = self.poll_interval
+        while True:
+            batch = await self.client.batches.retrieve(batch_id)
+            if batch.status in BATCH_TERMINAL_STATUSES:
+                return batch
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_poll_interval)
+
+    def parse_results(self, output_text: str) -> Dict[str, CharacterCreationRequest]:
+        """
+        Parse a batch output file into character requests keyed by custom_id.
+
+        Lines that failed or do not match the character schema are logged and skipped.
+
+        Args:
+            output_text: Contents of the batch output JSONL file
+
+        Returns:
+            Dictionary mapping custom_id to the parsed CharacterCreationRequest
+        """
+        results = {}
+        for line in output_text.splitlines():
+            if not line.strip():
+                continue
+
+            entry = json.loads(line)
+            custom_id = entry.get('custom_id')
+            try:
+                response = entry['response']
+                if response.get('status_code') != 200:
+                    raise ValueError(f"status code {response.get('status_code')}")
+                content = response['body']['choices'][0]['message']['content']
+                results[custom_id] = CharacterCreationRequest.model_validate_json(content)
+            except Exception as e:
+                logfire.warning(
+                    'Skipping failed batch character result',
+                    custom_id=custom_id,
+                    error=str(e)
+                )
+
+        return results
+
+    async def create_characters(self, character_concepts: List[str], story_context: str = "") -> List[CharacterCreationRequest]:
+        """
+        Create characters for all concepts in a single batch job.
+
+        Args:
+            character_concepts: List of character concepts
+            story_context: Additional story context for character creation
+
+        Returns:
+            Character requests for the concepts that succeeded, in concept order
+
+        Raises:
+            RuntimeError: If the batch does not complete
+        """
+        with logfire.span(
+            'Creating characters with batch API',
+            character_count=len(character_concepts),
+            model_name=self.model_name
+        ) as span:
+            if not character_concepts:
+                return []
+
+            batch_file = self.write_batch_file(character_concepts, story_context)
+            try:
+                batch_id = await self.submit_batch(batch_file)
+            finally:
+                batch_file.unlink(missing_ok=True)
+
+            span.set_attribute('batch_id', batch_id)
+
+            batch = await self.wait_for_batch(batch_id)
+            span.set_attribute('batch_status', batch.status)
+
+            if batch.status != 'completed' or not batch.output_file_id:
+                raise RuntimeError(f"Batch {batch_id} ended with status '{batch.status}'")
+
+            output = await self.client.files.content(batch.output_file_id)
+            results = self.parse_results(output.text)
+
+            char_requests = [
+                results[f'char-{i}']
+                for i in range(len(character_concepts))
+                if f'char-{i}' in results
+            ]
+
+            span.set_attribute('characters_created', len(char_requests))
+            logfire.info(
+                'Batch character creation completed',
+                batch_id=batch_id,
+                requested=len(character_concepts),
+                created=len(char_requests)
+            )
+
+            return char_requests
@@ -2,19 +2,26 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
 import os
+import time
 from dataclasses import dataclass
-from typing import Optional
+from typing import AsyncIterator, Optional, Tuple
 
 import httpx
 import logfire
 from dotenv import load_dotenv
 from pydantic_ai import Agent, RunContext
-from pydantic_ai.models.openai import OpenAIModel
-from pydantic_ai.providers.openai import OpenAIProvider
 
-from models.story import StoryWorld
+from models.story import Character, Scene, StoryWorld
+from utils.helpers import preview_text
+from utils.telemetry import setup_telemetry
+from agents.http_client import get_http_client
+from agents.model import get_model, get_model_name
 from agents.prompts import CHARACTER_SYSTEM_PROMPT
+from agents.response_cache import RESPONSE_CACHE_ENABLED, ResponseCache
 
 load_dotenv()
 
@@ -32,63 +39,138 @@ class StoryDeps:
     client: httpx.AsyncClient
 
 
-def get_model() -> OpenAIModel:
+# Reason: per-call previews and counts are only worth serializing when debugging
+VERBOSE_SPANS = os.getenv('LOGFIRE_VERBOSE', '').lower() in ('1', 'true', 'yes')
+
+
+# Opt-in: prefill each newly created character's prompt while the caller continues
+CHARACTER_PROMPT_WARMUP = os.getenv('CHARACTER_PROMPT_WARMUP', '').lower() in ('1', 'true', 'yes')
+
+# Profile size (characters) above which a static context rebuild runs in a worker thread
+STATIC_CONTEXT_OFFLOAD_THRESHOLD = int(os.getenv('STATIC_CONTEXT_OFFLOAD_THRESHOLD', '65536'))
+
+
+# Responses for identical character prompts, used when CHARACTER_RESPONSE_CACHE is set
+character_response_cache = ResponseCache(maxsize=512)
+
+
+@functools.lru_cache(maxsize=1)
+def get_character_agent() -> Agent[StoryDeps, str]:
     """
-    Get the configured LLM model.
+    Get the character embodiment agent (no tools - just responds as character).
+    
+    The agent is built on first use and reused afterwards, so importing this
+    module stays cheap.
     
     Returns:
-        Configured OpenAI model instance
+        Shared character agent
     """
-    llm = os.getenv('LLM_MODEL', 'gpt-4o-mini')
+    return Agent(
+        get_model(),
+        system_prompt=CHARACTER_SYSTEM_PROMPT,
+        deps_type=StoryDeps,
+        retries=2
+    )
 
-    # Use OpenRouter if key is available, otherwise use OpenAI
-    if os.getenv('OPEN_ROUTER_API_KEY'):
-        
-            provider = OpenAIProvider(
-                base_url='https://openrouter.ai/api/v1',
-                api_key=os.getenv('OPEN_ROUTER_API_KEY'))
-
-            return OpenAIModel(
-                model_name='gpt-4o-mini',
-                provider=provider
-                )
 
+def build_static_character_context(character: Character, scene: Scene) -> str:
+    """
+    Build the cacheable part of a character prompt.
+    
+    Only the character profile and the current scene go here, so the text is
+    byte-identical between turns and the provider can serve it from its
+    prompt-prefix cache. The block is memoized on the character and rebuilt
+    only when the profile revision or the scene revision changes.
+    
+    Args:
+        character: The character being embodied
+        scene: The scene the character is currently in
+    
+    Returns:
+        The static context block
+    """
+    # Reason: tuple comparison checks identity first, so the common case of the
+    # same scene object is a few pointer and int comparisons.
+    key = (character.revision, scene, scene.revision)
+    cached = character._prompt_block
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    block = f"""
+Character: {character.name}
+Description: {character.description}
+Personality: {character.personality}
+Speech Patterns: {character.speech_patterns}
+Relationships: {character.relationships_text}
 
-    else:
-        return OpenAIModel(llm, api_key=os.getenv('OPENAI_API_KEY'))
+{scene.prompt_block}"""
+    character._prompt_block = (key, block)
+    return block
 
 
-# Configure logfire with comprehensive instrumentation
-logfire_token = os.getenv('LOGFIRE_TOKEN')
-if logfire_token:
-    logfire.configure(token=logfire_token, inspect_arguments=False)
-else:
-    logfire.configure(send_to_logfire='if-token-present', inspect_arguments=False)
+def _should_offload_static_context(character: Character, scene: Scene) -> bool:
+    """Check whether building the static context is large enough to run off the event loop."""
+    cached = character._prompt_block
+    if cached is not None and cached[0] == (character.revision, scene, scene.revision):
+        return False
 
-# Enable instrumentation if available
-try:
-    logfire.instrument_pydantic_ai()  # Instrument PydanticAI for comprehensive LLM call logging
-except Exception as e:
-    pass  # Gracefully handle missing dependencies
+    profile_size = (
+        len(character.description) + len(character.personality) + len(character.speech_patterns)
+        + sum(len(other) + len(rel) for other, rel in character.relationships.items())
+        + len(scene.description)
+    )
+    return profile_size > STATIC_CONTEXT_OFFLOAD_THRESHOLD
 
-try:
-    logfire.instrument_openai()  # Instrument OpenAI provider
-except Exception as e:
-    pass  # Gracefully handle missing dependencies
 
-try:
-    logfire.instrument_httpx()  # Instrument HTTP calls
-except Exception as e:
-    pass  # Gracefully handle missing dependencies
+@functools.lru_cache(maxsize=256)
+def get_prompt_cache_key(static_context: str) -> str:
+    """
+    Get the provider prompt cache key for a static character context.
+    
+    Requests sharing a key are routed to the same provider cache, so the system
+    prompt and character profile prefix is prefilled once and reused. The key
+    changes whenever the static context does, which follows the character's
+    revision counter.
+    
+    Args:
+        static_context: Output of build_static_character_context
+        
+    Returns:
+        Hex digest identifying the model, system prompt and profile prefix
+    """
+    digest = hashlib.sha256((get_model_name() + CHARACTER_SYSTEM_PROMPT + static_context).encode('utf-8'))
+    return digest.hexdigest()[:32]
 
 
-# Create the character agent (no tools - just responds as character)
-character_agent = Agent(
-    get_model(),
-    system_prompt=CHARACTER_SYSTEM_PROMPT,
-    deps_type=StoryDeps,
-    retries=2
-)
+async def warm_character_prompt(deps: StoryDeps, character_name: str) -> None:
+    """
+    Prefill a character's static prompt so the provider caches it before the first real turn.
+    
+    Sends the system prompt and static character/scene block with a one-token
+    budget and the same prompt cache key embody_character uses. Memories are
+    not touched and failures are only logged, since this is a speculative
+    optimization.
+    
+    Args:
+        deps: Story dependencies containing the character's story world
+        character_name: Name of the character to warm up
+    """
+    with logfire.span('Character prompt warmup: {character_name}', character_name=character_name) as span:
+        try:
+            character = deps.story_world.characters[character_name]
+            static_context = build_static_character_context(character, deps.story_world.current_scene)
+            await get_character_agent().run(
+                [static_context],
+                deps=deps,
+                model_settings={
+                    'max_tokens': 1,
+                    'extra_body': {'prompt_cache_key': get_prompt_cache_key(static_context)}
+                }
+            )
+            span.set_attribute('warmed', True)
+        except Exception as e:
+            span.set_attribute('warmed', False)
+            logfire.warning('Character prompt warmup failed', character_name=character_name, error=str(e))
 
 
 # This function is used as a tool by the storyteller agent
@@ -114,81 +196,163 @@ async def embody_character(
     Raises:
         ValueError: If the character is not found in the story world
     """
-    with logfire.span(
-        'Character embodiment: {character_name}',
-        character_name=character_name,
-        situation=situation[:100] + '...' if len(situation) > 100 else situation
-    ) as span:
-        # Get the character from the story world
-        character = ctx.deps.story_world.characters.get(character_name)
-
-        if not character:
-            span.set_attribute('character_found', False)
-            logfire.error(
-                'Character not found in story world',
-                character_name=character_name,
-                available_characters=list(ctx.deps.story_world.characters.keys())
+    with logfire.span('Character embodiment: {character_name}', character_name=character_name) as span:
+        character = _get_character(ctx.deps.story_world, character_name, span)
+
+        started = time.perf_counter()
+        scene = ctx.deps.story_world.current_scene
+        static_context, dynamic_context = await _build_character_prompt(character, scene, situation)
+        context_built = time.perf_counter()
+
+        response = None
+        cache_key = None
+        if RESPONSE_CACHE_ENABLED:
+            cache_key = ResponseCache.make_key(get_model_name(), static_context, dynamic_context)
+            response = character_response_cache.get(cache_key)
+        span.set_attribute('response_cache_hit', response is not None)
+
+        if response is None:
+            # Run the character agent to get the response
+            result = await get_character_agent().run(
+                [static_context, dynamic_context],
+                deps=ctx.deps,
+                model_settings=_character_model_settings(static_context)
             )
-            raise ValueError(f"Character '{character_name}' not found in the story world")
-
-        span.set_attribute('character_found', True)
-        span.set_attribute('character_description', character.description[:100] + '...' if len(character.description) > 100 else character.description)
-        span.set_attribute('character_memory_count', len(character.memories))
-        span.set_attribute('character_relationship_count', len(character.relationships))
-
-        # Build context about the character for the AI
-        with logfire.span('Building character context') as context_span:
-            character_context = f"""
-Character: {character.name}
-Description: {character.description}
-Personality: {character.personality}
-Speech Patterns: {character.speech_patterns}
-Recent Memories: {', '.join(character.memories[-5:]) if character.memories else 'None'}
-Relationships: {', '.join([f'{name}: {rel}' for name, rel in character.relationships.items()]) if character.relationships else 'None'}
-
-Current Scene: {ctx.deps.story_world.current_scene.location}
-Scene Description: {ctx.deps.story_world.current_scene.description}
-Scene Atmosphere: {ctx.deps.story_world.current_scene.atmosphere}
+            response = str(result.output)
+            if cache_key is not None:
+                character_response_cache.put(cache_key, response)
+        llm_done = time.perf_counter()
+
+        memories_trimmed = _record_response_memory(character, situation)
+
+        span.set_attributes({
+            'context_length': len(static_context) + len(dynamic_context),
+            'static_context_length': len(static_context),
+            'response_length': len(response),
+            'model_used': get_model_name(),
+            'memories_trimmed': memories_trimmed,
+            'ctx_build_ms': (context_built - started) * 1000,
+            'llm_ms': (llm_done - context_built) * 1000,
+        })
+        if VERBOSE_SPANS:
+            span.set_attributes({
+                'situation': preview_text(situation),
+                'character_description': preview_text(character.description),
+                'scene_location': scene.location,
+                'final_memory_count': len(character.memories),
+                'response_preview': preview_text(response, 150),
+            })
+
+        return response
+
+
+async def stream_character_response(deps: StoryDeps, character_name: str, situation: str) -> AsyncIterator[str]:
+    """
+    Embody a character and stream the response as it is generated.
+    
+    Uses the same prompt, caching and memory bookkeeping as embody_character,
+    but yields text deltas so callers can show the reply from the first token.
+    The memory entry is recorded once the stream completes.
+    
+    Args:
+        deps: Story dependencies containing the character's story world
+        character_name: Name of the character to embody
+        situation: The situation the character should respond to
+    
+    Yields:
+        Chunks of the character's response
+    
+    Raises:
+        ValueError: If the character is not found in the story world
+    """
+    with logfire.span('Character embodiment stream: {character_name}', character_name=character_name) as span:
+        character = _get_character(deps.story_world, character_name, span)
+        static_context, dynamic_context = await _build_character_prompt(character, deps.story_world.current_scene, situation)
+
+        cache_key = None
+        if RESPONSE_CACHE_ENABLED:
+            cache_key = ResponseCache.make_key(get_model_name(), static_context, dynamic_context)
+            cached = character_response_cache.get(cache_key)
+            span.set_attribute('response_cache_hit', cached is not None)
+            if cached is not None:
+                _record_response_memory(character, situation)
+                yield cached
+                return
+
+        started = time.perf_counter()
+        first_chunk_at = None
+        chunks = []
+        async with get_character_agent().run_stream(
+            [static_context, dynamic_context],
+            deps=deps,
+            model_settings=_character_model_settings(static_context)
+        ) as result:
+            async for chunk in result.stream_text(delta=True):
+                if first_chunk_at is None:
+                    first_chunk_at = time.perf_counter()
+                chunks.append(chunk)
+                yield chunk
+
+        response = ''.join(chunks)
+        if cache_key is not None:
+            character_response_cache.put(cache_key, response)
+        memories_trimmed = _record_response_memory(character, situation)
+
+        span.set_attributes({
+            'context_length': len(static_context) + len(dynamic_context),
+            'response_length': len(response),
+            'model_used': get_model_name(),
+            'memories_trimmed': memories_trimmed,
+            'first_chunk_ms': ((first_chunk_at or time.perf_counter()) - started) * 1000,
+            'llm_ms': (time.perf_counter() - started) * 1000,
+        })
+
+
+def _get_character(story_world: StoryWorld, character_name: str, span: logfire.LogfireSpan) -> Character:
+    """Look up a character to embody, logging and raising ValueError if it does not exist."""
+    try:
+        return story_world.characters[character_name]
+    except KeyError:
+        span.set_attribute('character_found', False)
+        logfire.error(
+            'Character not found in story world',
+            character_name=character_name,
+            available_characters=list(story_world.characters.keys())
+        )
+        raise ValueError(f"Character '{character_name}' not found in the story world") from None
+
+
+async def _build_character_prompt(character: Character, scene: Scene, situation: str) -> Tuple[str, str]:
+    """Build the static and per-turn parts of a character prompt."""
+    # Reason: static profile/scene text goes first and the per-turn part
+    # last, so repeated turns share the longest possible cached prefix.
+    if _should_offload_static_context(character, scene):
+        # Reason: formatting a very large profile would stall concurrent character calls
+        static_context = await asyncio.to_thread(build_static_character_context, character, scene)
+    else:
+        static_context = build_static_character_context(character, scene)
+    dynamic_context = f"""
+Recent Memories: {', '.join(character.recent_memories(5)) if character.memories else 'None'}
 
 Situation to respond to: {situation}
 """
-            context_span.set_attribute('context_length', len(character_context))
-            context_span.set_attribute('scene_location', ctx.deps.story_world.current_scene.location)
+    return static_context, dynamic_context
 
-        # Run the character agent to get the response
-        with logfire.span(
-            'Running LLM character response',
-            character_name=character_name,
-            context_length=len(character_context)
-        ) as llm_span:
-            result = await character_agent.run(
-                character_context,
-                deps=ctx.deps
-            )
-            llm_span.set_attribute('response_length', len(str(result.output)))
-            llm_span.set_attribute('model_used', str(get_model()))
-            logfire.info(
-                'Character LLM response completed',
-                character_name=character_name,
-                response_preview=str(result.output)[:150] + '...' if len(str(result.output)) > 150 else str(result.output)
-            )
 
-        # Update character memories with this interaction
-        with logfire.span('Updating character memories') as memory_span:
-            memory_entry = f"Responded to: {situation[:100]}{'...' if len(situation) > 100 else ''}"
-            character.memories.append(memory_entry)
-            
-            # Keep memories manageable (last 20 entries)
-            if len(character.memories) > 20:
-                character.memories = character.memories[-20:]
-                memory_span.set_attribute('memories_trimmed', True)
-            
-            memory_span.set_attribute('total_memories', len(character.memories))
-            memory_span.set_attribute('memory_added', memory_entry)
-            span.set_attribute('character_response_generated', True)
-            span.set_attribute('final_memory_count', len(character.memories))
+def _character_model_settings(static_context: str) -> dict:
+    """Model settings for a character turn."""
+    model_settings = {'extra_body': {'prompt_cache_key': get_prompt_cache_key(static_context)}}
+    if RESPONSE_CACHE_ENABLED:
+        model_settings['temperature'] = 0.0
+    return model_settings
+
 
-        return str(result.output)
+def _record_response_memory(character: Character, situation: str) -> bool:
+    """Remember that the character responded; returns True if the oldest memory was dropped."""
+    # The bounded deque drops the oldest entry on append
+    memories_trimmed = len(character.memories) == character.memories.maxlen
+    character.memories.append(f"Responded to: {preview_text(situation)}")
+    return memories_trimmed
 
 
 class CharacterManager:
@@ -198,17 +362,18 @@ class CharacterManager:
     Provides utilities for managing character interactions and state.
     """
 
-    def __init__(self, story_world: StoryWorld, client: httpx.AsyncClient):
+    def __init__(self, story_world: StoryWorld, client: Optional[httpx.AsyncClient] = None):
         """
         Initialize character manager.
         
         Args:
             story_world: The story world containing characters
-            client: HTTP client for external requests
+            client: HTTP client for external requests, defaults to the shared client
         """
+        setup_telemetry()
         self.story_world = story_world
-        self.client = client
-        self.deps = StoryDeps(story_world=story_world, client=client)
+        self.client = client or get_http_client()
+        self.deps = StoryDeps(story_world=story_world, client=self.client)
 
     async def character_speaks(self, character_name: str, situation: str) -> str:
         """
@@ -221,19 +386,26 @@ class CharacterManager:
         Returns:
             The character's response
         """
-        with logfire.span(
-            'Character manager: character speaks',
-            character_name=character_name,
-            situation_length=len(situation)
-        ) as span:
-            result = await embody_character(
+        with logfire.span('Character manager: character speaks', character_name=character_name):
+            return await embody_character(
                 RunContext(deps=self.deps),
                 character_name,
                 situation
             )
-            span.set_attribute('response_generated', True)
-            span.set_attribute('response_length', len(str(result)))
-            return str(result)
+
+    async def character_speaks_stream(self, character_name: str, situation: str) -> AsyncIterator[str]:
+        """
+        Have a character respond to a situation, streaming the response.
+        
+        Args:
+            character_name: Name of the character
+            situation: The situation to respond to
+            
+        Yields:
+            Chunks of the character's response
+        """
+        async for chunk in stream_character_response(self.deps, character_name, situation):
+            yield chunk
 
     def get_character_summary(self, character_name: str) -> Optional[str]:
         """
@@ -245,11 +417,12 @@ class CharacterManager:
         Returns:
             Character summary or None if not found
         """
-        character = self.story_world.characters.get(character_name)
-        if not character:
+        try:
+            character = self.story_world.characters[character_name]
+        except KeyError:
             return None
 
-        return f"{character.name}: {character.description[:100]}{'...' if len(character.description) > 100 else ''}"
+        return f"{character.name}: {preview_text(character.description)}"
 
     def list_characters(self) -> list[str]:
         """
@@ -271,13 +444,10 @@ class CharacterManager:
         Returns:
             True if memory was added, False if character not found
         """
-        with logfire.span(
-            'Adding character memory',
-            character_name=character_name,
-            memory=memory[:100] + '...' if len(memory) > 100 else memory
-        ) as span:
-            character = self.story_world.characters.get(character_name)
-            if not character:
+        with logfire.span('Adding character memory', character_name=character_name) as span:
+            try:
+                character = self.story_world.characters[character_name]
+            except KeyError:
                 span.set_attribute('character_found', False)
                 logfire.warning(
                     'Attempted to add memory to non-existent character',
@@ -286,25 +456,14 @@ class CharacterManager:
                 )
                 return False
 
-            span.set_attribute('character_found', True)
-            span.set_attribute('memory_count_before', len(character.memories))
-            
+            # Keep memories manageable: the bounded deque drops the oldest entry
+            span.set_attribute('memories_trimmed', len(character.memories) == character.memories.maxlen)
             character.memories.append(memory)
 
-            # Keep memories manageable
-            trimmed = False
-            if len(character.memories) > 20:
-                character.memories = character.memories[-20:]
-                trimmed = True
-
-            span.set_attribute('memory_count_after', len(character.memories))
-            span.set_attribute('memories_trimmed', trimmed)
-            span.set_attribute('memory_added', True)
-            
-            logfire.info(
-                'Character memory added successfully',
-                character_name=character_name,
-                total_memories=len(character.memories)
-            )
+            if VERBOSE_SPANS:
+                span.set_attributes({
+                    'memory': preview_text(memory),
+                    'memory_count_after': len(character.memories),
+                })
 
             return True
@@ -2,22 +2,31 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import os
+import time
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Optional, Set
 
 import httpx
 import logfire
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
-from pydantic_ai import Agent, RunContext
-from pydantic_ai.models.openai import OpenAIModel
-from pydantic_ai.providers.openai import OpenAIProvider
+from pydantic_ai import Agent, NativeOutput, RunContext
 
+from agents.character import CHARACTER_PROMPT_WARMUP, VERBOSE_SPANS, StoryDeps, warm_character_prompt
+from agents.http_client import get_http_client
+from agents.model import get_model
 from models.story import Character, StoryWorld
+from utils.helpers import preview_text
+from utils.telemetry import setup_telemetry
 
 load_dotenv()
 
+# Maximum number of character creation LLM calls in flight at once
+CHARACTER_CREATION_CONCURRENCY = int(os.getenv('CHAR_CREATE_CONCURRENCY', '8'))
+
 
 class CharacterCreationRequest(BaseModel):
     """
@@ -50,53 +59,6 @@ class CharacterCreationDeps:
     client: httpx.AsyncClient
 
 
-def get_model() -> OpenAIModel:
-    """
-    Get the configured LLM model.
-    
-    Returns:
-        Configured OpenAI model instance
-    """
-    llm = os.getenv('LLM_MODEL', 'gpt-4o-mini')
-
-    # Use OpenRouter if key is available, otherwise use OpenAI
-    if os.getenv('OPEN_ROUTER_API_KEY'):
-        provider = OpenAIProvider(
-            base_url='https://openrouter.ai/api/v1',
-            api_key=os.getenv('OPEN_ROUTER_API_KEY'))
-
-        return OpenAIModel(
-            model_name='gpt-4o-mini',
-            provider=provider
-        )
-    else:
-        return OpenAIModel(llm, api_key=os.getenv('OPENAI_API_KEY'))
-
-
-# Configure logfire with comprehensive instrumentation
-logfire_token = os.getenv('LOGFIRE_TOKEN')
-if logfire_token:
-    logfire.configure(token=logfire_token, inspect_arguments=False)
-else:
-    logfire.configure(send_to_logfire='if-token-present', inspect_arguments=False)
-
-# Enable instrumentation if available
-try:
-    logfire.instrument_pydantic_ai()
-except Exception:
-    pass
-
-try:
-    logfire.instrument_openai()
-except Exception:
-    pass
-
-try:
-    logfire.instrument_httpx()
-except Exception:
-    pass
-
-
 CHARACTER_CREATION_PROMPT = """
 You are an expert character creator for interactive storytelling. Your role is to create compelling, 
 well-developed characters that will enhance the narrative experience.
@@ -113,14 +75,40 @@ Always create characters that feel authentic and three-dimensional, with clear m
 and interesting quirks that make them memorable.
 """
 
-# Create the character creation agent
-character_creator_agent = Agent(
-    get_model(),
-    system_prompt=CHARACTER_CREATION_PROMPT,
-    deps_type=CharacterCreationDeps,
-    output_type=CharacterCreationRequest,
-    retries=2
-)
+def build_character_prompt(character_concept: str, story_context: str = "") -> str:
+    """
+    Build the user prompt sent to the character creation agent.
+    
+    Args:
+        character_concept: Basic concept or description of the character
+        story_context: Additional story context for character creation
+        
+    Returns:
+        Prompt text for a single character creation request
+    """
+    return f"Create a character: {character_concept}\nStory context: {story_context}"
+
+
+@functools.lru_cache(maxsize=1)
+def get_character_creator_agent() -> Agent[CharacterCreationDeps, CharacterCreationRequest]:
+    """
+    Get the character creation agent.
+    
+    The agent is built on first use and reused afterwards, so importing this
+    module stays cheap.
+    
+    Returns:
+        Shared character creation agent
+    """
+    return Agent(
+        get_model(),
+        system_prompt=CHARACTER_CREATION_PROMPT,
+        deps_type=CharacterCreationDeps,
+        # Reason: native structured output sends the schema as response_format, so the
+        # provider constrains decoding directly instead of wrapping it in a tool call.
+        output_type=NativeOutput(CharacterCreationRequest, strict=True),
+        retries=2
+    )
 
 
 async def create_character(
@@ -139,11 +127,7 @@ async def create_character(
     Returns:
         CharacterCreationRequest with all character details
     """
-    with logfire.span(
-        'Creating character from concept',
-        character_concept=character_concept[:100] + '...' if len(character_concept) > 100 else character_concept,
-        story_context_length=len(story_context)
-    ) as span:
+    with logfire.span('Creating character from concept', story_context_length=len(story_context)) as span:
         
         # Build context for character creation
         context_info = f"""
@@ -158,32 +142,28 @@ Additional Context: {story_context}
 Create a detailed character that fits well into this story world and complements the existing characters.
 """
         
-        span.set_attribute('context_length', len(context_info))
-        span.set_attribute('existing_character_count', len(ctx.deps.story_world.characters))
-        
         # Generate character using the agent
-        with logfire.span('Running character creation LLM') as llm_span:
-            result = await character_creator_agent.run(
-                context_info,
-                deps=ctx.deps
-            )
-            
-            llm_span.set_attribute('character_created', True)
-            llm_span.set_attribute('character_name', result.data.name)
-            llm_span.set_attribute('description_length', len(result.data.description))
-            llm_span.set_attribute('personality_length', len(result.data.personality))
-            
-            logfire.info(
-                'Character created successfully',
-                character_name=result.data.name,
-                character_concept=character_concept,
-                description_preview=result.data.description[:100] + '...' if len(result.data.description) > 100 else result.data.description
-            )
-            
-            span.set_attribute('character_creation_successful', True)
-            span.set_attribute('final_character_name', result.data.name)
-            
-            return result.data
+        started = time.perf_counter()
+        result = await get_character_creator_agent().run(
+            context_info,
+            deps=ctx.deps
+        )
+        char_request = result.output
+        
+        span.set_attributes({
+            'context_length': len(context_info),
+            'character_name': char_request.name,
+            'llm_ms': (time.perf_counter() - started) * 1000,
+        })
+        if VERBOSE_SPANS:
+            span.set_attributes({
+                'character_concept': preview_text(character_concept),
+                'existing_character_count': len(ctx.deps.story_world.characters),
+                'description_length': len(char_request.description),
+                'personality_length': len(char_request.personality),
+            })
+        
+        return char_request
 
 
 class CharacterCreationManager:
@@ -193,17 +173,21 @@ class CharacterCreationManager:
     Provides utilities for creating and managing characters using the character creation agent.
     """
 
-    def __init__(self, story_world: StoryWorld, client: httpx.AsyncClient):
+    def __init__(self, story_world: StoryWorld, client: Optional[httpx.AsyncClient] = None):
         """
         Initialize character creation manager.
         
         Args:
             story_world: The story world where characters will be created
-            client: HTTP client for external requests
+            client: HTTP client for external requests, defaults to the shared client
         """
+        setup_telemetry()
         self.story_world = story_world
-        self.client = client
-        self.deps = CharacterCreationDeps(story_world=story_world, client=client)
+        self.client = client or get_http_client()
+        self.deps = CharacterCreationDeps(story_world=story_world, client=self.client)
+        # Reason: the event loop only keeps weak references to tasks, so pending
+        # warmups are held here until they finish.
+        self._warmup_tasks: Set[asyncio.Task] = set()
 
     async def create_character_from_concept(self, character_concept: str, story_context: str = "") -> Character:
         """
@@ -218,16 +202,16 @@ class CharacterCreationManager:
         """
         with logfire.span(
             'Character creation manager: create character',
-            character_concept=character_concept[:50] + '...' if len(character_concept) > 50 else character_concept,
+            character_concept=preview_text(character_concept, 50),
             story_context_length=len(story_context)
         ) as span:
             
             # Use the character creation agent to generate character
-            result = await character_creator_agent.run(
-                f"Create a character: {character_concept}\nStory context: {story_context}",
+            result = await get_character_creator_agent().run(
+                build_character_prompt(character_concept, story_context),
                 deps=self.deps
             )
-            char_request = result.data
+            char_request = result.output
             
             # Create Character object
             character = Character(
@@ -240,6 +224,9 @@ class CharacterCreationManager:
             # Add to story world
             self.story_world.add_character(character)
             
+            if CHARACTER_PROMPT_WARMUP:
+                self._start_prompt_warmup(character.name)
+            
             span.set_attribute('character_added_to_world', True)
             span.set_attribute('character_name', character.name)
             span.set_attribute('total_characters_in_world', len(self.story_world.characters))
@@ -252,35 +239,96 @@ class CharacterCreationManager:
             
             return character
 
-    async def create_multiple_characters(self, character_concepts: List[str], story_context: str = "") -> List[Character]:
+    def _start_prompt_warmup(self, character_name: str) -> None:
+        """
+        Start prefilling a new character's prompt in the background.
+        
+        The first real turn for the character then hits a warm provider prompt
+        cache instead of paying the full prefill.
+        
+        Args:
+            character_name: Name of the character that was just created
+        """
+        deps = StoryDeps(story_world=self.story_world, client=self.client)
+        task = asyncio.create_task(warm_character_prompt(deps, character_name))
+        self._warmup_tasks.add(task)
+        task.add_done_callback(self._warmup_tasks.discard)
+
+    async def create_multiple_characters(
+        self,
+        character_concepts: List[str],
+        story_context: str = "",
+        use_batch_api: bool = False
+    ) -> List[Character]:
         """
         Create multiple characters from a list of concepts.
         
+        Each concept is an independent LLM request, so they run concurrently,
+        bounded by CHAR_CREATE_CONCURRENCY to stay within provider rate limits.
+        Concepts that fail are logged and skipped.
+        
         Args:
             character_concepts: List of character concepts
             story_context: Additional story context for character creation
+            use_batch_api: Submit all concepts as one provider batch job instead.
+                Cheaper, but results may take minutes to hours.
             
         Returns:
-            List of created Character objects
+            List of created Character objects, in concept order
+            
+        Raises:
+            Exception: The first creation error if no character could be created
         """
         with logfire.span(
             'Creating multiple characters',
             character_count=len(character_concepts),
             story_context_length=len(story_context)
         ) as span:
-            
+            if use_batch_api:
+                span.set_attribute('use_batch_api', True)
+                return await self._create_characters_with_batch_api(character_concepts, story_context)
+
+            semaphore = asyncio.Semaphore(CHARACTER_CREATION_CONCURRENCY)
+
+            async def create_one(i: int, concept: str) -> Character:
+                async with semaphore:
+                    with logfire.span(f'Creating character {i+1}/{len(character_concepts)}') as char_span:
+                        char_span.set_attribute('character_concept', preview_text(concept, 50))
+                        
+                        # Reason: add_character runs synchronously after the await, so
+                        # interleaved tasks cannot corrupt the characters dict.
+                        character = await self.create_character_from_concept(concept, story_context)
+                        
+                        char_span.set_attribute('character_created', True)
+                        char_span.set_attribute('character_name', character.name)
+                        return character
+
+            results = await asyncio.gather(
+                *(create_one(i, concept) for i, concept in enumerate(character_concepts)),
+                return_exceptions=True
+            )
+
             characters = []
-            for i, concept in enumerate(character_concepts):
-                with logfire.span(f'Creating character {i+1}/{len(character_concepts)}') as char_span:
-                    char_span.set_attribute('character_concept', concept[:50] + '...' if len(concept) > 50 else concept)
-                    
-                    character = await self.create_character_from_concept(concept, story_context)
-                    characters.append(character)
-                    
-                    char_span.set_attribute('character_created', True)
-                    char_span.set_attribute('character_name', character.name)
+            errors = []
+            for concept, result in zip(character_concepts, results):
+                # Reason: a cancelled task or Ctrl+C is not a per-concept failure
+                if isinstance(result, (asyncio.CancelledError, KeyboardInterrupt)):
+                    raise result
+                if isinstance(result, BaseException):
+                    errors.append(result)
+                    logfire.warning(
+                        'Character creation failed, skipping concept',
+                        character_concept=preview_text(concept, 50),
+                        error=str(result)
+                    )
+                else:
+                    characters.append(result)
+
+            if errors and not characters:
+                raise errors[0]
             
             span.set_attribute('total_characters_created', len(characters))
+            span.set_attribute('failed_character_count', len(errors))
             span.set_attribute('character_names', [char.name for char in characters])
             
             logfire.info(
@@ -291,6 +339,41 @@ class CharacterCreationManager:
             
             return characters
 
+    async def _create_characters_with_batch_api(self, character_concepts: List[str], story_context: str) -> List[Character]:
+        """
+        Create characters through the provider Batch API and add them to the story world.
+        
+        Args:
+            character_concepts: List of character concepts
+            story_context: Additional story context for character creation
+            
+        Returns:
+            List of created Character objects, in concept order
+        """
+        # Reason: imported lazily so the openai batch client is only needed on this path
+        from agents.batch_creator import BatchCharacterCreator
+
+        char_requests = await BatchCharacterCreator().create_characters(character_concepts, story_context)
+
+        characters = []
+        for char_request in char_requests:
+            character = Character(
+                name=char_request.name,
+                description=char_request.description,
+                personality=char_request.personality,
+                speech_patterns=char_request.speech_patterns
+            )
+            self.story_world.add_character(character)
+            characters.append(character)
+
+        logfire.info(
+            'Batch characters added to story world',
+            character_count=len(characters),
+            character_names=[char.name for char in characters]
+        )
+
+        return characters
+
     def get_character_summary(self, character_name: str) -> str:
         """
         Get a summary of a character.
@@ -301,11 +384,12 @@ class CharacterCreationManager:
         Returns:
             Character summary string
         """
-        character = self.story_world.characters.get(character_name)
-        if not character:
+        try:
+            character = self.story_world.characters[character_name]
+        except KeyError:
             return f"Character '{character_name}' not found"
         
-        return f"{character.name}: {character.description[:100]}{'...' if len(character.description) > 100 else ''}"
+        return f"{character.name}: {preview_text(character.description)}"
 
     def list_characters(self) -> List[str]:
         """
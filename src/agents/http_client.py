@@ -0,0 +1,67 @@
+"""Shared HTTP client for LLM provider and tool requests."""
+
+from __future__ import annotations
+
+import functools
+import importlib.util
+import os
+
+import httpx
+import logfire
+
+# Connection pool sized for concurrent character calls against a single provider host.
+# Idle connections are kept for 30s (httpx default: 5s) so they survive the pause
+# while the user types their next turn.
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=30.0)
+# Reads allow for slow LLM generations; connects, request writes and waits for a
+# free pooled connection fail fast instead of hanging.
+HTTP_TIMEOUT = httpx.Timeout(connect=5.0, read=60.0, write=10.0, pool=5.0)
+
+# Transport backing the shared client: 'httpx' (default) or 'aiohttp'
+HTTP_TRANSPORT = os.getenv('HTTP_TRANSPORT', 'httpx').lower()
+
+
+@functools.lru_cache(maxsize=1)
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide HTTP client.
+
+    The LLM provider and the storytelling managers share this client, so all
+    requests reuse one keep-alive connection pool instead of opening separate
+    TCP/TLS connections per component. HTTP/2 multiplexing is enabled when the
+    h2 package is installed (httpx[http2]).
+
+    With HTTP_TRANSPORT=aiohttp and the aiohttp extra installed, requests are
+    sent over an aiohttp transport instead, which holds up better under many
+    concurrent requests. The client is still an httpx.AsyncClient, so callers
+    and the OpenAI provider are unaffected.
+
+    Returns:
+        Shared httpx.AsyncClient instance
+    """
+    if HTTP_TRANSPORT == 'aiohttp':
+        if importlib.util.find_spec('httpx_aiohttp') is not None:
+            from httpx_aiohttp import HttpxAiohttpClient
+
+            return HttpxAiohttpClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        logfire.warning('HTTP_TRANSPORT=aiohttp but httpx-aiohttp is not installed, using httpx')
+
+    # Reason: httpx raises at construction if http2=True without h2 installed
+    http2 = importlib.util.find_spec('h2') is not None
+    return httpx.AsyncClient(http2=http2, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+
+
+async def close_http_client() -> None:
+    """
+    Close the process-wide HTTP client, if one was created.
+
+    Called once by the application entry point when it shuts down, since
+    agents and the model provider hold on to the shared client. The cache is
+    cleared so a later get_http_client call builds a fresh client rather than
+    returning the closed one.
+    """
+    if get_http_client.cache_info().currsize == 0:
+        return
+    client = get_http_client()
+    get_http_client.cache_clear()
+    await client.aclose()
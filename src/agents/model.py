@@ -0,0 +1,62 @@
+"""Shared LLM model used by every agent."""
+
+from __future__ import annotations
+
+import functools
+import os
+
+from dotenv import load_dotenv
+from pydantic_ai.models.openai import OpenAIModel
+from pydantic_ai.providers.openai import OpenAIProvider
+
+from agents.http_client import get_http_client
+
+load_dotenv()
+
+
+@functools.lru_cache(maxsize=1)
+def get_model() -> OpenAIModel:
+    """
+    Get the configured LLM model.
+    
+    The model (and its underlying OpenAI client) is built once and shared by
+    every agent, instead of being re-created on each call. It sends requests
+    through the shared HTTP client so they reuse one connection pool.
+    
+    Returns:
+        Configured OpenAI model instance
+    """
+    llm = os.getenv('LLM_MODEL', 'gpt-4o-mini')
+    open_router_key = os.getenv('OPEN_ROUTER_API_KEY')
+
+    # Use OpenRouter if key is available, otherwise use OpenAI
+    if open_router_key:
+        provider = OpenAIProvider(
+            base_url='https://openrouter.ai/api/v1',
+            api_key=open_router_key,
+            http_client=get_http_client())
+
+        return OpenAIModel(
+            model_name='gpt-4o-mini',
+            provider=provider
+        )
+    else:
+        provider = OpenAIProvider(
+            api_key=os.getenv('OPENAI_API_KEY'),
+            http_client=get_http_client())
+
+        return OpenAIModel(llm, provider=provider)
+
+
+@functools.lru_cache(maxsize=1)
+def get_model_name() -> str:
+    """
+    Get the configured model's name for cache keys and span attributes.
+    
+    Resolved on first use and then reused, so importing an agent module never
+    builds the model and hot paths do not read the name from it per call.
+    
+    Returns:
+        Name of the shared model
+    """
+    return get_model().model_name
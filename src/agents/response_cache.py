@@ -0,0 +1,172 @@
+"""Caches for deterministic LLM responses."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from contextlib import closing
+from typing import Optional
+
+# Opt-in: caching is only sound when responses are deterministic, so enabling it
+# also makes the cached agents run at temperature 0.
+RESPONSE_CACHE_ENABLED = os.getenv('CHARACTER_RESPONSE_CACHE', '').lower() in ('1', 'true', 'yes')
+
+# Opt-in cache for storyteller meta-command responses; also runs those at temperature 0
+STORY_RESPONSE_CACHE_ENABLED = os.getenv('STORY_RESPONSE_CACHE', '').lower() in ('1', 'true', 'yes')
+
+# Opt-in persistent cache for scenario generation, mainly for repeated dev iterations
+SCENARIO_CACHE_ENABLED = os.getenv('SCENARIO_CACHE', '').lower() in ('1', 'true', 'yes')
+SCENARIO_CACHE_PATH = os.getenv('SCENARIO_CACHE_PATH', '.scenario_cache.db')
+
+
+class ResponseCache:
+    """
+    Least-recently-used cache of LLM responses keyed by a hash of the full prompt.
+
+    Keys cover everything sent to the model, so any change to the character
+    profile, scene or recent memories produces a different key and can never
+    return a stale reply.
+    """
+
+    def __init__(self, maxsize: int = 512):
+        """
+        Initialize the response cache.
+
+        Args:
+            maxsize: Maximum number of responses kept before evicting the oldest
+        """
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, str] = OrderedDict()
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """
+        Build a cache key from prompt parts.
+
+        Args:
+            parts: Model name and prompt text that determine the response
+
+        Returns:
+            Hex digest of the parts
+        """
+        return hashlib.sha256('\x00'.join(parts).encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached response and mark it as recently used.
+
+        Args:
+            key: Key built with make_key
+
+        Returns:
+            The cached response or None on a miss
+        """
+        response = self._entries.get(key)
+        if response is not None:
+            self._entries.move_to_end(key)
+        return response
+
+    def put(self, key: str, response: str) -> None:
+        """
+        Store a response, evicting the least recently used one if full.
+
+        Args:
+            key: Key built with make_key
+            response: Response text to cache
+        """
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteResponseCache:
+    """
+    Persistent response cache stored in a SQLite file.
+
+    Entries expire after ttl_seconds, and the least recently used entries are
+    evicted beyond max_entries. SQLite calls run in a worker thread so they do
+    not block the event loop.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 7 * 24 * 3600, max_entries: int = 256):
+        """
+        Initialize the SQLite response cache.
+
+        Args:
+            path: Path of the SQLite database file
+            ttl_seconds: Age after which an entry is ignored and removed
+            max_entries: Maximum number of entries kept
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path)
+        if not self._initialized:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._initialized = True
+        return connection
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with closing(self._connect()) as connection, connection:
+            row = connection.execute(
+                "SELECT value FROM responses WHERE key = ? AND created_at >= ?",
+                (key, now - self.ttl_seconds)
+            ).fetchone()
+            if row is not None:
+                connection.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        return row[0] if row is not None else None
+
+    def _put(self, key: str, value: str) -> None:
+        now = time.time()
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            connection.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+            connection.execute(
+                "DELETE FROM responses WHERE key NOT IN "
+                "(SELECT key FROM responses ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached response that has not expired.
+
+        Args:
+            key: Key built with ResponseCache.make_key
+
+        Returns:
+            The cached response or None on a miss
+        """
+        return await asyncio.to_thread(self._get, key)
+
+    async def put(self, key: str, value: str) -> None:
+        """
+        Store a response and evict expired or excess entries.
+
+        Args:
+            key: Key built with ResponseCache.make_key
+            value: Response text to cache
+        """
+        await asyncio.to_thread(self._put, key, value)
@@ -2,22 +2,39 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import json
 import os
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 import httpx
 import logfire
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent, RunContext
-from pydantic_ai.models.openai import OpenAIModel
-from pydantic_ai.providers.openai import OpenAIProvider
+from pydantic_ai.usage import Usage
 
+from agents.http_client import get_http_client
+from agents.model import get_model, get_model_name
+from agents.response_cache import SCENARIO_CACHE_ENABLED, SCENARIO_CACHE_PATH, ResponseCache, SQLiteResponseCache
 from models.story import Scene, StoryWorld
+from utils.helpers import preview_text
+from utils.telemetry import setup_telemetry
 
 load_dotenv()
 
+# Performance notes:
+# - Time here is spent awaiting the LLM provider; local Python work is orders of
+#   magnitude smaller, so JIT/SIMD-style CPU optimizations do not apply.
+# - Latency wins come from I/O: the shared connection pool (agents.http_client),
+#   cache-friendly prompt ordering and the scenario cache, concurrent requests
+#   (create_scenarios_batch) and streaming (agents.scenario_stream).
+
+# Maximum number of scenario generation LLM calls in flight at once
+SCENARIO_GENERATION_CONCURRENCY = int(os.getenv('SCENARIO_CONCURRENCY', '16'))
+
 
 class ScenarioGenerationRequest(BaseModel):
     """
@@ -52,53 +69,6 @@ class ScenarioGenerationDeps:
     client: httpx.AsyncClient
 
 
-def get_model() -> OpenAIModel:
-    """
-    Get the configured LLM model.
-    
-    Returns:
-        Configured OpenAI model instance
-    """
-    llm = os.getenv('LLM_MODEL', 'gpt-4o-mini')
-
-    # Use OpenRouter if key is available, otherwise use OpenAI
-    if os.getenv('OPEN_ROUTER_API_KEY'):
-        provider = OpenAIProvider(
-            base_url='https://openrouter.ai/api/v1',
-            api_key=os.getenv('OPEN_ROUTER_API_KEY'))
-
-        return OpenAIModel(
-            model_name='gpt-4o-mini',
-            provider=provider
-        )
-    else:
-        return OpenAIModel(llm, api_key=os.getenv('OPENAI_API_KEY'))
-
-
-# Configure logfire with comprehensive instrumentation
-logfire_token = os.getenv('LOGFIRE_TOKEN')
-if logfire_token:
-    logfire.configure(token=logfire_token, inspect_arguments=False)
-else:
-    logfire.configure(send_to_logfire='if-token-present', inspect_arguments=False)
-
-# Enable instrumentation if available
-try:
-    logfire.instrument_pydantic_ai()
-except Exception:
-    pass
-
-try:
-    logfire.instrument_openai()
-except Exception:
-    pass
-
-try:
-    logfire.instrument_httpx()
-except Exception:
-    pass
-
-
 SCENARIO_GENERATION_PROMPT = """
 You are an expert scenario generator for interactive storytelling. Your role is to create compelling, 
 immersive story scenarios that provide rich environments for interactive storytelling experiences.
@@ -115,14 +85,83 @@ Your scenarios should provide structure while leaving room for emergent storytel
 Create scenarios that feel like they could support hours of engaging interactive narrative.
 """
 
-# Create the scenario generation agent
-scenario_generator_agent = Agent(
-    get_model(),
-    system_prompt=SCENARIO_GENERATION_PROMPT,
-    deps_type=ScenarioGenerationDeps,
-    output_type=ScenarioGenerationRequest,
-    retries=2
-)
+# Reason: the fixed instructions open the user message and the variable concept or
+# feedback comes last, so repeated requests share the longest cacheable prompt prefix.
+SCENARIO_REQUEST_INSTRUCTIONS = """
+Please create a complete scenario that includes:
+1. A compelling premise that builds on the initial concept
+2. Rich world-building and setting details
+3. 2-3 main conflicts or plot threads that can drive the story
+4. An engaging opening scene that immediately draws players in
+5. 3-5 character concepts that should be created for this world
+
+Make sure the scenario provides structure while leaving room for player creativity and emergent storytelling.
+"""
+
+SCENARIO_REFINEMENT_INSTRUCTIONS = """
+Please refine the scenario in <scenario> based on the user feedback in <feedback> while maintaining the core elements that work well.
+Keep the improvements focused and coherent with the existing narrative structure.
+"""
+
+# Full prompt templates, joined once at import; only the placeholders vary per call
+SCENARIO_REQUEST_TEMPLATE = SCENARIO_REQUEST_INSTRUCTIONS + """
+Initial Concept: {initial_concept}
+
+Additional Requirements: {additional_requirements}
+"""
+
+# Reason: the scenario and the feedback are separate delimited sections, with the
+# scenario first, so several rounds of feedback on one scenario share the prefix
+# up to <feedback> and a changed scenario only invalidates from <scenario> on.
+SCENARIO_REFINEMENT_TEMPLATE = SCENARIO_REFINEMENT_INSTRUCTIONS + """
+<scenario>
+{current_scenario}
+</scenario>
+
+<feedback>
+{refinement_feedback}
+</feedback>
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def get_scenario_agent() -> Agent[ScenarioGenerationDeps, ScenarioGenerationRequest]:
+    """
+    Get the scenario generation agent.
+    
+    The agent and its output schema validator are built on first use and
+    reused afterwards, so importing this module stays cheap.
+    
+    Returns:
+        Shared scenario generation agent
+    """
+    return Agent(
+        get_model(),
+        system_prompt=SCENARIO_GENERATION_PROMPT,
+        deps_type=ScenarioGenerationDeps,
+        output_type=ScenarioGenerationRequest,
+        retries=2
+    )
+
+
+# Persistent cache of scenario outputs, used when SCENARIO_CACHE is set
+scenario_response_cache = SQLiteResponseCache(SCENARIO_CACHE_PATH)
+
+
+async def _run_scenario_agent(prompt: str, deps: ScenarioGenerationDeps) -> ScenarioGenerationRequest:
+    """Run the scenario agent, serving repeated prompts from the scenario cache when enabled."""
+    cache_key = None
+    if SCENARIO_CACHE_ENABLED:
+        cache_key = ResponseCache.make_key(get_model_name(), SCENARIO_GENERATION_PROMPT, prompt)
+        cached = await scenario_response_cache.get(cache_key)
+        if cached is not None:
+            logfire.info('Scenario served from cache', prompt_length=len(prompt))
+            return ScenarioGenerationRequest.model_validate_json(cached)
+
+    result = await get_scenario_agent().run(prompt, deps=deps)
+    if cache_key is not None:
+        await scenario_response_cache.put(cache_key, result.output.model_dump_json())
+    return result.output
 
 
 async def generate_scenario(
@@ -143,53 +182,47 @@ async def generate_scenario(
     """
     with logfire.span(
         'Generating scenario from concept',
-        initial_concept=initial_concept[:100] + '...' if len(initial_concept) > 100 else initial_concept,
+        initial_concept=preview_text(initial_concept),
         additional_requirements_length=len(additional_requirements)
     ) as span:
         
         # Build context for scenario generation
-        context_info = f"""
-Initial Concept: {initial_concept}
-
-Additional Requirements: {additional_requirements}
-
-Please create a complete scenario that includes:
-1. A compelling premise that builds on the initial concept
-2. Rich world-building and setting details
-3. 2-3 main conflicts or plot threads that can drive the story
-4. An engaging opening scene that immediately draws players in
-5. 3-5 character concepts that should be created for this world
-
-Make sure the scenario provides structure while leaving room for player creativity and emergent storytelling.
-"""
+        context_info = SCENARIO_REQUEST_TEMPLATE.format_map({
+            'initial_concept': initial_concept,
+            'additional_requirements': additional_requirements
+        })
         
         span.set_attribute('context_length', len(context_info))
         
         # Generate scenario using the agent
         with logfire.span('Running scenario generation LLM') as llm_span:
-            result = await scenario_generator_agent.run(
-                context_info,
-                deps=ctx.deps
-            )
+            scenario = await _run_scenario_agent(context_info, ctx.deps)
+            premise_length = len(scenario.premise)
+            conflicts_count = len(scenario.conflicts)
+            character_concepts_count = len(scenario.character_concepts)
             
-            llm_span.set_attribute('scenario_generated', True)
-            llm_span.set_attribute('premise_length', len(result.data.premise))
-            llm_span.set_attribute('setting_length', len(result.data.setting))
-            llm_span.set_attribute('conflicts_count', len(result.data.conflicts))
-            llm_span.set_attribute('character_concepts_count', len(result.data.character_concepts))
+            llm_span.set_attributes({
+                'scenario_generated': True,
+                'premise_length': premise_length,
+                'setting_length': len(scenario.setting),
+                'conflicts_count': conflicts_count,
+                'character_concepts_count': character_concepts_count,
+            })
             
             logfire.info(
                 'Scenario generated successfully',
-                premise_preview=result.data.premise[:100] + '...' if len(result.data.premise) > 100 else result.data.premise,
-                setting_preview=result.data.setting[:100] + '...' if len(result.data.setting) > 100 else result.data.setting,
-                conflicts_count=len(result.data.conflicts),
-                character_concepts_count=len(result.data.character_concepts)
+                premise_preview=preview_text(scenario.premise),
+                setting_preview=preview_text(scenario.setting),
+                conflicts_count=conflicts_count,
+                character_concepts_count=character_concepts_count
             )
             
-            span.set_attribute('scenario_generation_successful', True)
-            span.set_attribute('final_premise_length', len(result.data.premise))
+            span.set_attributes({
+                'scenario_generation_successful': True,
+                'final_premise_length': premise_length,
+            })
             
-            return result.data
+            return scenario
 
 
 async def refine_scenario(
@@ -210,49 +243,47 @@ async def refine_scenario(
     """
     with logfire.span(
         'Refining scenario based on feedback',
-        refinement_feedback=refinement_feedback[:100] + '...' if len(refinement_feedback) > 100 else refinement_feedback,
+        refinement_feedback=preview_text(refinement_feedback),
         current_premise_length=len(current_scenario.get('premise', ''))
     ) as span:
         
         # Build context for scenario refinement
-        context_info = f"""
-Current Scenario:
-Premise: {current_scenario.get('premise', '')}
-Setting: {current_scenario.get('setting', '')}
-Conflicts: {current_scenario.get('conflicts', [])}
-Opening Scene: {current_scenario.get('opening_scene_location', '')} - {current_scenario.get('opening_scene_description', '')}
-
-User Feedback: {refinement_feedback}
-
-Please refine the scenario based on this feedback while maintaining the core elements that work well.
-Keep the improvements focused and coherent with the existing narrative structure.
-"""
+        # Reason: compact JSON instead of the dict repr keeps the prompt short and
+        # quotes lists and strings the way the model expects
+        context_info = SCENARIO_REFINEMENT_TEMPLATE.format_map({
+            'current_scenario': json.dumps(current_scenario, ensure_ascii=False, separators=(',', ':')),
+            'refinement_feedback': refinement_feedback
+        })
         
-        span.set_attribute('context_length', len(context_info))
-        span.set_attribute('current_conflicts_count', len(current_scenario.get('conflicts', [])))
+        span.set_attributes({
+            'context_length': len(context_info),
+            'current_conflicts_count': len(current_scenario.get('conflicts', [])),
+        })
         
         # Generate refined scenario using the agent
         with logfire.span('Running scenario refinement LLM') as llm_span:
-            result = await scenario_generator_agent.run(
-                context_info,
-                deps=ctx.deps
-            )
+            scenario = await _run_scenario_agent(context_info, ctx.deps)
+            premise_length = len(scenario.premise)
             
-            llm_span.set_attribute('scenario_refined', True)
-            llm_span.set_attribute('new_premise_length', len(result.data.premise))
-            llm_span.set_attribute('new_setting_length', len(result.data.setting))
-            llm_span.set_attribute('new_conflicts_count', len(result.data.conflicts))
+            llm_span.set_attributes({
+                'scenario_refined': True,
+                'new_premise_length': premise_length,
+                'new_setting_length': len(scenario.setting),
+                'new_conflicts_count': len(scenario.conflicts),
+            })
             
             logfire.info(
                 'Scenario refined successfully',
-                refinement_feedback=refinement_feedback[:50] + '...' if len(refinement_feedback) > 50 else refinement_feedback,
-                new_premise_preview=result.data.premise[:100] + '...' if len(result.data.premise) > 100 else result.data.premise
+                refinement_feedback=preview_text(refinement_feedback, 50),
+                new_premise_preview=preview_text(scenario.premise)
             )
             
-            span.set_attribute('scenario_refinement_successful', True)
-            span.set_attribute('final_refined_premise_length', len(result.data.premise))
+            span.set_attributes({
+                'scenario_refinement_successful': True,
+                'final_refined_premise_length': premise_length,
+            })
             
-            return result.data
+            return scenario
 
 
 class ScenarioGenerationManager:
@@ -262,15 +293,21 @@ class ScenarioGenerationManager:
     Provides utilities for creating and refining scenarios using the scenario generation agent.
     """
 
-    def __init__(self, client: httpx.AsyncClient):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
         """
         Initialize scenario generation manager.
         
         Args:
-            client: HTTP client for external requests
+            client: HTTP client for external requests, defaults to the shared client
         """
-        self.client = client
-        self.deps = ScenarioGenerationDeps(client=client)
+        setup_telemetry()
+        self.client = client or get_http_client()
+        self.deps = ScenarioGenerationDeps(client=self.client)
+        self.agent = get_scenario_agent()
+
+    def _run_context(self) -> RunContext[ScenarioGenerationDeps]:
+        """Build the run context the generation functions expect outside an agent run."""
+        return RunContext(deps=self.deps, model=self.agent.model, usage=Usage())
 
     async def create_scenario_from_concept(self, initial_concept: str, additional_requirements: str = "") -> StoryWorld:
         """
@@ -285,51 +322,95 @@ class ScenarioGenerationManager:
         """
         with logfire.span(
             'Scenario generation manager: create scenario',
-            initial_concept=initial_concept[:50] + '...' if len(initial_concept) > 50 else initial_concept,
+            initial_concept=preview_text(initial_concept, 50),
             additional_requirements_length=len(additional_requirements)
         ) as span:
             
-            # Use the scenario generation agent
-            result = await scenario_generator_agent.run(
-                f"Generate scenario: {initial_concept}\nAdditional requirements: {additional_requirements}",
-                deps=self.deps
-            )
-            scenario_request = result.data
-            
-            # Create opening scene
-            opening_scene = Scene(
-                location=scenario_request.opening_scene_location,
-                description=scenario_request.opening_scene_description,
-                atmosphere=scenario_request.opening_scene_atmosphere,
-                active_characters=[],  # Will be populated when characters are created
-                props=[]
-            )
+            # Reason: delegating keeps a single canonical prompt, so manager calls
+            # share the provider prompt cache and the scenario cache with the tool
+            scenario_request = await generate_scenario(self._run_context(), initial_concept, additional_requirements)
             
-            # Create StoryWorld object
-            story_world = StoryWorld(
-                premise=scenario_request.premise,
-                setting=scenario_request.setting,
-                conflicts=scenario_request.conflicts,
-                characters={},  # Will be populated by character creation
-                current_scene=opening_scene,
-                history=[f"Story begins: {scenario_request.premise}"]
-            )
+            story_world = self.build_story_world(scenario_request)
+            conflicts_count = len(story_world.conflicts)
+            character_concepts_count = len(scenario_request.character_concepts)
             
-            span.set_attribute('story_world_created', True)
-            span.set_attribute('premise_length', len(story_world.premise))
-            span.set_attribute('setting_length', len(story_world.setting))
-            span.set_attribute('conflicts_count', len(story_world.conflicts))
-            span.set_attribute('character_concepts_count', len(scenario_request.character_concepts))
+            span.set_attributes({
+                'story_world_created': True,
+                'premise_length': len(story_world.premise),
+                'setting_length': len(story_world.setting),
+                'conflicts_count': conflicts_count,
+                'character_concepts_count': character_concepts_count,
+            })
             
             logfire.info(
                 'Story world created from scenario',
-                premise_preview=story_world.premise[:100] + '...' if len(story_world.premise) > 100 else story_world.premise,
-                conflicts_count=len(story_world.conflicts),
-                character_concepts_count=len(scenario_request.character_concepts)
+                premise_preview=preview_text(story_world.premise),
+                conflicts_count=conflicts_count,
+                character_concepts_count=character_concepts_count
             )
             
             return story_world, scenario_request.character_concepts
 
+    @staticmethod
+    def build_story_world(scenario_request: ScenarioGenerationRequest) -> StoryWorld:
+        """
+        Build a story world from a generated scenario.
+        
+        Args:
+            scenario_request: The generated scenario
+            
+        Returns:
+            StoryWorld with the opening scene and no characters yet
+        """
+        # Create opening scene
+        opening_scene = Scene(
+            location=scenario_request.opening_scene_location,
+            description=scenario_request.opening_scene_description,
+            atmosphere=scenario_request.opening_scene_atmosphere,
+            active_characters=[],  # Will be populated when characters are created
+            props=[]
+        )
+        
+        return StoryWorld(
+            premise=scenario_request.premise,
+            setting=scenario_request.setting,
+            conflicts=scenario_request.conflicts,
+            characters={},  # Will be populated by character creation
+            current_scene=opening_scene,
+            history=[f"Story begins: {scenario_request.premise}"]
+        )
+
+    async def create_scenarios_batch(
+        self,
+        concepts: List[str],
+        additional_requirements: str = ""
+    ) -> List[Tuple[StoryWorld, List[str]]]:
+        """
+        Create several scenario variations concurrently.
+        
+        Each concept is an independent LLM request sharing the same HTTP client,
+        so they run concurrently, bounded by SCENARIO_CONCURRENCY to stay within
+        provider rate limits.
+        
+        Args:
+            concepts: Initial story concepts to generate scenarios for
+            additional_requirements: Requirements applied to every concept
+            
+        Returns:
+            List of (StoryWorld, character concepts) tuples, in concept order
+        """
+        with logfire.span(
+            'Scenario generation manager: create scenarios batch',
+            concept_count=len(concepts)
+        ):
+            semaphore = asyncio.Semaphore(SCENARIO_GENERATION_CONCURRENCY)
+
+            async def create_one(concept: str) -> Tuple[StoryWorld, List[str]]:
+                async with semaphore:
+                    return await self.create_scenario_from_concept(concept, additional_requirements)
+
+            return list(await asyncio.gather(*(create_one(concept) for concept in concepts)))
+
     async def refine_scenario_from_feedback(self, story_world: StoryWorld, refinement_feedback: str) -> StoryWorld:
         """
         Refine an existing scenario based on user feedback.
@@ -343,7 +424,7 @@ class ScenarioGenerationManager:
         """
         with logfire.span(
             'Scenario generation manager: refine scenario',
-            refinement_feedback=refinement_feedback[:50] + '...' if len(refinement_feedback) > 50 else refinement_feedback,
+            refinement_feedback=preview_text(refinement_feedback, 50),
             current_premise_length=len(story_world.premise)
         ) as span:
             
@@ -357,17 +438,7 @@ class ScenarioGenerationManager:
                 'opening_scene_atmosphere': story_world.current_scene.atmosphere
             }
             
-            # Use the scenario generation agent for refinement
-            refinement_prompt = f"""
-Current scenario: {current_scenario}
-User feedback: {refinement_feedback}
-Please refine the scenario based on this feedback.
-"""
-            result = await scenario_generator_agent.run(
-                refinement_prompt,
-                deps=self.deps
-            )
-            refined_scenario = result.data
+            refined_scenario = await refine_scenario(self._run_context(), current_scenario, refinement_feedback)
             
             # Update the story world with refined data
             story_world.premise = refined_scenario.premise
@@ -384,15 +455,18 @@ Please refine the scenario based on this feedback.
             # Add to history
             story_world.add_history_entry("Scenario refined based on user feedback")
             
-            span.set_attribute('scenario_refined', True)
-            span.set_attribute('new_premise_length', len(story_world.premise))
-            span.set_attribute('new_setting_length', len(story_world.setting))
-            span.set_attribute('new_conflicts_count', len(story_world.conflicts))
+            conflicts_count = len(story_world.conflicts)
+            span.set_attributes({
+                'scenario_refined': True,
+                'new_premise_length': len(story_world.premise),
+                'new_setting_length': len(story_world.setting),
+                'new_conflicts_count': conflicts_count,
+            })
             
             logfire.info(
                 'Scenario refined successfully',
-                new_premise_preview=story_world.premise[:100] + '...' if len(story_world.premise) > 100 else story_world.premise,
-                new_conflicts_count=len(story_world.conflicts)
+                new_premise_preview=preview_text(story_world.premise),
+                new_conflicts_count=conflicts_count
             )
             
             return story_world
@@ -409,7 +483,7 @@ Please refine the scenario based on this feedback.
         """
         return {
             'premise': story_world.premise,
-            'setting': story_world.setting[:200] + '...' if len(story_world.setting) > 200 else story_world.setting,
+            'setting': preview_text(story_world.setting, 200),
             'conflicts_count': len(story_world.conflicts),
             'current_scene': story_world.current_scene.location,
             'characters_count': len(story_world.characters),
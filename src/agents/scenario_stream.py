@@ -0,0 +1,78 @@
+"""Streaming scenario generation that yields partial scenarios as they arrive."""
+
+from __future__ import annotations
+
+from typing import AsyncIterator
+
+import logfire
+
+from agents.model import get_model_name
+from agents.response_cache import SCENARIO_CACHE_ENABLED, ResponseCache
+from agents.scenario_generator import (
+    SCENARIO_GENERATION_PROMPT,
+    SCENARIO_REQUEST_TEMPLATE,
+    ScenarioGenerationDeps,
+    ScenarioGenerationRequest,
+    get_scenario_agent,
+    scenario_response_cache,
+)
+
+
+async def stream_scenario(
+    deps: ScenarioGenerationDeps,
+    initial_concept: str,
+    additional_requirements: str = ""
+) -> AsyncIterator[ScenarioGenerationRequest]:
+    """
+    Generate a scenario from a concept, streaming partial results.
+
+    Uses the same prompt and scenario cache as generate_scenario, but yields
+    each partially validated scenario so callers can show the premise and
+    setting while the rest is still being generated. Pass the last yielded
+    scenario to ScenarioGenerationManager.build_story_world once the stream ends.
+
+    No span is opened here: a span held across yields would stay current in
+    the consumer's code between items. Callers that want one should open it
+    around their own ``async for`` loop.
+
+    Args:
+        deps: Scenario generation dependencies
+        initial_concept: The initial story concept from the user
+        additional_requirements: Any additional requirements or constraints
+
+    Yields:
+        Partially generated scenarios, ending with the complete one
+    """
+    context_info = SCENARIO_REQUEST_TEMPLATE.format_map({
+        'initial_concept': initial_concept,
+        'additional_requirements': additional_requirements
+    })
+
+    cache_key = None
+    if SCENARIO_CACHE_ENABLED:
+        cache_key = ResponseCache.make_key(get_model_name(), SCENARIO_GENERATION_PROMPT, context_info)
+        cached = await scenario_response_cache.get(cache_key)
+        if cached is not None:
+            logfire.info('Scenario stream served from cache')
+            yield ScenarioGenerationRequest.model_validate_json(cached)
+            return
+
+    partial_count = 0
+    partial = None
+    async with get_scenario_agent().run_stream(context_info, deps=deps) as result:
+        async for partial in result.stream():
+            partial_count += 1
+            yield partial
+        scenario = await result.get_output()
+
+    if scenario != partial:
+        yield scenario
+
+    if cache_key is not None:
+        await scenario_response_cache.put(cache_key, scenario.model_dump_json())
+
+    logfire.info(
+        'Scenario stream completed',
+        partial_count=partial_count,
+        final_premise_length=len(scenario.premise)
+    )
@@ -2,17 +2,28 @@
 
 from __future__ import annotations
 
-from typing import Dict, Tuple
+import asyncio
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 
 import httpx
 import logfire
 from pydantic_ai import Agent
 
 from models.story import Character, Scene, StoryWorld
-from agents.character import StoryDeps, embody_character, get_model
+from agents.character import VERBOSE_SPANS, StoryDeps, embody_character
 from agents.character_creator import CharacterCreationManager
+from agents.http_client import get_http_client
+from agents.model import get_model
 from agents.scenario_generator import ScenarioGenerationManager
 from agents.prompts import STORYTELLER_SYSTEM_PROMPT
+from agents.response_cache import STORY_RESPONSE_CACHE_ENABLED, ResponseCache
+from utils.helpers import preview_text
+from utils.telemetry import trace_span
+
+# Fixed opening of every continuation prompt, ahead of the scene block
+STORY_CONTINUATION_INSTRUCTIONS = (
+    "Continue the narrative naturally, using character tools when NPCs need to speak or act.\n\n"
+)
 
 
 class StorytellerAgent:
@@ -23,26 +34,34 @@ class StorytellerAgent:
     interactions through delegation to the character agent.
     """
 
-    def __init__(self, client: httpx.AsyncClient):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
         """
         Initialize the storyteller agent.
         
         Args:
-            client: HTTP client for external requests
+            client: HTTP client for external requests, defaults to the shared
+                client. A client passed in should use the same pool limits as
+                agents.http_client so concurrent sub-agent calls reuse connections.
         """
-        self.client = client
+        self.client = client or get_http_client()
+
+        model = get_model()
+        self._model_name = model.model_name
 
         # Create the main agent with character tool
         self.agent = Agent(
-            get_model(),
+            model,
             system_prompt=STORYTELLER_SYSTEM_PROMPT,
             deps_type=StoryDeps,
             tools=[embody_character],
             retries=2
         )
         
+        # Meta-command responses keyed by prompt, used when STORY_RESPONSE_CACHE is set
+        self._response_cache = ResponseCache(128)
+
         # Initialize specialized managers
-        self.scenario_manager = ScenarioGenerationManager(client)
+        self.scenario_manager = ScenarioGenerationManager(self.client)
         self.character_creation_manager = None  # Will be initialized when we have a story world
 
     async def create_scenario(self, initial_concept: str) -> StoryWorld:
@@ -55,13 +74,13 @@ class StorytellerAgent:
         Returns:
             A complete StoryWorld with all necessary elements
         """
-        with logfire.span(
+        with trace_span(
             'Creating story scenario from concept: {concept}',
             concept=initial_concept
         ) as span:
             
             # Step 1: Create the base scenario using scenario generator
-            with logfire.span('Generating base scenario') as scenario_span:
+            with trace_span('Generating base scenario') as scenario_span:
                 story_world, character_concepts = await self.scenario_manager.create_scenario_from_concept(initial_concept)
                 scenario_span.set_attribute('scenario_generated', True)
                 scenario_span.set_attribute('character_concepts_count', len(character_concepts))
@@ -69,31 +88,38 @@ class StorytellerAgent:
                 
                 logfire.info(
                     'Base scenario generated',
-                    premise_preview=story_world.premise[:100] + '...' if len(story_world.premise) > 100 else story_world.premise,
+                    premise_preview=preview_text(story_world.premise),
                     character_concepts=character_concepts
                 )
             
             # Step 2: Initialize character creation manager with the story world
-            with logfire.span('Initializing character creation') as char_init_span:
+            with trace_span('Initializing character creation') as char_init_span:
                 self.character_creation_manager = CharacterCreationManager(story_world, self.client)
                 char_init_span.set_attribute('character_manager_initialized', True)
             
             # Step 3: Create characters from the concepts
-            with logfire.span('Creating characters from concepts') as char_creation_span:
-                created_characters = []
-                for i, concept in enumerate(character_concepts):
-                    with logfire.span(f'Creating character {i+1}/{len(character_concepts)}') as single_char_span:
-                        single_char_span.set_attribute('character_concept', concept[:50] + '...' if len(concept) > 50 else concept)
+            with trace_span('Creating characters from concepts') as char_creation_span:
+                story_context = f"Setting: {story_world.setting}\nPremise: {story_world.premise}"
+
+                async def create_one(i: int, concept: str) -> Character:
+                    with trace_span(f'Creating character {i+1}/{len(character_concepts)}') as single_char_span:
+                        single_char_span.set_attribute('character_concept', preview_text(concept, 50))
                         
                         # Create character using the character creation agent
                         character = await self.character_creation_manager.create_character_from_concept(
                             concept, 
-                            f"Setting: {story_world.setting}\nPremise: {story_world.premise}"
+                            story_context
                         )
-                        created_characters.append(character)
                         
                         single_char_span.set_attribute('character_created', True)
                         single_char_span.set_attribute('character_name', character.name)
+                        return character
+
+                # Reason: each concept is an independent LLM request, so running them
+                # concurrently takes roughly as long as the slowest one
+                created_characters = list(await asyncio.gather(
+                    *(create_one(i, concept) for i, concept in enumerate(character_concepts))
+                ))
                 
                 char_creation_span.set_attribute('total_characters_created', len(created_characters))
                 char_creation_span.set_attribute('character_names', [char.name for char in created_characters])
@@ -105,7 +131,7 @@ class StorytellerAgent:
                 )
             
             # Step 4: Update the opening scene with active characters
-            with logfire.span('Updating opening scene with characters') as scene_span:
+            with trace_span('Updating opening scene with characters') as scene_span:
                 # Add up to 2 characters to the opening scene as active
                 active_characters = [char.name for char in created_characters[:2]]
                 story_world.current_scene.active_characters = active_characters
@@ -120,33 +146,34 @@ class StorytellerAgent:
                     active_characters=active_characters
                 )
                 
-                # Enhanced logging for final story world data structure
-                logfire.info(
-                    'Complete story world created',
-                    story_world_structure={
-                        'premise_length': len(story_world.premise),
-                        'setting_length': len(story_world.setting),
-                        'conflicts': story_world.conflicts,
-                        'character_names': list(story_world.characters.keys()),
-                        'character_details': {
-                            name: {
-                                'description_length': len(char.description),
-                                'personality_length': len(char.personality),
-                                'speech_patterns_length': len(char.speech_patterns),
-                                'memories_count': len(char.memories),
-                                'relationships_count': len(char.relationships)
-                            } for name, char in story_world.characters.items()
-                        },
-                        'current_scene': {
-                            'location': story_world.current_scene.location,
-                            'description_length': len(story_world.current_scene.description),
-                            'atmosphere': story_world.current_scene.atmosphere,
-                            'active_characters': story_world.current_scene.active_characters,
-                            'props': story_world.current_scene.props
-                        },
-                        'history_entries': len(story_world.history)
-                    }
-                )
+                # Reason: the per-character structure dump is only built when verbose spans are on
+                if VERBOSE_SPANS:
+                    logfire.info(
+                        'Complete story world created',
+                        story_world_structure={
+                            'premise_length': len(story_world.premise),
+                            'setting_length': len(story_world.setting),
+                            'conflicts': story_world.conflicts,
+                            'character_names': list(story_world.characters.keys()),
+                            'character_details': {
+                                name: {
+                                    'description_length': len(char.description),
+                                    'personality_length': len(char.personality),
+                                    'speech_patterns_length': len(char.speech_patterns),
+                                    'memories_count': len(char.memories),
+                                    'relationships_count': len(char.relationships)
+                                } for name, char in story_world.characters.items()
+                            },
+                            'current_scene': {
+                                'location': story_world.current_scene.location,
+                                'description_length': len(story_world.current_scene.description),
+                                'atmosphere': story_world.current_scene.atmosphere,
+                                'active_characters': story_world.current_scene.active_characters,
+                                'props': story_world.current_scene.props
+                            },
+                            'history_entries': len(story_world.history)
+                        }
+                    )
                 
                 span.set_attribute('scenario_created', True)
                 span.set_attribute('final_character_count', len(story_world.characters))
@@ -166,20 +193,21 @@ class StorytellerAgent:
         Returns:
             Tuple of (narrative response, updated story world)
         """
-        with logfire.span(
+        with trace_span(
             'Continuing story with user input',
-            user_input=user_input[:100] + '...' if len(user_input) > 100 else user_input,
+            user_input=preview_text(user_input),
             current_scene=story_world.current_scene.location,
             active_characters=story_world.current_scene.active_characters
         ) as span:
             # Check for meta-commands
-            is_meta = self._is_meta_command(user_input)
+            meta_instruction = self._parse_meta_command(user_input)
+            is_meta = meta_instruction is not None
             span.set_attribute('is_meta_command', is_meta)
             
             if is_meta:
-                with logfire.span('Handling meta-command') as meta_span:
+                with trace_span('Handling meta-command') as meta_span:
                     meta_span.set_attribute('meta_command', user_input)
-                    result = await self._handle_meta_command(user_input, story_world)
+                    result = await self._handle_meta_command(meta_instruction, story_world)
                     span.set_attribute('meta_command_processed', True)
                     return result
 
@@ -187,34 +215,81 @@ class StorytellerAgent:
             deps = StoryDeps(story_world=story_world, client=self.client)
 
             # Build context for the storytelling agent
-            with logfire.span('Building story context') as context_span:
-                story_context = self._build_story_context(user_input, story_world)
-                context_span.set_attribute('context_length', len(story_context))
+            with trace_span('Building story context') as context_span:
+                scene_context, turn_context = self._build_story_context(user_input, story_world)
+                context_length = len(scene_context) + len(turn_context)
+                context_span.set_attribute('context_length', context_length)
                 context_span.set_attribute('history_entries', len(story_world.history))
 
             # Get narrative response from the agent
-            with logfire.span(
+            with trace_span(
                 'Running LLM story continuation',
                 input_length=len(user_input),
-                context_length=len(story_context)
+                context_length=context_length
             ) as llm_span:
-                result = await self.agent.run(story_context, deps=deps)
-                llm_span.set_attribute('response_length', len(str(result.output)))
-                llm_span.set_attribute('model_used', str(get_model()))
+                result = await self.agent.run([scene_context, turn_context], deps=deps)
+                response = str(result.output)
+                llm_span.set_attribute('response_length', len(response))
+                llm_span.set_attribute('model_used', self._model_name)
                 logfire.info(
                     'LLM story continuation completed',
-                    response_preview=str(result.output)[:200] + '...' if len(str(result.output)) > 200 else str(result.output)
+                    response_preview=preview_text(response, 200)
                 )
 
-            # Update story history
-            with logfire.span('Updating story history') as history_span:
-                story_world.add_history_entry(f"User: {user_input}")
-                story_world.add_history_entry(f"Narrator: {result.output}")
-                history_span.set_attribute('total_history_entries', len(story_world.history))
-                span.set_attribute('story_continued', True)
-                span.set_attribute('final_history_length', len(story_world.history))
+            self._record_story_turn(user_input, response, story_world, span)
+            return response, story_world
+
+    async def continue_story_stream(self, user_input: str, story_world: StoryWorld) -> AsyncIterator[str]:
+        """
+        Continue the story, yielding the narrative as it is generated.
+        
+        Meta-commands are not streamed; their response is yielded in one piece.
+        The story history is only updated once the full response has arrived,
+        so an interrupted stream leaves story_world unchanged.
+        
+        Args:
+            user_input: The user's input or action
+            story_world: Current story world state, updated in place
+            
+        Yields:
+            Fragments of the narrative response in order
+        """
+        meta_instruction = self._parse_meta_command(user_input)
+        if meta_instruction is not None:
+            response, _ = await self.continue_story(user_input, story_world)
+            yield response
+            return
+
+        with trace_span(
+            'Streaming story continuation',
+            user_input=preview_text(user_input),
+            current_scene=story_world.current_scene.location,
+            active_characters=story_world.current_scene.active_characters
+        ) as span:
+            deps = StoryDeps(story_world=story_world, client=self.client)
+            scene_context, turn_context = self._build_story_context(user_input, story_world)
+            span.set_attribute('context_length', len(scene_context) + len(turn_context))
 
-            return str(result.output), story_world
+            fragments = []
+            async with self.agent.run_stream([scene_context, turn_context], deps=deps) as result:
+                async for fragment in result.stream_text(delta=True):
+                    fragments.append(fragment)
+                    yield fragment
+
+            response = ''.join(fragments)
+            span.set_attribute('response_length', len(response))
+            span.set_attribute('model_used', self._model_name)
+            self._record_story_turn(user_input, response, story_world, span)
+
+    @staticmethod
+    def _record_story_turn(user_input: str, response: str, story_world: StoryWorld, span: Any) -> None:
+        """Add a completed user turn and narrator response to the story history."""
+        with trace_span('Updating story history') as history_span:
+            story_world.add_history_entry(f"User: {user_input}")
+            story_world.add_history_entry(f"Narrator: {response}")
+            history_span.set_attribute('total_history_entries', len(story_world.history))
+            span.set_attribute('story_continued', True)
+            span.set_attribute('final_history_length', len(story_world.history))
 
     async def refine_scenario(self, feedback: str, story_world: StoryWorld) -> StoryWorld:
         """
@@ -227,14 +302,14 @@ class StorytellerAgent:
         Returns:
             Updated story world
         """
-        with logfire.span(
+        with trace_span(
             'Refining scenario based on feedback',
-            feedback=feedback[:100] + '...' if len(feedback) > 100 else feedback,
-            current_premise=story_world.premise[:50] + '...' if len(story_world.premise) > 50 else story_world.premise
+            feedback=preview_text(feedback),
+            current_premise=preview_text(story_world.premise, 50)
         ) as span:
             
             # Use the scenario manager to refine the scenario
-            with logfire.span('Refining scenario via scenario manager') as refine_span:
+            with trace_span('Refining scenario via scenario manager') as refine_span:
                 refined_world = await self.scenario_manager.refine_scenario_from_feedback(story_world, feedback)
                 refine_span.set_attribute('scenario_refined', True)
                 refine_span.set_attribute('new_premise_length', len(refined_world.premise))
@@ -242,8 +317,8 @@ class StorytellerAgent:
                 
                 logfire.info(
                     'Scenario refined via specialized agent',
-                    feedback_preview=feedback[:50] + '...' if len(feedback) > 50 else feedback,
-                    new_premise_preview=refined_world.premise[:100] + '...' if len(refined_world.premise) > 100 else refined_world.premise
+                    feedback_preview=preview_text(feedback, 50),
+                    new_premise_preview=preview_text(refined_world.premise)
                 )
                 
                 span.set_attribute('scenario_refined', True)
@@ -252,29 +327,34 @@ class StorytellerAgent:
                 
             return refined_world
 
+    @staticmethod
+    def _parse_meta_command(user_input: str) -> Optional[str]:
+        """Return the instruction inside a *asterisk* meta-command, or None for normal input."""
+        stripped = user_input.strip()
+        if len(stripped) >= 2 and stripped[0] == '*' and stripped[-1] == '*':
+            return stripped[1:-1]
+        return None
+
     def _is_meta_command(self, user_input: str) -> bool:
         """Check if user input is a meta-command with *asterisks*."""
-        return user_input.strip().startswith('*') and user_input.strip().endswith('*')
+        return self._parse_meta_command(user_input) is not None
 
-    async def _handle_meta_command(self, command: str, story_world: StoryWorld) -> Tuple[str, StoryWorld]:
+    async def _handle_meta_command(self, meta_instruction: str, story_world: StoryWorld) -> Tuple[str, StoryWorld]:
         """
         Handle meta-commands that alter story direction.
         
         Args:
-            command: The meta-command (including asterisks)
+            meta_instruction: The meta-command text without its asterisks
             story_world: Current story world state
             
         Returns:
             Tuple of (narrative response, updated story world)
         """
-        with logfire.span(
+        with trace_span(
             'Processing meta-command',
-            meta_command=command,
+            meta_instruction=meta_instruction,
             current_scene=story_world.current_scene.location
         ) as span:
-            # Remove asterisks
-            meta_instruction = command.strip()[1:-1]
-            span.set_attribute('meta_instruction', meta_instruction)
 
             deps = StoryDeps(story_world=story_world, client=self.client)
 
@@ -283,56 +363,76 @@ class StorytellerAgent:
 The following change needs to be incorporated naturally into the ongoing narrative: {meta_instruction}
 
 Current scene: {story_world.current_scene.location}
-Recent history: {'; '.join(story_world.history[-3:]) if story_world.history else 'None'}
+Recent history: {'; '.join(story_world.recent_history(3)) or 'None'}
 
 Incorporate this change seamlessly without acknowledging it as a command. Just naturally weave it into the story.
 """
 
-            with logfire.span(
-                'Running LLM meta-command processing',
-                prompt_length=len(meta_prompt)
-            ) as llm_span:
-                result = await self.agent.run(meta_prompt, deps=deps)
-                llm_span.set_attribute('response_length', len(str(result.output)))
-                llm_span.set_attribute('model_used', str(get_model()))
-                logfire.info(
-                    'LLM meta-command processing completed',
-                    meta_instruction=meta_instruction,
-                    response_preview=str(result.output)[:200] + '...' if len(str(result.output)) > 200 else str(result.output)
-                )
+            cache_key = None
+            response = None
+            if STORY_RESPONSE_CACHE_ENABLED:
+                cache_key = ResponseCache.make_key(self._model_name, meta_prompt)
+                response = self._response_cache.get(cache_key)
+                span.set_attribute('response_cache_hit', response is not None)
+
+            if response is None:
+                with trace_span(
+                    'Running LLM meta-command processing',
+                    prompt_length=len(meta_prompt)
+                ) as llm_span:
+                    result = await self.agent.run(
+                        meta_prompt,
+                        deps=deps,
+                        model_settings={'temperature': 0.0} if cache_key is not None else None
+                    )
+                    response = str(result.output)
+                    if cache_key is not None:
+                        self._response_cache.put(cache_key, response)
+                    llm_span.set_attribute('response_length', len(response))
+                    llm_span.set_attribute('model_used', self._model_name)
+                    logfire.info(
+                        'LLM meta-command processing completed',
+                        meta_instruction=meta_instruction,
+                        response_preview=preview_text(response, 200)
+                    )
 
             # Add to history as a natural story development
-            story_world.add_history_entry(f"Story development: {result.output}")
+            story_world.add_history_entry(f"Story development: {response}")
             span.set_attribute('meta_command_processed', True)
             span.set_attribute('history_entries_after', len(story_world.history))
 
-            return str(result.output), story_world
+            return response, story_world
 
-    def _build_story_context(self, user_input: str, story_world: StoryWorld) -> str:
+    def _build_story_context(self, user_input: str, story_world: StoryWorld) -> Tuple[str, str]:
         """
-        Build context string for the storytelling agent.
+        Build the context for the storytelling agent.
+        
+        The context is split so that the part that only changes with the scene
+        comes first and can be reused by the provider's prompt prefix cache
+        across turns; recent events and the user input follow in a separate part.
         
         Args:
             user_input: The user's current input
             story_world: Current story world state
             
         Returns:
-            Formatted context string
+            Tuple of (scene context, per-turn context)
         """
-        recent_history = story_world.history[-5:] if story_world.history else []
-        active_characters = story_world.current_scene.active_characters
+        scene = story_world.current_scene
+        scene_context = ''.join((
+            STORY_CONTINUATION_INSTRUCTIONS,
+            scene.prompt_block,
+            'Active Characters: ',
+            scene.active_characters_text,
+            '\n',
+        ))
 
-        context = f"""
-Current Scene: {story_world.current_scene.location}
-Scene Description: {story_world.current_scene.description}
-Atmosphere: {story_world.current_scene.atmosphere}
-Active Characters: {', '.join(active_characters) if active_characters else 'None'}
-
-Recent Story Events:
-{chr(10).join(recent_history) if recent_history else 'This is the beginning of the story.'}
-
-User Action/Input: {user_input}
-
-Continue the narrative naturally, using character tools when NPCs need to speak or act.
-"""
-        return context
+        recent_history = story_world.relevant_history(user_input)
+        turn_context = ''.join((
+            '\nRecent Story Events:\n',
+            '\n'.join(recent_history) if recent_history else 'This is the beginning of the story.',
+            '\n\nUser Action/Input: ',
+            user_input,
+            '\n',
+        ))
+        return scene_context, turn_context
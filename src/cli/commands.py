@@ -3,7 +3,11 @@
 
 from __future__ import annotations
 
-from typing import Optional
+import functools
+import inspect
+import io
+import os
+from typing import Any, Callable, Iterator, Optional
 
 from models.session import StorySession
 from storage.file_storage import FileStorage
@@ -13,6 +17,40 @@ from utils.helpers import (
     validate_environment,
 )
 
+NO_SESSION_MESSAGE = "❌ No active session. Load or create a story first."
+
+# Write buffer for exports, so streamed text lines reach disk in large chunks
+EXPORT_BUFFER_SIZE = 1 << 20
+
+
+def requires_session(handler: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Return NO_SESSION_MESSAGE instead of calling a handler without a session.
+    
+    Works for both plain and async handlers whose first argument after self
+    is the session; the session defaults to None on the wrapper.
+    
+    Args:
+        handler: Command handler method to guard
+        
+    Returns:
+        The guarded handler
+    """
+    if inspect.iscoroutinefunction(handler):
+        @functools.wraps(handler)
+        async def async_wrapper(self: Any, session: Optional[StorySession] = None, *args: Any, **kwargs: Any) -> str:
+            if session is None:
+                return NO_SESSION_MESSAGE
+            return await handler(self, session, *args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(handler)
+    def wrapper(self: Any, session: Optional[StorySession] = None, *args: Any, **kwargs: Any) -> str:
+        if session is None:
+            return NO_SESSION_MESSAGE
+        return handler(self, session, *args, **kwargs)
+    return wrapper
+
 
 class CommandHandler:
     """
@@ -31,7 +69,7 @@ class CommandHandler:
         """
         self.storage = storage
 
-    async def handle_info_command(self, session: Optional[StorySession] = None) -> str:
+    def handle_info_command(self, session: Optional[StorySession] = None) -> str:
         """
         Handle info command to display session or system information.
         
@@ -46,86 +84,59 @@ class CommandHandler:
         else:
             return self._format_system_info()
 
-    async def handle_characters_command(self, session: Optional[StorySession] = None) -> str:
+    @requires_session
+    def handle_characters_command(self, session: StorySession) -> str:
         """
         Handle characters command to list characters in current session.
         
         Args:
-            session: Optional current session
+            session: Current session; None returns NO_SESSION_MESSAGE
             
         Returns:
             Formatted character list
         """
-        if not session:
-            return "❌ No active session. Load or create a story first."
-
         if not session.world.characters:
             return "👥 No characters in this story yet."
 
-        output = ["👥 CHARACTERS IN CURRENT STORY", "-" * 30]
-
-        for i, (name, character) in enumerate(session.world.characters.items(), 1):
-            output.append(f"{i}. **{character.name}**")
-            output.append(f"   Description: {truncate_text(character.description, 80)}")
-            output.append(f"   Personality: {truncate_text(character.personality, 80)}")
+        return "\n".join(self._iter_character_lines(session))
 
-            if character.relationships:
-                relationships = ", ".join([f"{name}: {rel}" for name, rel in character.relationships.items()])
-                output.append(f"   Relationships: {truncate_text(relationships, 80)}")
-
-            if character.memories:
-                recent_memories = character.memories[-3:]  # Last 3 memories
-                output.append(f"   Recent memories: {len(character.memories)} total")
-                for memory in recent_memories:
-                    output.append(f"     • {truncate_text(memory, 60)}")
-
-            output.append("")  # Empty line between characters
-
-        return "\n".join(output)
-
-    async def handle_history_command(self, session: Optional[StorySession] = None, count: int = 10) -> str:
+    @requires_session
+    def handle_history_command(self, session: StorySession, count: int = 10) -> str:
         """
         Handle history command to display story history.
         
         Args:
-            session: Optional current session
+            session: Current session; None returns NO_SESSION_MESSAGE
             count: Number of history entries to show
             
         Returns:
             Formatted history string
         """
-        if not session:
-            return "❌ No active session. Load or create a story first."
-
         if not session.world.history:
             return "📜 No story history yet."
 
         output = [f"📜 STORY HISTORY (Last {count} entries)", "-" * 40]
 
-        recent_history = session.world.history[-count:] if len(session.world.history) > count else session.world.history
-
-        for i, entry in enumerate(recent_history, 1):
+        for i, entry in enumerate(session.world.recent_history(count), 1):
             output.append(f"{i}. {entry}")
 
-        if len(session.world.history) > count:
-            remaining = len(session.world.history) - count
+        remaining = len(session.world.history) - count
+        if remaining > 0:
             output.append(f"\n... and {remaining} earlier entries")
 
         return "\n".join(output)
 
-    async def handle_scene_command(self, session: Optional[StorySession] = None) -> str:
+    @requires_session
+    def handle_scene_command(self, session: StorySession) -> str:
         """
         Handle scene command to display current scene details.
         
         Args:
-            session: Optional current session
+            session: Current session; None returns NO_SESSION_MESSAGE
             
         Returns:
             Formatted scene information
         """
-        if not session:
-            return "❌ No active session. Load or create a story first."
-
         scene = session.world.current_scene
         output = ["🎬 CURRENT SCENE", "-" * 20]
 
@@ -136,7 +147,7 @@ class CommandHandler:
         ])
 
         if scene.active_characters:
-            output.append(f"👥 Present: {', '.join(scene.active_characters)}")
+            output.append(f"👥 Present: {scene.active_characters_text}")
         else:
             output.append("👥 Present: You are alone")
 
@@ -145,86 +156,81 @@ class CommandHandler:
 
         return "\n".join(output)
 
-    async def handle_export_command(self, session: Optional[StorySession] = None, format: str = "txt") -> str:
+    @requires_session
+    async def handle_export_command(self, session: StorySession, format: str = "txt") -> str:
         """
         Handle export command to export session data.
         
         Args:
-            session: Optional current session
+            session: Current session; None returns NO_SESSION_MESSAGE
             format: Export format (txt, json)
             
         Returns:
             Status message about export
         """
-        if not session:
-            return "❌ No active session. Load or create a story first."
-
         try:
             filename = f"story_export_{session.id[:8]}.{format}"
 
-            if format == "txt":
-                content = self._export_as_text(session)
-            elif format == "json":
-                content = session.to_json()
-            else:
+            if format not in ("txt", "json"):
                 return "❌ Unsupported format. Use 'txt' or 'json'."
 
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(content)
+            if format == "txt":
+                # Reason: stream straight into a buffered file instead of building the
+                # whole export as one string, so large histories don't double peak memory
+                with open(filename, 'w', encoding='utf-8', buffering=EXPORT_BUFFER_SIZE) as f:
+                    f.writelines(self._iter_export_lines(session))
+            else:
+                # The JSON is one bytes object, so this is a single write
+                with open(filename, 'wb', buffering=EXPORT_BUFFER_SIZE) as f:
+                    f.write(session.to_json_bytes())
 
             return f"✅ Story exported to {filename}"
 
         except Exception as e:
             return f"❌ Export failed: {e}"
 
-    async def handle_stats_command(self, session: Optional[StorySession] = None) -> str:
+    @requires_session
+    def handle_stats_command(self, session: StorySession) -> str:
         """
         Handle stats command to display session statistics.
         
         Args:
-            session: Optional current session
+            session: Current session; None returns NO_SESSION_MESSAGE
             
         Returns:
             Formatted statistics
         """
-        if not session:
-            return "❌ No active session. Load or create a story first."
-
-        output = ["📊 SESSION STATISTICS", "-" * 25]
-
-        # Basic stats
-        character_count = len(session.world.characters)
-        history_length = len(session.world.history)
-        conflict_count = len(session.world.conflicts)
-
-        output.extend([
-            f"🆔 Session ID: {session.id}",
-            f"📅 Created: {session.created_at.strftime('%Y-%m-%d %H:%M')}",
-            f"🔄 Last updated: {get_display_timestamp(session.last_updated)}",
-            f"👥 Characters: {character_count}",
-            f"📜 History entries: {history_length}",
-            f"⚔️  Conflicts: {conflict_count}",
-        ])
+        buffer = io.StringIO()
+        write = buffer.write
+
+        # Basic stats, cached on the session until the world is next updated
+        stats = session.get_stats()
+        character_count = stats.character_count
+
+        write("📊 SESSION STATISTICS\n")
+        write("-" * 25 + "\n")
+        write(f"🆔 Session ID: {session.id}\n")
+        write(f"📅 Created: {session.created_display}\n")
+        write(f"🔄 Last updated: {get_display_timestamp(session.last_updated)}\n")
+        write(f"👥 Characters: {character_count}\n")
+        write(f"📜 History entries: {stats.history_length}\n")
+        write(f"⚔️  Conflicts: {stats.conflict_count}")
 
         # Character memory stats
-        if session.world.characters:
-            total_memories = sum(len(char.memories) for char in session.world.characters.values())
-            avg_memories = total_memories / character_count if character_count > 0 else 0
-            output.append(f"🧠 Total character memories: {total_memories} (avg: {avg_memories:.1f} per character)")
+        if character_count:
+            avg_memories = stats.total_memories / character_count
+            write(f"\n🧠 Total character memories: {stats.total_memories} (avg: {avg_memories:.1f} per character)")
 
         # Session file size (if available)
         try:
-            import os
-            session_file = f"stories/{session.id}.json"
-            if os.path.exists(session_file):
-                file_size = os.path.getsize(session_file)
-                output.append(f"💾 File size: {file_size:,} bytes")
-        except:
+            file_size = os.stat(os.path.join(self.storage.storage_dir, f"{session.id}.json")).st_size
+            write(f"\n💾 File size: {file_size:,} bytes")
+        except OSError:
             pass
 
-        return "\n".join(output)
+        return buffer.getvalue()
 
-    async def handle_diagnostics_command(self) -> str:
+    def handle_diagnostics_command(self) -> str:
         """
         Handle diagnostics command to check system status.
         
@@ -243,7 +249,7 @@ class CommandHandler:
 
         # Storage diagnostics
         try:
-            sessions = self.storage.list_sessions()
+            sessions = self.storage.list_sessions_meta()
             output.append(f"\n💾 Storage: ✅ Working ({len(sessions)} sessions)")
         except Exception as e:
             output.append(f"\n💾 Storage: ❌ Error - {e}")
@@ -269,7 +275,7 @@ class CommandHandler:
         output.extend([
             f"🆔 ID: {session.id}",
             f"📖 Story: {session.get_display_name()}",
-            f"📅 Created: {session.created_at.strftime('%Y-%m-%d %H:%M')}",
+            f"📅 Created: {session.created_display}",
             f"🔄 Updated: {get_display_timestamp(session.last_updated)}",
             "",
             f"📝 Premise: {session.world.premise}",
@@ -287,53 +293,89 @@ class CommandHandler:
         output = ["ℹ️  SYSTEM INFORMATION", "-" * 25]
 
         try:
-            sessions = self.storage.list_sessions()
+            sessions = self.storage.list_sessions_meta()
             output.extend([
                 f"💾 Total sessions: {len(sessions)}",
                 f"📁 Storage directory: {self.storage.storage_dir}",
             ])
 
             if sessions:
-                most_recent = max(sessions, key=lambda s: s.last_updated)
-                output.append(f"🔄 Most recent: {most_recent.get_display_name()}")
+                # Reason: list_sessions_meta is sorted newest first
+                output.append(f"🔄 Most recent: {sessions[0].display_name}")
         except Exception as e:
             output.append(f"❌ Storage error: {e}")
 
         return "\n".join(output)
 
-    def _export_as_text(self, session: StorySession) -> str:
-        """Export session as formatted text."""
-        output = [
-            f"STORY EXPORT: {session.get_display_name()}",
-            "=" * 50,
-            f"Session ID: {session.id}",
-            f"Created: {session.created_at}",
-            f"Last Updated: {session.last_updated}",
-            "",
-            "PREMISE:",
-            session.world.premise,
-            "",
-            "SETTING:",
-            session.world.setting,
-            "",
-        ]
-
-        if session.world.conflicts:
-            output.extend(["CONFLICTS:", *[f"• {conflict}" for conflict in session.world.conflicts], ""])
-
-        if session.world.characters:
-            output.append("CHARACTERS:")
-            for name, character in session.world.characters.items():
-                output.extend([
-                    f"• {character.name}",
-                    f"  Description: {character.description}",
-                    f"  Personality: {character.personality}",
-                    f"  Speech: {character.speech_patterns}",
-                    ""
-                ])
-
-        if session.world.history:
-            output.extend(["STORY HISTORY:", "-" * 20])
-            output.extend(session.world.history)
+    def _iter_character_lines(self, session: StorySession) -> Iterator[str]:
+        """
+        Yield the lines of the characters listing.
+        
+        Args:
+            session: Session whose characters to list
+            
+        Yields:
+            Lines without newlines, each character followed by an empty line
+        """
+        yield "👥 CHARACTERS IN CURRENT STORY"
+        yield "-" * 30
 
-        return "\n".join(output)
+        for i, character in enumerate(session.world.characters.values(), 1):
+            yield f"{i}. **{character.name}**"
+            yield f"   Description: {truncate_text(character.description, 80)}"
+            yield f"   Personality: {truncate_text(character.personality, 80)}"
+
+            if character.relationships:
+                yield f"   Relationships: {truncate_text(character.relationships_text, 80)}"
+
+            if character.memories:
+                yield f"   Recent memories: {len(character.memories)} total"
+                for memory in character.recent_memories(3):
+                    yield f"     • {truncate_text(memory, 60)}"
+
+            yield ""  # Empty line between characters
+
+    def _iter_export_lines(self, session: StorySession) -> Iterator[str]:
+        """
+        Yield the session as formatted text, one newline-terminated line at a time.
+
+        Args:
+            session: Session to export
+
+        Yields:
+            Lines of the text export
+        """
+        world = session.world
+        yield f"STORY EXPORT: {session.get_display_name()}\n"
+        yield "=" * 50 + "\n"
+        yield f"Session ID: {session.id}\n"
+        yield f"Created: {session.created_at}\n"
+        yield f"Last Updated: {session.last_updated}\n"
+        yield "\n"
+        yield "PREMISE:\n"
+        yield f"{world.premise}\n"
+        yield "\n"
+        yield "SETTING:\n"
+        yield f"{world.setting}\n"
+        yield "\n"
+
+        if world.conflicts:
+            yield "CONFLICTS:\n"
+            for conflict in world.conflicts:
+                yield f"• {conflict}\n"
+            yield "\n"
+
+        if world.characters:
+            yield "CHARACTERS:\n"
+            for character in world.characters.values():
+                yield f"• {character.name}\n"
+                yield f"  Description: {character.description}\n"
+                yield f"  Personality: {character.personality}\n"
+                yield f"  Speech: {character.speech_patterns}\n"
+                yield "\n"
+
+        if world.history:
+            yield "STORY HISTORY:\n"
+            yield "-" * 20 + "\n"
+            for entry in world.history:
+                yield f"{entry}\n"
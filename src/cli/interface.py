@@ -2,34 +2,83 @@
 
 from __future__ import annotations
 
-from typing import List, Optional
+import asyncio
+import os
+import sys
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
-import httpx
 import logfire
-from pydantic_ai.messages import (
-    ModelMessage,
-    ModelRequest,
-    ModelResponse,
-    TextPart,
-    UserPromptPart,
-)
 
-from agents.storyteller import StorytellerAgent
+from agents.http_client import get_http_client
+from cli.terminal_io import LineReader, write_story_stream
 from models.session import StorySession
 from models.story import StoryWorld
 from storage.file_storage import FileStorage
+from storage.models import SessionMetadata
 from utils.helpers import (
     format_character_list,
     format_story_history,
     get_display_timestamp,
-    format_character_speech,
-    format_narrator_text,
-    format_system_message,
     format_error_message,
     format_success_message,
-    parse_character_speech,
-    format_story_with_colored_dialogue,
 )
+from utils.telemetry import trace_span
+
+# Reason: the agent stack (pydantic-ai, OpenAI, prompts) is imported on first
+# use, so starting the CLI and menu-only actions stay fast.
+if TYPE_CHECKING:
+    from pydantic_ai.messages import ModelMessage
+
+    from agents.storyteller import StorytellerAgent
+
+
+# Static CLI text, built once and written with a single call per redraw
+MENU_BANNER = (
+    "\n" + "=" * 50 + "\n"
+    "📖 STORYTELLING MENU\n"
+    + "=" * 50 + "\n"
+    "1. 🆕 Create new story scenario\n"
+    "2. 📚 Load existing story session\n"
+    "3. 📋 List all saved sessions\n"
+    "4. 🗑️  Delete a story session\n"
+    "5. ❌ Exit\n"
+    "\n"
+)
+
+STORY_SESSION_BANNER = (
+    "\n🎭 STORY SESSION ACTIVE\n"
+    + "-" * 30 + "\n"
+    "📝 Type your character's actions or dialogue\n"
+    "🎯 Use *asterisks* for meta-commands to change story direction\n"
+    "💾 Type 'save' to save and continue, 'quit' to save and exit\n"
+    + "=" * 50 + "\n"
+)
+
+HELP_TEXT = (
+    "\n📚 HELP\n"
+    + "-" * 20 + "\n"
+    "💬 Regular input: Describe your character's actions or speech\n"
+    "🎯 *meta-command*: Change story direction (e.g., *it starts raining*)\n"
+    "💾 save: Save the session and continue\n"
+    "❌ quit/exit: Save and return to main menu\n"
+    "📊 status: Show current story state\n"
+    "❓ help/?): Show this help\n"
+)
+
+SCENARIO_HEADER = "\n🎨 CREATED SCENARIO\n" + "=" * 40 + "\n"
+STATE_HEADER = "\n📊 CURRENT STORY STATE\n" + "-" * 30 + "\n"
+
+
+# In-session commands, keyed by lowercased input, mapped to their action type
+SESSION_COMMANDS = {
+    'quit': 'quit',
+    'exit': 'quit',
+    'save': 'save',
+    'help': 'help',
+    '?': 'help',
+    'status': 'status',
+}
 
 
 class StorytellingCLI:
@@ -42,16 +91,21 @@ class StorytellingCLI:
 
     def __init__(self) -> None:
         """Initialize the CLI with necessary components."""
-        self.client = httpx.AsyncClient()
-        self.storyteller = StorytellerAgent(self.client)
+        self.client = get_http_client()
+        self._storyteller: Optional[StorytellerAgent] = None
         self.storage = FileStorage()
 
         self.current_session: Optional[StorySession] = None
         self.messages: List[ModelMessage] = []
+        # Number of self.messages already added to the session's message_history
+        self._saved_message_count = 0
+        # Session listing and the storage directory mtime (ns) it was read at
+        self._sessions_cache: Optional[Tuple[int, List[SessionMetadata]]] = None
+        self._line_reader = LineReader()
 
     async def start(self) -> None:
         """Start the interactive storytelling CLI."""
-        with logfire.span('Starting interactive storytelling CLI') as span:
+        with trace_span('Starting interactive storytelling CLI') as span:
             print("🎭 Welcome to the Interactive Storytelling Experience!")
             print("=" * 50)
 
@@ -69,25 +123,53 @@ class StorytellingCLI:
                 span.set_attribute('error_message', str(e))
                 logfire.error('CLI exited due to unexpected error', error=str(e))
                 raise
-            finally:
-                await self.client.aclose()
-                span.set_attribute('http_client_closed', True)
+
+    @property
+    def storyteller(self) -> StorytellerAgent:
+        """Storyteller agent, created on first use."""
+        if self._storyteller is None:
+            from agents.storyteller import StorytellerAgent
+            self._storyteller = StorytellerAgent(self.client)
+        return self._storyteller
+
+    async def _list_sessions_meta(self) -> List[SessionMetadata]:
+        """
+        List saved sessions, reusing the last listing while the storage directory is unchanged.
+        
+        Saves and deletes replace files in the storage directory and so bump
+        its mtime; the CLI also drops the cache itself around its own writes,
+        in case the filesystem's mtime resolution is coarse.
+        
+        Returns:
+            Session metadata, newest first
+        """
+        try:
+            mtime = os.stat(self.storage.storage_dir).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime is not None and self._sessions_cache is not None and self._sessions_cache[0] == mtime:
+            return self._sessions_cache[1]
+
+        sessions = await asyncio.to_thread(self.storage.list_sessions_meta)
+        try:
+            # Reason: read after listing, since refreshing the index may itself touch the directory
+            self._sessions_cache = (os.stat(self.storage.storage_dir).st_mtime_ns, sessions)
+        except OSError:
+            self._sessions_cache = None
+        return sessions
+
+    async def _ainput(self, prompt: str = "") -> str:
+        """Read a line of user input without blocking the event loop (see LineReader)."""
+        return await self._line_reader.read(prompt)
 
     async def _main_menu(self) -> None:
         """Display and handle the main menu."""
         while True:
             try:
-                print("\n" + "=" * 50)
-                print("📖 STORYTELLING MENU")
-                print("=" * 50)
-                print("1. 🆕 Create new story scenario")
-                print("2. 📚 Load existing story session")
-                print("3. 📋 List all saved sessions")
-                print("4. 🗑️  Delete a story session")
-                print("5. ❌ Exit")
-                print()
-
-                choice = input("Choose an option (1-5): ").strip()
+                sys.stdout.write(MENU_BANNER)
+                sys.stdout.flush()
+
+                choice = (await self._ainput("Choose an option (1-5): ")).strip()
 
                 if choice == "1":
                     await self._create_new_scenario()
@@ -111,12 +193,12 @@ class StorytellingCLI:
 
     async def _create_new_scenario(self) -> None:
         """Guide user through creating a new story scenario."""
-        with logfire.span('Creating new story scenario') as span:
+        with trace_span('Creating new story scenario') as span:
             print("\n🎨 CREATE NEW STORY SCENARIO")
             print("-" * 30)
 
             try:
-                initial_concept = input("💡 Enter your story concept: ").strip()
+                initial_concept = (await self._ainput("💡 Enter your story concept: ")).strip()
                 if not initial_concept:
                     print("❌ Story concept cannot be empty.")
                     span.set_attribute('empty_concept', True)
@@ -134,23 +216,24 @@ class StorytellingCLI:
 
             try:
                 # Create the story world using the storyteller agent
-                with logfire.span('Creating story world via storyteller') as create_span:
+                with trace_span('Creating story world via storyteller') as create_span:
                     story_world = await self.storyteller.create_scenario(initial_concept)
                     create_span.set_attribute('story_world_created', True)
                     create_span.set_attribute('character_count', len(story_world.characters))
 
                 # Create a new session
-                with logfire.span('Creating new story session') as session_span:
+                with trace_span('Creating new story session') as session_span:
                     self.current_session = StorySession.create_new(story_world)
                     self.messages = []
+                    self._saved_message_count = 0
                     session_span.set_attribute('session_id', self.current_session.id)
                     session_span.set_attribute('session_created', True)
 
                 # Display the created scenario
-                await self._display_scenario(story_world)
+                self._display_scenario(story_world)
 
                 # Ask for approval
-                with logfire.span('Getting user approval') as approval_span:
+                with trace_span('Getting user approval') as approval_span:
                     approved = await self._get_user_approval()
                     approval_span.set_attribute('scenario_approved', approved)
                     
@@ -172,9 +255,9 @@ class StorytellingCLI:
 
     async def _load_existing_session(self) -> None:
         """Load and continue an existing story session."""
-        with logfire.span('Loading existing story session') as span:
-            with logfire.span('Listing available sessions') as list_span:
-                sessions = self.storage.list_sessions()
+        with trace_span('Loading existing story session') as span:
+            with trace_span('Listing available sessions') as list_span:
+                sessions = await self._list_sessions_meta()
                 list_span.set_attribute('session_count', len(sessions))
 
             if not sessions:
@@ -183,32 +266,43 @@ class StorytellingCLI:
                 logfire.info('No saved sessions found when attempting to load')
                 return
 
-            print("\n📚 SAVED STORY SESSIONS")
-            print("-" * 30)
-
-            for i, session in enumerate(sessions, 1):
-                timestamp = get_display_timestamp(session.last_updated)
-                print(f"{i}. {session.get_display_name()} (Last updated: {timestamp})")
-
-            print(f"{len(sessions) + 1}. ← Back to main menu")
+            session_count = len(sessions)
+            back_choice = session_count + 1
+            print("\n📚 SAVED STORY SESSIONS\n" + "-" * 30)
+            now = datetime.now()
+            print("\n".join(
+                f"{i}. {meta.display_name} (Last updated: {get_display_timestamp(meta.last_updated, now)})"
+                for i, meta in enumerate(sessions, 1)
+            ))
+            print(f"{back_choice}. ← Back to main menu")
 
             try:
-                choice = int(input(f"\nSelect session (1-{len(sessions) + 1}): "))
+                choice = int(await self._ainput(f"\nSelect session (1-{back_choice}): "))
                 span.set_attribute('user_choice', choice)
 
-                if choice == len(sessions) + 1:
+                if choice == back_choice:
                     span.set_attribute('action', 'cancelled')
                     logfire.info('User cancelled session loading')
                     return
-                elif 1 <= choice <= len(sessions):
-                    selected_session = sessions[choice - 1]
+                elif 1 <= choice <= session_count:
+                    # Only the chosen session is read in full
+                    try:
+                        selected_session = await asyncio.to_thread(self.storage.load_session, sessions[choice - 1].id)
+                    except (ValueError, OSError) as e:
+                        selected_session = None
+                        logfire.error('Failed to load selected session', error=str(e))
+                    if selected_session is None:
+                        print("❌ Could not load that session.")
+                        span.set_attribute('action', 'load_failed')
+                        return
                     span.set_attribute('action', 'session_loaded')
                     span.set_attribute('loaded_session_id', selected_session.id)
                     span.set_attribute('session_name', selected_session.get_display_name())
                     
-                    with logfire.span('Setting up loaded session') as setup_span:
+                    with trace_span('Setting up loaded session') as setup_span:
                         self.current_session = selected_session
-                        self.messages = []  # Reset message history for session
+                        self.messages = self._restore_messages(selected_session)
+                        self._saved_message_count = len(self.messages)
                         setup_span.set_attribute('character_count', len(selected_session.world.characters))
                         setup_span.set_attribute('history_length', len(selected_session.world.history))
 
@@ -226,55 +320,51 @@ class StorytellingCLI:
 
     async def _list_sessions(self) -> None:
         """List all saved story sessions with details."""
-        sessions = self.storage.list_sessions()
+        sessions = await self._list_sessions_meta()
 
         if not sessions:
             print("\n📭 No saved sessions found.")
             return
 
-        print(f"\n📚 ALL STORY SESSIONS ({len(sessions)} total)")
-        print("-" * 50)
-
-        for i, session in enumerate(sessions, 1):
-            timestamp = get_display_timestamp(session.last_updated)
-            character_count = len(session.world.characters)
-            history_length = len(session.world.history)
-
-            print(f"{i}. {session.get_display_name()}")
-            print(f"   📅 Last updated: {timestamp}")
-            print(f"   👥 Characters: {character_count}")
-            print(f"   📜 History entries: {history_length}")
-            print(f"   🆔 ID: {session.id[:8]}...")
-            print()
+        now = datetime.now()
+        print(f"\n📚 ALL STORY SESSIONS ({len(sessions)} total)\n" + "-" * 50)
+        print("".join(
+            f"{i}. {meta.display_name}\n"
+            f"   📅 Last updated: {get_display_timestamp(meta.last_updated, now)}\n"
+            f"   👥 Characters: {meta.character_count}\n"
+            f"   📜 History entries: {meta.history_length}\n"
+            f"   🆔 ID: {meta.id[:8]}...\n"
+            "\n"
+            for i, meta in enumerate(sessions, 1)
+        ), end="")
 
     async def _delete_session(self) -> None:
         """Delete a story session."""
-        sessions = self.storage.list_sessions()
+        sessions = await self._list_sessions_meta()
 
         if not sessions:
             print("\n📭 No saved sessions found.")
             return
 
-        print("\n🗑️  DELETE STORY SESSION")
-        print("-" * 30)
-
-        for i, session in enumerate(sessions, 1):
-            print(f"{i}. {session.get_display_name()}")
-
-        print(f"{len(sessions) + 1}. ← Cancel")
+        session_count = len(sessions)
+        cancel_choice = session_count + 1
+        print("\n🗑️  DELETE STORY SESSION\n" + "-" * 30)
+        print("\n".join(f"{i}. {meta.display_name}" for i, meta in enumerate(sessions, 1)))
+        print(f"{cancel_choice}. ← Cancel")
 
         try:
-            choice = int(input(f"\nSelect session to delete (1-{len(sessions) + 1}): "))
+            choice = int(await self._ainput(f"\nSelect session to delete (1-{cancel_choice}): "))
 
-            if choice == len(sessions) + 1:
+            if choice == cancel_choice:
                 return
-            elif 1 <= choice <= len(sessions):
-                selected_session = sessions[choice - 1]
+            elif 1 <= choice <= session_count:
+                selected_meta = sessions[choice - 1]
 
                 # Confirm deletion
-                confirm = input(f"⚠️  Really delete '{selected_session.get_display_name()}'? (y/N): ")
+                confirm = await self._ainput(f"⚠️  Really delete '{selected_meta.display_name}'? (y/N): ")
                 if confirm.lower() == 'y':
-                    if self.storage.delete_session(selected_session.id):
+                    self._sessions_cache = None
+                    if await asyncio.to_thread(self.storage.delete_session, selected_meta.id):
                         print("✅ Session deleted successfully.")
                     else:
                         print("❌ Failed to delete session.")
@@ -287,7 +377,9 @@ class StorytellingCLI:
 
     async def _story_session(self) -> None:
         """Run the main storytelling session loop."""
-        with logfire.span(
+        from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart, UserPromptPart
+
+        with trace_span(
             'Running story session',
             session_id=self.current_session.id if self.current_session else None
         ) as span:
@@ -301,22 +393,17 @@ class StorytellingCLI:
             span.set_attribute('initial_character_count', len(self.current_session.world.characters))
             span.set_attribute('initial_history_length', len(self.current_session.world.history))
 
-            print("\n🎭 STORY SESSION ACTIVE")
-            print("-" * 30)
-            print("📝 Type your character's actions or dialogue")
-            print("🎯 Use *asterisks* for meta-commands to change story direction")
-            print("💾 Type 'save' to save and continue, 'quit' to save and exit")
-            print("=" * 50)
+            sys.stdout.write(STORY_SESSION_BANNER)
 
             # Display current story state
-            await self._display_current_state()
+            self._display_current_state()
 
             interaction_count = 0
             
             try:
                 while True:
                     try:
-                        user_input = input("\n> ").strip()
+                        user_input = (await self._ainput("\n> ")).strip()
 
                         if not user_input:
                             continue
@@ -331,29 +418,26 @@ class StorytellingCLI:
                         await self._save_current_session()
                         break
                     
-                    with logfire.span(
+                    with trace_span(
                         'Processing user input',
                         interaction_number=interaction_count,
                         input_length=len(user_input)
                     ) as input_span:
-                        if user_input.lower() in ['quit', 'exit']:
-                            input_span.set_attribute('action_type', 'quit')
-                            logfire.info('User initiated session quit')
-                            await self._save_current_session()
-                            break
-                        elif user_input.lower() == 'save':
-                            input_span.set_attribute('action_type', 'save')
-                            logfire.info('User initiated manual save')
-                            await self._save_current_session()
-                            print("💾 Session saved!")
-                            continue
-                        elif user_input.lower() in ['help', '?']:
-                            input_span.set_attribute('action_type', 'help')
-                            await self._display_help()
-                            continue
-                        elif user_input.lower() == 'status':
-                            input_span.set_attribute('action_type', 'status')
-                            await self._display_current_state()
+                        action = SESSION_COMMANDS.get(user_input.lower())
+                        if action is not None:
+                            input_span.set_attribute('action_type', action)
+                            if action == 'quit':
+                                logfire.info('User initiated session quit')
+                                await self._save_current_session()
+                                break
+                            if action == 'save':
+                                logfire.info('User initiated manual save')
+                                await self._save_current_session()
+                                print("💾 Session saved!")
+                            elif action == 'help':
+                                self._display_help()
+                            else:
+                                self._display_current_state()
                             continue
 
                         input_span.set_attribute('action_type', 'story_input')
@@ -361,23 +445,19 @@ class StorytellingCLI:
                         
                         # Process the story input
                         try:
-                            with logfire.span('Processing story continuation') as story_span:
-                                response, updated_world = await self.storyteller.continue_story(
-                                    user_input, self.current_session.world
-                                )
+                            with trace_span('Processing story continuation') as story_span:
+                                response = await self._stream_story_response(user_input)
                                 story_span.set_attribute('response_length', len(response))
                                 story_span.set_attribute('world_updated', True)
 
                             # Update session
-                            with logfire.span('Updating session state') as update_span:
+                            with trace_span('Updating session state') as update_span:
+                                updated_world = self.current_session.world
                                 self.current_session.update_world(updated_world)
                                 update_span.set_attribute('new_history_length', len(updated_world.history))
 
-                            # Display the narrative response with colored character speech
-                            print(f"\n{self._format_story_response(response)}")
-
                             # Update message history
-                            with logfire.span('Updating message history') as msg_span:
+                            with trace_span('Updating message history') as msg_span:
                                 self.messages.append(ModelRequest(parts=[UserPromptPart(content=user_input)]))
                                 self.messages.append(ModelResponse(parts=[TextPart(content=response)]))
                                 msg_span.set_attribute('total_messages', len(self.messages))
@@ -401,7 +481,7 @@ class StorytellingCLI:
                             )
                             
                             # Give user option to exit on error
-                            retry_choice = input("\n🔄 Would you like to (r)etry, (s)ave and quit, or (c)ontinue? ").lower().strip()
+                            retry_choice = (await self._ainput("\n🔄 Would you like to (r)etry, (s)ave and quit, or (c)ontinue? ")).lower().strip()
                             if retry_choice in ['s', 'save', 'quit']:
                                 await self._save_current_session()
                                 break
@@ -412,53 +492,53 @@ class StorytellingCLI:
                 span.set_attribute('total_interactions', interaction_count)
                 span.set_attribute('session_completed', True)
                 
-            except KeyboardInterrupt:
+            except (KeyboardInterrupt, asyncio.CancelledError) as interrupt:
+                # Reason: under asyncio.run, Ctrl+C while a turn is streaming cancels
+                # the task instead of raising KeyboardInterrupt; save either way
                 print("\n\n💾 Saving session before exit...")
                 span.set_attribute('exit_type', 'keyboard_interrupt')
                 span.set_attribute('total_interactions', interaction_count)
                 logfire.info('Story session interrupted by user, saving session')
                 await self._save_current_session()
+                if isinstance(interrupt, asyncio.CancelledError):
+                    raise
 
-    async def _display_scenario(self, story_world: StoryWorld) -> None:
+    def _display_scenario(self, story_world: StoryWorld) -> None:
         """Display the created scenario details."""
-        print("\n🎨 CREATED SCENARIO")
-        print("=" * 40)
-        print(f"📖 Premise: {story_world.premise}")
-        print(f"🌍 Setting: {story_world.setting}")
-        print(f"⚔️  Conflicts: {', '.join(story_world.conflicts)}")
-        print(f"👥 Characters: {format_character_list(story_world.characters)}")
-        print(f"🎬 Opening Scene: {story_world.current_scene.location}")
-        print(f"   {story_world.current_scene.description}")
-
-    async def _display_current_state(self) -> None:
+        print(
+            f"{SCENARIO_HEADER}"
+            f"📖 Premise: {story_world.premise}\n"
+            f"🌍 Setting: {story_world.setting}\n"
+            f"⚔️  Conflicts: {', '.join(story_world.conflicts)}\n"
+            f"👥 Characters: {format_character_list(story_world.characters)}\n"
+            f"🎬 Opening Scene: {story_world.current_scene.location}\n"
+            f"   {story_world.current_scene.description}"
+        )
+
+    def _display_current_state(self) -> None:
         """Display the current story state."""
         if not self.current_session:
             return
 
         world = self.current_session.world
-        print("\n📊 CURRENT STORY STATE")
-        print("-" * 30)
-        print(f"📍 Location: {world.current_scene.location}")
-        print(f"🌟 Atmosphere: {world.current_scene.atmosphere}")
-        print(f"👥 Present: {', '.join(world.current_scene.active_characters) if world.current_scene.active_characters else 'You are alone'}")
-        print(f"📜 Recent Events:\n{format_story_history(world.history, 3)}")
-
-    async def _display_help(self) -> None:
+        scene = world.current_scene
+        print(
+            f"{STATE_HEADER}"
+            f"📍 Location: {scene.location}\n"
+            f"🌟 Atmosphere: {scene.atmosphere}\n"
+            f"👥 Present: {scene.active_characters_text if scene.active_characters else 'You are alone'}\n"
+            f"📜 Recent Events:\n{format_story_history(world.history, 3)}"
+        )
+
+    def _display_help(self) -> None:
         """Display help information."""
-        print("\n📚 HELP")
-        print("-" * 20)
-        print("💬 Regular input: Describe your character's actions or speech")
-        print("🎯 *meta-command*: Change story direction (e.g., *it starts raining*)")
-        print("💾 save: Save the session and continue")
-        print("❌ quit/exit: Save and return to main menu")
-        print("📊 status: Show current story state")
-        print("❓ help/?): Show this help")
+        sys.stdout.write(HELP_TEXT)
 
     async def _get_user_approval(self) -> bool:
         """Get user approval for the created scenario."""
         while True:
             try:
-                choice = input("\n✅ Approve this scenario? (y/n/r for refine): ").lower().strip()
+                choice = (await self._ainput("\n✅ Approve this scenario? (y/n/r for refine): ")).lower().strip()
                 if choice in ['y', 'yes']:
                     return True
                 elif choice in ['n', 'no']:
@@ -474,7 +554,7 @@ class StorytellingCLI:
     async def _refine_scenario(self) -> None:
         """Allow user to refine the scenario."""
         try:
-            feedback = input("\n🔧 What would you like to change about the scenario? ").strip()
+            feedback = (await self._ainput("\n🔧 What would you like to change about the scenario? ")).strip()
             if not feedback:
                 return
         except KeyboardInterrupt:
@@ -490,7 +570,7 @@ class StorytellingCLI:
             refined_world = await self.storyteller.refine_scenario(feedback, self.current_session.world)
             self.current_session.update_world(refined_world)
 
-            await self._display_scenario(refined_world)
+            self._display_scenario(refined_world)
 
             if await self._get_user_approval():
                 print("✅ Refined scenario approved! Starting story session...")
@@ -502,9 +582,35 @@ class StorytellingCLI:
         except Exception as e:
             print(f"❌ Error refining scenario: {e}")
 
+    @staticmethod
+    def _restore_messages(session: StorySession) -> List[ModelMessage]:
+        """
+        Rebuild conversation messages from a session's saved message history.
+        
+        Uses pydantic-ai's module-level ModelMessagesTypeAdapter, whose
+        validator is built once, rather than constructing messages by hand.
+        
+        Args:
+            session: Session whose message_history to restore
+            
+        Returns:
+            The saved messages, or an empty list when the history was saved in
+            the older unstructured format; that history is then cleared so
+            later saves do not mix the two formats
+        """
+        from pydantic_ai.messages import ModelMessagesTypeAdapter
+        from pydantic_core import ValidationError
+
+        try:
+            return ModelMessagesTypeAdapter.validate_python(session.message_history)
+        except ValidationError:
+            logfire.info('Saved message history is not in the structured format; starting fresh')
+            session.message_history = []
+            return []
+
     async def _save_current_session(self) -> None:
         """Save the current session to storage."""
-        with logfire.span(
+        with trace_span(
             'Saving current session',
             session_id=self.current_session.id if self.current_session else None
         ) as span:
@@ -515,15 +621,30 @@ class StorytellingCLI:
                     span.set_attribute('history_length', len(self.current_session.world.history))
                     span.set_attribute('character_count', len(self.current_session.world.characters))
                     
-                    # Add message history to session
-                    with logfire.span('Preparing message history') as msg_span:
-                        self.current_session.message_history = [
-                            {"type": "message", "content": str(msg)} for msg in self.messages
-                        ]
-                        msg_span.set_attribute('messages_processed', len(self.messages))
-
-                    with logfire.span('Writing session to storage') as storage_span:
-                        self.storage.save_session(self.current_session)
+                    # Append messages added since the last save to the session history
+                    with trace_span('Preparing message history') as msg_span:
+                        from pydantic_ai.messages import ModelMessagesTypeAdapter
+
+                        history = self.current_session.message_history
+                        if len(history) == self._saved_message_count:
+                            # Only append onto a history written by earlier saves in this run
+                            new_messages = self.messages[self._saved_message_count:]
+                            history.extend(ModelMessagesTypeAdapter.dump_python(new_messages, mode='json'))
+                        else:
+                            # Reason: the stored history is not the one these messages were
+                            # appended to (e.g. an older format), so rewrite it in full
+                            new_messages = self.messages
+                            self.current_session.message_history = ModelMessagesTypeAdapter.dump_python(
+                                new_messages, mode='json'
+                            )
+                        self._saved_message_count = len(self.messages)
+                        msg_span.set_attribute('messages_processed', len(new_messages))
+
+                    with trace_span('Writing session to storage') as storage_span:
+                        # Reason: serializing and writing a long session runs in a worker
+                        # thread so in-flight HTTP work on the event loop keeps going
+                        self._sessions_cache = None
+                        await asyncio.to_thread(self.storage.save_session, self.current_session)
                         storage_span.set_attribute('save_successful', True)
                         
                     print(f"\n{format_success_message('Session saved successfully!')}")
@@ -548,16 +669,16 @@ class StorytellingCLI:
                 span.set_attribute('no_session_to_save', True)
                 logfire.warning('Attempted to save session but no current session exists')
 
-    def _format_story_response(self, response: str) -> str:
+    async def _stream_story_response(self, user_input: str) -> str:
         """
-        Format story response with colored character speech.
+        Continue the story, writing the narrative to stdout as it is generated.
         
         Args:
-            response: The raw story response from the storyteller
+            user_input: The user's story input
             
         Returns:
-            Formatted response with colored character dialogue
+            The full narrative response
         """
-        # Use the improved formatting function
-        formatted_response = format_story_with_colored_dialogue(response)
-        return f"{format_system_message('Story continues...')}\n{formatted_response}"
+        return await write_story_stream(
+            self.storyteller.continue_story_stream(user_input, self.current_session.world)
+        )
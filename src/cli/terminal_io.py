@@ -0,0 +1,130 @@
+"""Terminal input and streamed output helpers for the CLI."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+from typing import AsyncIterator, Optional
+
+from utils.helpers import format_story_with_colored_dialogue, format_system_message
+
+
+def read_line_in_thread(prompt: str) -> asyncio.Future:
+    """
+    Read a line from stdin in a daemon thread.
+
+    A daemon thread is used instead of asyncio.to_thread so a read left
+    waiting on stdin after Ctrl+C never blocks interpreter shutdown.
+
+    Args:
+        prompt: Prompt passed to input()
+
+    Returns:
+        Future resolved with the line, or with the error input() raised
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def resolve(result: Optional[str], error: Optional[BaseException]) -> None:
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def read() -> None:
+        try:
+            line = input(prompt)
+        except BaseException as e:
+            result, error = None, e
+        else:
+            result, error = line, None
+        try:
+            loop.call_soon_threadsafe(resolve, result, error)
+        except RuntimeError:
+            pass  # Event loop already closed
+
+    threading.Thread(target=read, name='cli-input', daemon=True).start()
+    return future
+
+
+class LineReader:
+    """
+    Reads user input lines without blocking the event loop.
+
+    Ctrl+C cancels the waiting task rather than interrupting input(), so the
+    cancellation is re-raised as KeyboardInterrupt for the CLI's handlers.
+    The abandoned read keeps waiting on stdin and answers the next prompt, so
+    no typed line is lost to it.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the reader with no read in progress."""
+        self._pending: Optional[asyncio.Future] = None
+
+    async def read(self, prompt: str = "") -> str:
+        """
+        Read a line of user input.
+
+        Args:
+            prompt: Prompt to display
+
+        Returns:
+            The line entered, without the trailing newline
+        """
+        if self._pending is None:
+            self._pending = read_line_in_thread(prompt)
+        else:
+            print(prompt, end="", flush=True)
+        try:
+            line = await asyncio.shield(self._pending)
+        except asyncio.CancelledError:
+            raise KeyboardInterrupt from None
+        except BaseException:
+            self._pending = None
+            raise
+        self._pending = None
+        return line
+
+
+def format_story_chunk(text: str) -> str:
+    """
+    Format complete lines of a streamed story response.
+
+    Args:
+        text: One or more complete lines, without the final newline
+
+    Returns:
+        The lines with colored character dialogue and a trailing newline
+    """
+    return f"{format_story_with_colored_dialogue(text)}\n"
+
+
+async def write_story_stream(fragments: AsyncIterator[str]) -> str:
+    """
+    Write a streamed story response to stdout as it is generated.
+
+    Text is written a line at a time so dialogue colouring, which needs the
+    whole quote, still applies.
+
+    Args:
+        fragments: Narrative text fragments in order
+
+    Returns:
+        The full narrative response
+    """
+    sys.stdout.write(f"\n{format_system_message('Story continues...')}\n")
+    parts = []
+    pending = ''
+    async for fragment in fragments:
+        parts.append(fragment)
+        complete, newline, pending = (pending + fragment).rpartition('\n')
+        if newline:
+            sys.stdout.write(format_story_chunk(complete))
+            sys.stdout.flush()
+    if pending:
+        sys.stdout.write(format_story_chunk(pending))
+        sys.stdout.flush()
+    return ''.join(parts)
@@ -10,8 +10,14 @@ from pathlib import Path
 import logfire
 from dotenv import load_dotenv
 
+from agents.http_client import close_http_client
 from cli.interface import StorytellingCLI
 from utils.helpers import validate_environment
+from utils.telemetry import setup_telemetry, trace_span
+
+# Reason: whether spans are recorded is decided from LOGFIRE_TOKEN/ENABLE_TRACING
+# on the first trace_span call, so .env must be loaded before cli_main opens one.
+load_dotenv()
 
 
 def setup_environment() -> bool:
@@ -21,47 +27,26 @@ def setup_environment() -> bool:
     Returns:
         True if setup successful, False otherwise
     """
-    with logfire.span('Setting up application environment') as span:
-        # Load environment variables
-        with logfire.span('Loading environment variables') as env_span:
-            load_dotenv()
-            env_span.set_attribute('dotenv_loaded', True)
+    with trace_span('Setting up application environment') as span:
+        # Reason: one span with per-phase attributes; these steps are sequential
+        # and too short to be worth child spans of their own. .env was loaded at import.
 
         # Configure logfire
-        with logfire.span('Configuring logfire') as logfire_span:
-            logfire_token = os.getenv('LOGFIRE_TOKEN')
-            if logfire_token:
-                logfire.configure(token=logfire_token, inspect_arguments=False)
-                logfire_span.set_attribute('logfire_token_present', True)
-            else:
-                logfire.configure(send_to_logfire='if-token-present', inspect_arguments=False)
-                logfire_span.set_attribute('logfire_token_present', False)
-            
-            # Enable instrumentation if available
-            instrumentation_count = 0
-            for instrument_name, instrument_func in [
-                ('pydantic_ai', logfire.instrument_pydantic_ai),
-                ('openai', logfire.instrument_openai),
-                ('httpx', logfire.instrument_httpx)
-            ]:
-                try:
-                    instrument_func()
-                    instrumentation_count += 1
-                    logfire_span.set_attribute(f'{instrument_name}_instrumented', True)
-                except Exception:
-                    logfire_span.set_attribute(f'{instrument_name}_instrumented', False)
-            
-            logfire_span.set_attribute('logfire_configured', True)
-            logfire_span.set_attribute('instrumentations_enabled', instrumentation_count)
-            logfire.info('Logfire configured for interactive storytelling application', 
-                        token_configured=bool(logfire_token),
-                        instrumentations_enabled=instrumentation_count)
+        logfire_token = os.getenv('LOGFIRE_TOKEN')
+        instrumented = setup_telemetry()
+        instrumentation_count = sum(instrumented.values())
+        span.set_attribute('phases.logfire.token_present', bool(logfire_token))
+        for instrument_name, enabled in instrumented.items():
+            span.set_attribute(f'phases.logfire.{instrument_name}_instrumented', enabled)
+        span.set_attribute('phases.logfire.instrumentations', instrumentation_count)
+        logfire.info('Logfire configured for interactive storytelling application', 
+                    token_configured=bool(logfire_token),
+                    instrumentations_enabled=instrumentation_count)
 
         # Validate environment
-        with logfire.span('Validating environment configuration') as validate_span:
-            validation = validate_environment()
-            validate_span.set_attribute('validation_result', validation)
-            validate_span.set_attribute('api_key_present', validation.get('api_key_present', False))
+        validation = validate_environment()
+        span.set_attribute('phases.validation.result', validation)
+        span.set_attribute('phases.validation.api_key_present', validation.get('api_key_present', False))
 
         # Check critical requirements
         if not validation.get('api_key_present', False):
@@ -74,11 +59,9 @@ def setup_environment() -> bool:
             return False
 
         # Create stories directory if it doesn't exist
-        with logfire.span('Creating stories directory') as dir_span:
-            stories_dir = Path("stories")
-            stories_dir.mkdir(exist_ok=True)
-            dir_span.set_attribute('stories_directory', str(stories_dir.absolute()))
-            dir_span.set_attribute('directory_created', True)
+        stories_dir = Path("stories")
+        stories_dir.mkdir(exist_ok=True)
+        span.set_attribute('phases.storage.stories_directory', str(stories_dir.absolute()))
 
         span.set_attribute('setup_successful', True)
         span.set_attribute('model_configured', os.getenv('LLM_MODEL', 'gpt-4o-mini'))
@@ -95,7 +78,7 @@ def setup_environment() -> bool:
 
 def display_startup_info() -> None:
     """Display startup information and configuration status."""
-    with logfire.span('Displaying startup information') as span:
+    with trace_span('Displaying startup information') as span:
         print("🎭 Interactive Storytelling Application")
         print("=" * 50)
         print("🤖 Powered by PydanticAI multi-agent architecture")
@@ -131,10 +114,10 @@ async def main() -> None:
     
     Sets up the environment, validates configuration, and starts the CLI.
     """
-    with logfire.span('Interactive storytelling application main execution') as span:
+    with trace_span('Interactive storytelling application main execution') as span:
         try:
             # Setup and validate environment
-            with logfire.span('Application setup phase') as setup_span:
+            with trace_span('Application setup phase') as setup_span:
                 if not setup_environment():
                     setup_span.set_attribute('setup_failed', True)
                     logfire.error('Application setup failed, exiting')
@@ -145,7 +128,7 @@ async def main() -> None:
             display_startup_info()
 
             # Create and start the CLI
-            with logfire.span('Creating and starting CLI interface') as cli_span:
+            with trace_span('Creating and starting CLI interface') as cli_span:
                 cli = StorytellingCLI()
                 cli_span.set_attribute('cli_created', True)
                 
@@ -171,6 +154,11 @@ async def main() -> None:
                 error_type=type(e).__name__
             )
             sys.exit(1)
+        finally:
+            # Reason: the shared HTTP client lives for the whole application, so it is
+            # closed here rather than by the CLI or agents that borrow it
+            await close_http_client()
+            span.set_attribute('http_client_closed', True)
 
 
 def cli_main() -> None:
@@ -180,12 +168,12 @@ def cli_main() -> None:
     This function is called when the module is run as a script
     or when using the 'storytelling' command from setup.py.
     """
-    with logfire.span('CLI entry point execution') as span:
+    with trace_span('CLI entry point execution') as span:
         try:
             span.set_attribute('entry_point', 'cli_main')
             logfire.info('Starting interactive storytelling application from CLI entry point')
             
-            with logfire.span('Running asyncio main loop') as async_span:
+            with trace_span('Running asyncio main loop') as async_span:
                 asyncio.run(main())
                 async_span.set_attribute('asyncio_completed', True)
                 
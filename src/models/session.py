@@ -2,15 +2,34 @@
 
 from __future__ import annotations
 
-import json
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Union
+
+import orjson
 
 from .story import StoryWorld
 
 
+@dataclass(frozen=True)
+class SessionStats:
+    """
+    Snapshot of the counts shown by the stats command.
+    
+    Attributes:
+        character_count: Number of characters in the world
+        history_length: Number of story history entries
+        conflict_count: Number of world conflicts
+        total_memories: Memories held across all characters
+    """
+    character_count: int
+    history_length: int
+    conflict_count: int
+    total_memories: int
+
+
 @dataclass
 class StorySession:
     """
@@ -30,6 +49,7 @@ class StorySession:
     created_at: datetime = field(default_factory=datetime.now)
     last_updated: datetime = field(default_factory=datetime.now)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    _stats: Optional[SessionStats] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         """Initialize session with current timestamp."""
@@ -37,6 +57,23 @@ class StorySession:
             self.id = str(uuid.uuid4())
         self.last_updated = datetime.now()
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name == "created_at":
+            self.__dict__.pop("created_display", None)
+        elif name == "id":
+            self.__dict__.pop("display_name", None)
+        elif name == "world":
+            self.__dict__.pop("display_name", None)
+            # Reason: write __dict__ directly so this does not recurse, and so it is
+            # safe while __init__ assigns world before the _stats field exists
+            self.__dict__["_stats"] = None
+
+    @cached_property
+    def created_display(self) -> str:
+        """Creation time formatted for display, rendered once per session."""
+        return self.created_at.strftime('%Y-%m-%d %H:%M')
+
     def add_message(self, message: Dict[str, Any]) -> None:
         """Add a message to the session history."""
         self.message_history.append(message)
@@ -47,6 +84,27 @@ class StorySession:
         self.world = world
         self.last_updated = datetime.now()
 
+    def get_stats(self) -> SessionStats:
+        """
+        Get world statistics, computed once per world update.
+        
+        The snapshot is dropped by update_world, which the CLI calls after
+        every story turn; in-place world changes made elsewhere should be
+        followed by update_world to refresh it.
+        
+        Returns:
+            Cached statistics snapshot
+        """
+        if self._stats is None:
+            characters = self.world.characters
+            self._stats = SessionStats(
+                character_count=len(characters),
+                history_length=len(self.world.history),
+                conflict_count=len(self.world.conflicts),
+                total_memories=sum(len(char.memories) for char in characters.values()),
+            )
+        return self._stats
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert session to dictionary for JSON serialization."""
         return {
@@ -72,14 +130,18 @@ class StorySession:
             metadata=data.get("metadata", {})
         )
 
+    def to_json_bytes(self) -> bytes:
+        """Convert session to UTF-8 encoded JSON, ready to write to a binary file."""
+        return orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2)
+
     def to_json(self) -> str:
         """Convert session to JSON string."""
-        return json.dumps(self.to_dict(), indent=2)
+        return self.to_json_bytes().decode('utf-8')
 
     @classmethod
-    def from_json(cls, json_str: str) -> StorySession:
-        """Create session from JSON string."""
-        data = json.loads(json_str)
+    def from_json(cls, json_str: Union[str, bytes]) -> StorySession:
+        """Create session from a JSON string or UTF-8 encoded bytes."""
+        data = orjson.loads(json_str)
         return cls.from_dict(data)
 
     @classmethod
@@ -94,8 +156,17 @@ class StorySession:
         """Get a brief summary of the session."""
         return f"Session {self.id[:8]}... - {self.world.premise[:50]}..."
 
-    def get_display_name(self) -> str:
-        """Get a human-readable display name for the session."""
+    @cached_property
+    def display_name(self) -> str:
+        """
+        Human-readable display name for the session.
+        
+        Computed once per world; replacing the world (update_world) drops it.
+        """
         if self.world.premise:
             return f"{self.world.premise[:30]}{'...' if len(self.world.premise) > 30 else ''}"
         return f"Session {self.id[:8]}..."
+
+    def get_display_name(self) -> str:
+        """Get a human-readable display name for the session."""
+        return self.display_name
@@ -2,8 +2,42 @@
 
 from __future__ import annotations
 
+import re
+import sys
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, List
+from functools import cached_property, lru_cache
+from itertools import islice
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Number of memories a character keeps; older ones are dropped first
+MAX_CHARACTER_MEMORIES = 20
+
+# Fields that feed cached prompt text; assigning any of them bumps the revision
+CHARACTER_PROFILE_FIELDS = frozenset({"name", "description", "personality", "speech_patterns", "relationships"})
+SCENE_PROMPT_FIELDS = frozenset({"location", "description", "atmosphere"})
+
+# Number of latest history entries kept ready for prompt building
+RECENT_HISTORY_WINDOW = 5
+
+
+def _bounded_memories(memories: Iterable[str]) -> Deque[str]:
+    """Build a memory deque keeping only the newest MAX_CHARACTER_MEMORIES entries."""
+    return deque(memories, maxlen=MAX_CHARACTER_MEMORIES)
+
+
+@lru_cache(maxsize=256)
+def _mention_pattern(entities: Tuple[str, ...]) -> re.Pattern[str]:
+    """Compile a case-insensitive pattern matching any of the entities as whole words."""
+    alternatives = '|'.join(re.escape(entity) for entity in entities)
+    return re.compile(rf'(?<!\w)(?:{alternatives})(?!\w)', re.IGNORECASE)
+
+
+def _tail(entries: Sequence[str], count: int) -> List[str]:
+    """Return the last count entries, oldest first, walking back from the end only."""
+    tail = list(islice(reversed(entries), max(0, count)))
+    tail.reverse()
+    return tail
 
 
 @dataclass
@@ -16,15 +50,59 @@ class Character:
         description: Physical and background description
         personality: Personality traits and characteristics
         speech_patterns: How the character speaks
-        memories: List of significant memories/experiences
+        memories: Most recent significant memories/experiences, bounded to
+            MAX_CHARACTER_MEMORIES (oldest are dropped on append)
         relationships: Dict mapping character names to relationship descriptions
+        revision: Counter bumped whenever the character profile changes
     """
     name: str
     description: str
     personality: str
     speech_patterns: str
-    memories: List[str] = field(default_factory=list)
+    memories: Deque[str] = field(default_factory=lambda: deque(maxlen=MAX_CHARACTER_MEMORIES))
     relationships: Dict[str, str] = field(default_factory=dict)
+    revision: int = field(default=0, init=False, repr=False, compare=False)
+    # Reason: prompt text derived from the profile is memoized here and keyed by
+    # revision, so agents can reuse it verbatim until the profile changes.
+    _prompt_block: Optional[Tuple[tuple, str]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value) -> None:
+        # Store memories in a bounded deque, whatever iterable was assigned
+        if name == "memories" and not (isinstance(value, deque) and value.maxlen == MAX_CHARACTER_MEMORIES):
+            value = _bounded_memories(value)
+        # Reason: only reassignment counts as a change; the first assignment
+        # happens in __init__ when the field is not in __dict__ yet.
+        changed = name in CHARACTER_PROFILE_FIELDS and name in self.__dict__
+        super().__setattr__(name, value)
+        if changed:
+            self.revision += 1
+        if name == "relationships":
+            self.__dict__.pop("relationships_text", None)
+
+    @cached_property
+    def relationships_text(self) -> str:
+        """Relationships joined as 'name: relationship' pairs, or 'None' when there are none."""
+        if not self.relationships:
+            return "None"
+        return ", ".join(f"{other}: {rel}" for other, rel in self.relationships.items())
+
+    def recent_memories(self, count: int) -> List[str]:
+        """
+        Get the most recent memories, oldest first.
+        
+        Args:
+            count: Maximum number of memories to return
+            
+        Returns:
+            List of up to count memories
+        """
+        return _tail(self.memories, count)
+
+    def set_relationship(self, other_name: str, relationship: str) -> None:
+        """Set the relationship to another character and mark the profile as changed."""
+        self.relationships[other_name] = relationship
+        self.revision += 1
+        self.__dict__.pop("relationships_text", None)
 
     def to_dict(self) -> Dict:
         """Convert character to dictionary for JSON serialization."""
@@ -33,7 +111,7 @@ class Character:
             "description": self.description,
             "personality": self.personality,
             "speech_patterns": self.speech_patterns,
-            "memories": self.memories,
+            "memories": list(self.memories),
             "relationships": self.relationships
         }
 
@@ -61,12 +139,46 @@ class Scene:
         atmosphere: Mood and feeling of the scene
         active_characters: List of character names present
         props: List of important objects in the scene
+        revision: Counter bumped whenever location, description or atmosphere change
     """
     location: str
     description: str
     atmosphere: str
     active_characters: List[str] = field(default_factory=list)
     props: List[str] = field(default_factory=list)
+    revision: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value) -> None:
+        changed = name in SCENE_PROMPT_FIELDS and name in self.__dict__
+        super().__setattr__(name, value)
+        if changed:
+            self.revision += 1
+            self.__dict__.pop("prompt_block", None)
+        elif name == "active_characters":
+            self.__dict__.pop("active_characters_text", None)
+
+    @cached_property
+    def prompt_block(self) -> str:
+        """
+        Scene section of character prompts.
+        
+        Rendered once per scene revision and shared by every character in the scene.
+        """
+        return (
+            f"Current Scene: {self.location}\n"
+            f"Scene Description: {self.description}\n"
+            f"Scene Atmosphere: {self.atmosphere}\n"
+        )
+
+    @cached_property
+    def active_characters_text(self) -> str:
+        """
+        Comma-separated active character names, or "None".
+        
+        Rebuilt when active_characters is reassigned; replace the list rather
+        than mutating it in place.
+        """
+        return ', '.join(self.active_characters) or 'None'
 
     def to_dict(self) -> Dict:
         """Convert scene to dictionary for JSON serialization."""
@@ -109,10 +221,15 @@ class StoryWorld:
     characters: Dict[str, Character] = field(default_factory=dict)
     current_scene: Scene = field(default_factory=lambda: Scene("", "", ""))
     history: List[str] = field(default_factory=list)
+    _recent_history: Deque[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._recent_history = deque(self.history[-RECENT_HISTORY_WINDOW:], maxlen=RECENT_HISTORY_WINDOW)
 
     def add_character(self, character: Character) -> None:
         """Add a character to the story world."""
-        self.characters[character.name] = character
+        # Reason: interned keys let lookups with the same interned name match by identity
+        self.characters[sys.intern(character.name)] = character
 
     def get_character(self, name: str) -> Character | None:
         """Get a character by name."""
@@ -121,6 +238,73 @@ class StoryWorld:
     def add_history_entry(self, entry: str) -> None:
         """Add an entry to the story history."""
         self.history.append(entry)
+        self._recent_history.append(entry)
+
+    def recent_history(self, count: int = RECENT_HISTORY_WINDOW) -> List[str]:
+        """
+        Get the most recent history entries, oldest first.
+        
+        The full history is kept for saving and display; prompts only need the
+        latest entries, which are served from a small window without touching
+        the full list.
+        
+        Args:
+            count: Maximum number of entries to return
+            
+        Returns:
+            List of up to count entries
+        """
+        if count > RECENT_HISTORY_WINDOW:
+            return _tail(self.history, count)
+        return _tail(self._recent_history, count)
+
+    def relevant_history(self, query: str, recent: int = 2, related: int = 3) -> List[str]:
+        """
+        Get history entries relevant to a query, oldest first.
+        
+        Entities (character names, the scene location and props) mentioned in
+        the query as whole words select the latest earlier entries that mention
+        them, topped up with the latest unmatched entries when fewer than
+        related match, followed by the latest entries regardless of content.
+        Falls back to the plain recent window when the query names no known
+        entity.
+        
+        Args:
+            query: Text to match entities against, usually the user input
+            recent: Number of latest entries always included
+            related: Maximum number of earlier entries matched by entity
+            
+        Returns:
+            List of up to recent + related entries
+        """
+        candidates = [*self.characters, self.current_scene.location, *self.current_scene.props]
+        entities = tuple(
+            entity for entity in candidates if entity and _mention_pattern((entity,)).search(query)
+        )
+        if not entities:
+            return self.recent_history(recent + related)
+
+        latest = self.recent_history(recent)
+        mentions = _mention_pattern(entities)
+        older_count = len(self.history) - len(latest)
+        selected: List[int] = []
+        # Reason: scan backwards and stop at the first matches, so long sessions
+        # only pay for the entries they actually search
+        for offset, entry in enumerate(islice(reversed(self.history), len(latest), None), 1):
+            if mentions.search(entry):
+                selected.append(older_count - offset)
+                if len(selected) == related:
+                    break
+
+        if len(selected) < related:
+            # Backfill with the latest unmatched entries so a partial match does
+            # not leave less context than the plain recent window
+            matched = set(selected)
+            unmatched = (index for index in range(older_count - 1, -1, -1) if index not in matched)
+            selected.extend(islice(unmatched, related - len(selected)))
+
+        selected.sort()
+        return [self.history[index] for index in selected] + latest
 
     def to_dict(self) -> Dict:
         """Convert story world to dictionary for JSON serialization."""
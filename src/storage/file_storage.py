@@ -2,14 +2,28 @@
 
 from __future__ import annotations
 
-import json
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import logfire
+import orjson
 
 from models.session import StorySession
+from storage.models import SessionMetadata
+
+# Index of session metadata kept next to the session files so menus can list
+# sessions without parsing every session file
+INDEX_FILENAME = "_index.json"
+
+# Threads used to read session files concurrently when listing
+SESSION_LOAD_WORKERS = 8
+
+_BY_LAST_UPDATED = attrgetter('last_updated')
 
 
 class FileStorage:
@@ -17,6 +31,8 @@ class FileStorage:
     File-based storage for story sessions.
     
     Manages saving, loading, and listing story sessions using JSON files.
+    A metadata index (INDEX_FILENAME) is maintained alongside them for
+    cheap listings.
     """
 
     def __init__(self, storage_dir: str = "stories"):
@@ -28,6 +44,51 @@ class FileStorage:
         """
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(exist_ok=True)
+        self._index_path = self.storage_dir / INDEX_FILENAME
+        self._index: Optional[Dict[str, SessionMetadata]] = None
+
+    def _session_files(self) -> List[Path]:
+        """List session files, excluding the metadata index."""
+        return [path for path in self.storage_dir.glob("*.json") if path.name != INDEX_FILENAME]
+
+    def _session_stats(self) -> Dict[str, os.stat_result]:
+        """Stat session files in a single directory scan, keyed by session ID."""
+        stats = {}
+        with os.scandir(self.storage_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.json') or entry.name == INDEX_FILENAME:
+                    continue
+                try:
+                    stats[entry.name[:-len('.json')]] = entry.stat()
+                except OSError:
+                    continue
+        return stats
+
+    def _read_index(self) -> Dict[str, SessionMetadata]:
+        """Read the metadata index from disk, or return an empty one if missing or corrupted."""
+        try:
+            with open(self._index_path, 'rb') as f:
+                data = orjson.loads(f.read())
+            return {entry["id"]: SessionMetadata.from_dict(entry) for entry in data}
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+
+    def _get_index(self) -> Dict[str, SessionMetadata]:
+        """Get the in-memory metadata index, reading it from disk on first use."""
+        if self._index is None:
+            self._index = self._read_index()
+        return self._index
+
+    def _write_index(self) -> None:
+        """Write the metadata index atomically via a temporary file."""
+        tmp_path = self._index_path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps([meta.to_dict() for meta in self._get_index().values()]))
+            os.replace(tmp_path, self._index_path)
+        except OSError as e:
+            # Reason: the index is only a cache; listings rebuild it from the session files
+            logfire.warning('Failed to write session index', error=str(e))
 
     def save_session(self, session: StorySession) -> None:
         """
@@ -51,10 +112,10 @@ class FileStorage:
 
             try:
                 with logfire.span('Writing session data to file') as write_span:
-                    json_data = session.to_json()
-                    write_span.set_attribute('json_size_bytes', len(json_data.encode('utf-8')))
+                    json_data = session.to_json_bytes()
+                    write_span.set_attribute('json_size_bytes', len(json_data))
                     
-                    with open(file_path, 'w', encoding='utf-8') as f:
+                    with open(file_path, 'wb') as f:
                         f.write(json_data)
                     
                     write_span.set_attribute('file_written', True)
@@ -62,10 +123,14 @@ class FileStorage:
                 span.set_attribute('save_successful', True)
                 span.set_attribute('character_count', len(session.world.characters))
                 span.set_attribute('history_length', len(session.world.history))
+                stat = file_path.stat()
+                file_size = stat.st_size
+                self._get_index()[session.id] = SessionMetadata.from_session(session, file_size, stat.st_mtime_ns)
+                self._write_index()
                 logfire.info(
                     'Session saved successfully to file storage',
                     session_name=session.get_display_name(),
-                    file_size_bytes=file_path.stat().st_size if file_path.exists() else 0
+                    file_size_bytes=file_size
                 )
                 
             except OSError as e:
@@ -99,21 +164,23 @@ class FileStorage:
             file_path = self.storage_dir / f"{session_id}.json"
             span.set_attribute('file_path', str(file_path))
 
-            if not file_path.exists():
+            try:
+                stat = file_path.stat()
+            except FileNotFoundError:
                 span.set_attribute('file_exists', False)
                 logfire.info('Session file not found', session_id=session_id, file_path=str(file_path))
                 return None
 
             span.set_attribute('file_exists', True)
-            span.set_attribute('file_size_bytes', file_path.stat().st_size)
+            span.set_attribute('file_size_bytes', stat.st_size)
 
             try:
                 with logfire.span('Reading and parsing session file') as read_span:
-                    with open(file_path, encoding='utf-8') as f:
-                        json_str = f.read()
-                    read_span.set_attribute('json_size_bytes', len(json_str.encode('utf-8')))
+                    with open(file_path, 'rb') as f:
+                        json_data = f.read()
+                    read_span.set_attribute('json_size_bytes', len(json_data))
                     
-                    session = StorySession.from_json(json_str)
+                    session = StorySession.from_json(json_data)
                     read_span.set_attribute('parsing_successful', True)
                     
                 span.set_attribute('load_successful', True)
@@ -130,7 +197,7 @@ class FileStorage:
                 
                 return session
                 
-            except (json.JSONDecodeError, KeyError) as e:
+            except (orjson.JSONDecodeError, KeyError) as e:
                 span.set_attribute('load_successful', False)
                 span.set_attribute('error_type', 'corruption')
                 span.set_attribute('error_message', str(e))
@@ -153,6 +220,40 @@ class FileStorage:
                 )
                 raise OSError(f"Failed to load session {session_id}: {e}")
 
+    def _load_sessions(
+        self, session_ids: List[str]
+    ) -> List[Tuple[str, Optional[StorySession], Optional[Exception]]]:
+        """
+        Load several sessions, reading files concurrently in a thread pool.
+        
+        File reads release the GIL, so overlapping them cuts listing time when
+        many session files need loading.
+        
+        Args:
+            session_ids: IDs of the sessions to load
+            
+        Returns:
+            (session_id, session, error) for each ID in order; error is set
+            when the file was corrupted or unreadable
+        """
+        def load_one(session_id: str) -> Tuple[str, Optional[StorySession], Optional[Exception]]:
+            try:
+                return session_id, self.load_session(session_id), None
+            except (ValueError, OSError) as e:
+                return session_id, None, e
+
+        if len(session_ids) <= 1:
+            return [load_one(session_id) for session_id in session_ids]
+
+        # Reason: each task runs in a copy of the caller's context so load spans
+        # stay nested under the listing span
+        with ThreadPoolExecutor(max_workers=min(SESSION_LOAD_WORKERS, len(session_ids))) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, load_one, session_id)
+                for session_id in session_ids
+            ]
+            return [future.result() for future in futures]
+
     def list_sessions(self) -> List[StorySession]:
         """
         List all available story sessions.
@@ -169,38 +270,24 @@ class FileStorage:
             corrupted_count = 0
 
             with logfire.span('Scanning storage directory for session files') as scan_span:
-                session_files = list(self.storage_dir.glob("*.json"))
+                session_files = self._session_files()
                 scan_span.set_attribute('total_files_found', len(session_files))
                 file_count = len(session_files)
 
-            for file_path in session_files:
-                try:
-                    session_id = file_path.stem
-                    
-                    with logfire.span(
-                        'Loading individual session for listing',
-                        session_id=session_id,
-                        file_name=file_path.name
-                    ) as load_span:
-                        session = self.load_session(session_id)
-                        if session:
-                            sessions.append(session)
-                            load_span.set_attribute('session_loaded', True)
-                        else:
-                            load_span.set_attribute('session_loaded', False)
-                            
-                except (ValueError, OSError) as e:
+            for session_id, session, error in self._load_sessions([path.stem for path in session_files]):
+                if error is not None:
                     corrupted_count += 1
                     logfire.warning(
                         'Skipping corrupted session file during listing',
-                        file_path=str(file_path),
-                        error=str(e)
+                        session_id=session_id,
+                        error=str(error)
                     )
-                    continue
+                elif session:
+                    sessions.append(session)
 
             # Sort by last_updated, newest first
             with logfire.span('Sorting sessions by last updated') as sort_span:
-                sessions.sort(key=lambda s: s.last_updated, reverse=True)
+                sessions.sort(key=_BY_LAST_UPDATED, reverse=True)
                 sort_span.set_attribute('sessions_sorted', True)
 
             span.set_attribute('total_files_scanned', file_count)
@@ -217,6 +304,57 @@ class FileStorage:
             
             return sessions
 
+    def list_sessions_meta(self) -> List[SessionMetadata]:
+        """
+        List metadata for all available sessions without loading them.
+        
+        Served from the metadata index, which is checked against the session
+        files on disk: files that are new, or whose mtime or size changed
+        since they were indexed, are loaded once to refresh their entry, and
+        entries whose file is gone are dropped. Use load_session to get a full session.
+        
+        Returns:
+            Metadata of all sessions, sorted by last_updated (newest first)
+        """
+        with logfire.span(
+            'Listing session metadata from index',
+            storage_directory=str(self.storage_dir)
+        ) as span:
+            index = self._get_index()
+
+            stats = self._session_stats()
+
+            changed = False
+            for session_id in index.keys() - stats.keys():
+                del index[session_id]
+                changed = True
+
+            stale_ids = [
+                session_id for session_id, stat in stats.items()
+                if session_id not in index
+                or (index[session_id].file_mtime_ns, index[session_id].file_size) != (stat.st_mtime_ns, stat.st_size)
+            ]
+            refreshed = 0
+            for session_id, session, error in self._load_sessions(stale_ids):
+                if error is not None:
+                    logfire.warning(
+                        'Skipping corrupted session file during listing',
+                        session_id=session_id,
+                        error=str(error)
+                    )
+                elif session:
+                    stat = stats[session_id]
+                    index[session_id] = SessionMetadata.from_session(session, stat.st_size, stat.st_mtime_ns)
+                    refreshed += 1
+                    changed = True
+
+            if changed:
+                self._write_index()
+
+            span.set_attribute('sessions_listed', len(index))
+            span.set_attribute('entries_refreshed', refreshed)
+            return sorted(index.values(), key=_BY_LAST_UPDATED, reverse=True)
+
     def delete_session(self, session_id: str) -> bool:
         """
         Delete a story session.
@@ -248,6 +386,9 @@ class FileStorage:
                 with logfire.span('Unlinking session file') as unlink_span:
                     file_path.unlink()
                     unlink_span.set_attribute('file_unlinked', True)
+
+                if self._get_index().pop(session_id, None) is not None:
+                    self._write_index()
                     
                 span.set_attribute('deletion_successful', True)
                 logfire.info(
@@ -310,12 +451,16 @@ class FileStorage:
         cutoff_time = datetime.now().timestamp() - (max_age_days * 24 * 60 * 60)
         deleted_count = 0
 
-        for file_path in self.storage_dir.glob("*.json"):
+        for session_id, stat in self._session_stats().items():
+            if stat.st_mtime >= cutoff_time:
+                continue
             try:
-                if file_path.stat().st_mtime < cutoff_time:
-                    file_path.unlink()
-                    deleted_count += 1
+                (self.storage_dir / f"{session_id}.json").unlink()
             except OSError:
                 continue
+            deleted_count += 1
+            self._get_index().pop(session_id, None)
 
+        if deleted_count:
+            self._write_index()
         return deleted_count
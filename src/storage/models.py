@@ -4,7 +4,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Dict
+
+if TYPE_CHECKING:
+    from models.session import StorySession
 
 
 @dataclass
@@ -20,6 +23,7 @@ class SessionMetadata:
         character_count: Number of characters in the session
         history_length: Number of history entries
         file_size: Size of the session file in bytes
+        file_mtime_ns: Modification time of the session file in nanoseconds
     """
     id: str
     display_name: str
@@ -28,6 +32,7 @@ class SessionMetadata:
     character_count: int
     history_length: int
     file_size: int
+    file_mtime_ns: int = 0
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -38,9 +43,34 @@ class SessionMetadata:
             "last_updated": self.last_updated.isoformat(),
             "character_count": self.character_count,
             "history_length": self.history_length,
-            "file_size": self.file_size
+            "file_size": self.file_size,
+            "file_mtime_ns": self.file_mtime_ns
         }
 
+    @classmethod
+    def from_session(cls, session: StorySession, file_size: int, file_mtime_ns: int) -> SessionMetadata:
+        """
+        Create metadata describing a saved session.
+        
+        Args:
+            session: The saved session
+            file_size: Size of its session file in bytes
+            file_mtime_ns: Modification time of its session file in nanoseconds
+            
+        Returns:
+            Metadata for the session index
+        """
+        return cls(
+            id=session.id,
+            display_name=session.get_display_name(),
+            created_at=session.created_at,
+            last_updated=session.last_updated,
+            character_count=len(session.world.characters),
+            history_length=len(session.world.history),
+            file_size=file_size,
+            file_mtime_ns=file_mtime_ns
+        )
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> SessionMetadata:
         """Create from dictionary."""
@@ -51,7 +81,9 @@ class SessionMetadata:
             last_updated=datetime.fromisoformat(data["last_updated"]),
             character_count=data["character_count"],
             history_length=data["history_length"],
-            file_size=data["file_size"]
+            file_size=data["file_size"],
+            # Indexes written before mtimes were recorded refresh their entries once
+            file_mtime_ns=data.get("file_mtime_ns", 0)
         )
 
 
@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import functools
 import os
 import re
+import time
 from datetime import datetime
+from itertools import islice
 from typing import Optional, Any
 
 from colorama import init, Fore, Back, Style
@@ -12,19 +15,37 @@ from colorama import init, Fore, Back, Style
 # Initialize colorama for cross-platform colored output
 init(autoreset=True)
 
+_SPEECH_VERBS = r'(?:said|says|replied|responds?|exclaimed|whispered|shouted|declared|asked|continued)'
 
-def get_display_timestamp(dt: datetime) -> str:
+# Dialogue patterns, compiled once, paired with whether the speech group comes first
+_SPEECH_PATTERNS = (
+    # "Speech," Character said/exclaimed/etc.
+    (re.compile(r'"([^"]+)",?\s*([A-Z][a-zA-Z]+)\s+' + _SPEECH_VERBS, re.DOTALL), True),
+    # Character said/exclaimed: "Speech"
+    (re.compile(r'([A-Z][a-zA-Z]+)\s+' + _SPEECH_VERBS + r'[^"]*"([^"]+)"', re.DOTALL), False),
+    # Character: "Speech" (direct format)
+    (re.compile(r'([A-Z][a-zA-Z]+):\s*"([^"]+)"', re.DOTALL), False),
+    # More complex patterns for embedded speech
+    (re.compile(r'([A-Z][a-zA-Z]+)[^"]*"([^"]+)"', re.DOTALL), False),
+)
+
+_UNSAFE_FILENAME_CHARS = re.compile(r'[<>:"/\\|?*]')
+_SESSION_ID_RE = re.compile(r'^[a-zA-Z0-9_-]+$')
+
+
+def get_display_timestamp(dt: datetime, now: Optional[datetime] = None) -> str:
     """
     Get a human-readable timestamp for display.
     
     Args:
         dt: Datetime object
+        now: Reference time, defaults to the current time; pass one value when
+            formatting a whole listing so every row is relative to the same instant
         
     Returns:
         Formatted timestamp string
     """
-    now = datetime.now()
-    diff = now - dt
+    diff = (now or datetime.now()) - dt
 
     if diff.days > 0:
         return f"{diff.days} day{'s' if diff.days != 1 else ''} ago"
@@ -49,7 +70,7 @@ def sanitize_filename(filename: str) -> str:
         Sanitized filename
     """
     # Remove or replace unsafe characters
-    sanitized = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    sanitized = _UNSAFE_FILENAME_CHARS.sub('_', filename)
 
     # Remove leading/trailing spaces and dots
     sanitized = sanitized.strip('. ')
@@ -65,10 +86,14 @@ def sanitize_filename(filename: str) -> str:
     return sanitized
 
 
+@functools.lru_cache(maxsize=4096)
 def truncate_text(text: str, max_length: int, suffix: str = "...") -> str:
     """
     Truncate text to a maximum length with optional suffix.
     
+    Results are cached, since the same character fields and history entries
+    are truncated again on every characters/status redraw.
+    
     Args:
         text: Text to truncate
         max_length: Maximum length
@@ -83,6 +108,22 @@ def truncate_text(text: str, max_length: int, suffix: str = "...") -> str:
     return text[:max_length - len(suffix)] + suffix
 
 
+def preview_text(text: str, limit: int = 100) -> str:
+    """
+    Shorten text for logs and summaries, appending '...' when cut.
+    
+    Args:
+        text: Text to preview
+        limit: Number of characters kept before the ellipsis
+        
+    Returns:
+        The text itself, or its first limit characters followed by '...'
+    """
+    if len(text) <= limit:
+        return text
+    return text[:limit] + '...'
+
+
 def format_character_list(characters: dict[str, Any]) -> str:
     """
     Format a list of characters for display.
@@ -104,13 +145,33 @@ def format_character_list(characters: dict[str, Any]) -> str:
     return "\n".join(character_lines)
 
 
+# Seconds a validate_environment result is reused before the environment is read again
+ENV_VALIDATION_TTL = 1.0
+_env_validation_cache: Optional[tuple[float, dict[str, bool]]] = None
+
+
+def clear_environment_cache() -> None:
+    """Forget the cached validate_environment result, e.g. after changing os.environ."""
+    global _env_validation_cache
+    _env_validation_cache = None
+
+
 def validate_environment() -> dict[str, bool]:
     """
     Validate that required environment variables are set.
     
+    Results are reused for ENV_VALIDATION_TTL seconds, so repeated
+    diagnostics don't re-read the environment; call clear_environment_cache
+    after changing it.
+    
     Returns:
         Dictionary of validation results
     """
+    global _env_validation_cache
+    now = time.monotonic()
+    if _env_validation_cache is not None and now - _env_validation_cache[0] < ENV_VALIDATION_TTL:
+        return dict(_env_validation_cache[1])
+
     required_vars = ['LLM_MODEL']
     optional_vars = ['OPENAI_API_KEY', 'OPEN_ROUTER_API_KEY', 'LOGFIRE_TOKEN']
 
@@ -128,7 +189,8 @@ def validate_environment() -> dict[str, bool]:
     for var in optional_vars:
         validation[f'{var}_optional'] = os.getenv(var) is not None
 
-    return validation
+    _env_validation_cache = (now, validation)
+    return dict(validation)
 
 
 def extract_meta_command(text: str) -> Optional[str]:
@@ -248,32 +310,20 @@ def parse_character_speech(text: str) -> list[tuple[str, str]]:
     Returns:
         List of tuples (character_name, speech) for all found dialogue
     """
-    # Look for patterns with both regular and smart quotes
-    patterns = [
-        # "Speech," Character said/exclaimed/etc.
-        r'["""]([^"""]+)["""],?\s*([A-Z][a-zA-Z]+)\s+(?:said|says|replied|responds?|exclaimed|whispered|shouted|declared|asked|continued)',
-        # Character said/exclaimed: "Speech"
-        r'([A-Z][a-zA-Z]+)\s+(?:said|says|replied|responds?|exclaimed|whispered|shouted|declared|asked|continued)[^"""]*["""]([^"""]+)["""]',
-        # Character: "Speech" (direct format)
-        r'([A-Z][a-zA-Z]+):\s*["""]([^"""]+)["""]',
-        # More complex patterns for embedded speech
-        r'([A-Z][a-zA-Z]+)[^"""]*["""]([^"""]+)["""]',
-    ]
-    
     speeches = []
-    used_positions = set()  # Track used text positions to avoid overlaps
+    used_spans: list[tuple[int, int]] = []  # Track used text spans to avoid overlaps
     
-    for pattern in patterns:
-        matches = re.finditer(pattern, text, re.DOTALL)
-        for match in matches:
+    for pattern, speech_first in _SPEECH_PATTERNS:
+        for match in pattern.finditer(text):
+            start, end = match.span()
             # Skip if this match overlaps with already used text
-            if any(pos in used_positions for pos in range(match.start(), match.end())):
+            if any(start < used_end and used_start < end for used_start, used_end in used_spans):
                 continue
                 
             groups = match.groups()
             if len(groups) == 2:
                 # Check if pattern is speech-first or character-first
-                if pattern.startswith('["""'):
+                if speech_first:
                     # Speech comes first in pattern
                     speech, character_name = groups
                 else:
@@ -293,9 +343,8 @@ def parse_character_speech(text: str) -> list[tuple[str, str]]:
                 # Avoid duplicates
                 if (character_name, speech) not in speeches:
                     speeches.append((character_name, speech))
-                    # Mark this text position as used
-                    for pos in range(match.start(), match.end()):
-                        used_positions.add(pos)
+                    # Mark this text span as used
+                    used_spans.append((start, end))
     
     return speeches
 
@@ -323,13 +372,8 @@ def format_story_with_colored_dialogue(text: str) -> str:
         # Create colored speech
         colored_speech = f"{format_character_speech(character_name, speech)}"
         
-        # Replace the original speech with colored version
-        # Handle both regular and smart quotes
-        for quote_char in ['"', '"', '"']:
-            original_pattern = f'{quote_char}{re.escape(speech)}{quote_char}'
-            if re.search(original_pattern, formatted_text):
-                formatted_text = re.sub(original_pattern, colored_speech, formatted_text, count=1)
-                break
+        # Replace the first occurrence of the quoted speech with the colored version
+        formatted_text = formatted_text.replace(f'"{speech}"', colored_speech, 1)
     
     return format_narrator_text(formatted_text)
 
@@ -349,7 +393,7 @@ def is_valid_session_id(session_id: str) -> bool:
         return False
 
     # Allow alphanumeric, hyphens, and underscores
-    return re.match(r'^[a-zA-Z0-9_-]+$', session_id) is not None
+    return _SESSION_ID_RE.match(session_id) is not None
 
 
 def format_story_history(history: list[str], max_entries: int = 5) -> str:
@@ -366,8 +410,9 @@ def format_story_history(history: list[str], max_entries: int = 5) -> str:
     if not history:
         return "No story history yet."
 
-    # Get the most recent entries
-    recent_history = history[-max_entries:] if len(history) > max_entries else history
+    # Get the most recent entries, walking back from the end only
+    recent_history = list(islice(reversed(history), max_entries))
+    recent_history.reverse()
 
     formatted_entries = []
     for i, entry in enumerate(recent_history, 1):
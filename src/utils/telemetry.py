@@ -0,0 +1,101 @@
+"""Logfire configuration shared by the application and its agents."""
+
+from __future__ import annotations
+
+import functools
+import os
+from typing import Any, Dict
+
+import logfire
+
+_TELEMETRY_CONFIGURED = False
+_INSTRUMENTED: Dict[str, bool] = {}
+
+
+def setup_telemetry() -> Dict[str, bool]:
+    """
+    Configure logfire and instrument the LLM stack once per process.
+
+    Called lazily by the application and the agent managers when they are
+    created, not at import; only the first call does any work. Instrumentation
+    wraps pydantic-ai, OpenAI and httpx calls, so it is only enabled when
+    LOGFIRE_TOKEN is set or ENABLE_TRACING requests it (e.g. for a local OTLP
+    exporter).
+
+    Returns:
+        Mapping of instrumentation name to whether it was enabled; empty when
+        tracing is off
+    """
+    global _TELEMETRY_CONFIGURED
+    if _TELEMETRY_CONFIGURED:
+        return dict(_INSTRUMENTED)
+    _TELEMETRY_CONFIGURED = True
+
+    logfire_token = os.getenv('LOGFIRE_TOKEN')
+    tracing_enabled = os.getenv('ENABLE_TRACING', '').lower() in ('1', 'true', 'yes')
+    if not logfire_token:
+        logfire.configure(send_to_logfire='if-token-present', inspect_arguments=False)
+        if not tracing_enabled:
+            return {}
+    else:
+        logfire.configure(token=logfire_token, inspect_arguments=False)
+
+    for instrument_name, instrument_func in [
+        ('pydantic_ai', logfire.instrument_pydantic_ai),
+        ('openai', logfire.instrument_openai),
+        ('httpx', logfire.instrument_httpx)
+    ]:
+        try:
+            instrument_func()
+            _INSTRUMENTED[instrument_name] = True
+        except Exception:
+            # Gracefully handle missing optional instrumentation dependencies
+            _INSTRUMENTED[instrument_name] = False
+
+    return dict(_INSTRUMENTED)
+
+
+@functools.lru_cache(maxsize=1)
+def tracing_enabled() -> bool:
+    """
+    Check whether spans are exported anywhere.
+
+    Returns:
+        True when LOGFIRE_TOKEN or ENABLE_TRACING is set
+    """
+    return bool(os.getenv('LOGFIRE_TOKEN')) or os.getenv('ENABLE_TRACING', '').lower() in ('1', 'true', 'yes')
+
+
+class _NullSpan:
+    """Stand-in for a logfire span when tracing is disabled."""
+
+    def __enter__(self) -> _NullSpan:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def trace_span(msg_template: str, **attributes: Any) -> Any:
+    """
+    Open a logfire span, or a shared no-op span when tracing is disabled.
+
+    Args:
+        msg_template: Span message template, as for logfire.span
+        attributes: Span attributes
+
+    Returns:
+        Context manager with set_attribute/set_attributes
+    """
+    if tracing_enabled():
+        return logfire.span(msg_template, **attributes)
+    return _NULL_SPAN
@@ -5,7 +5,7 @@ from __future__ import annotations
 from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
-from src.agents.character import CharacterManager, embody_character, StoryDeps
+from src.agents.character import CharacterManager, embody_character, get_character_agent, StoryDeps
 from src.agents.character_creator import CharacterCreationManager
 from src.agents.scenario_generator import ScenarioGenerationManager
 from src.agents.storyteller import StorytellerAgent
@@ -22,7 +22,7 @@ class TestCharacterAgent:
         story_deps.story_world.characters["Alice"] = sample_character
         
         # Mock the agent response
-        with patch('src.agents.character.character_agent.run') as mock_run:
+        with patch.object(get_character_agent(), 'run') as mock_run:
             mock_response = MagicMock()
             mock_response.output = "Hello there! I'm excited to meet you!"
             mock_run.return_value = mock_response
@@ -62,7 +62,7 @@ class TestCharacterAgent:
         )
         story_deps.story_world.characters["TestChar"] = character
         
-        with patch('src.agents.character.character_agent.run') as mock_run:
+        with patch.object(get_character_agent(), 'run') as mock_run:
             mock_response = MagicMock()
             mock_response.output = "Test response"
             mock_run.return_value = mock_response
@@ -74,7 +74,197 @@ class TestCharacterAgent:
             
             # Should limit memories to 20
             assert len(character.memories) == 20
-    
+
+    @pytest.mark.asyncio
+    async def test_embody_character_static_prefix_reused(self, story_deps: StoryDeps, sample_character: Character):
+        """Test that the static prompt block is identical across turns and the situation comes last."""
+        story_deps.story_world.characters["Alice"] = sample_character
+
+        with patch.object(get_character_agent(), 'run') as mock_run:
+            mock_response = MagicMock()
+            mock_response.output = "Response"
+            mock_run.return_value = mock_response
+
+            mock_ctx = MagicMock()
+            mock_ctx.deps = story_deps
+
+            await embody_character(mock_ctx, "Alice", "first situation")
+            await embody_character(mock_ctx, "Alice", "second situation")
+
+            first_prompt = mock_run.call_args_list[0].args[0]
+            second_prompt = mock_run.call_args_list[1].args[0]
+            assert first_prompt[0] is second_prompt[0]
+            assert "first situation" not in first_prompt[0]
+            assert first_prompt[-1].rstrip().endswith("first situation")
+            assert second_prompt[-1].rstrip().endswith("second situation")
+
+            first_settings = mock_run.call_args_list[0].kwargs['model_settings']
+            second_settings = mock_run.call_args_list[1].kwargs['model_settings']
+            assert first_settings['extra_body']['prompt_cache_key'] == second_settings['extra_body']['prompt_cache_key']
+
+    def test_static_character_context_invalidated_on_profile_change(self, sample_character: Character, sample_scene: Scene):
+        """Test that changing a relationship rebuilds the cached static block."""
+        from src.agents.character import build_static_character_context
+
+        before = build_static_character_context(sample_character, sample_scene)
+        assert build_static_character_context(sample_character, sample_scene) is before
+
+        sample_character.set_relationship("Mallory", "sworn enemy")
+        after = build_static_character_context(sample_character, sample_scene)
+
+        assert after is not before
+        assert "Mallory: sworn enemy" in after
+
+    def test_static_character_context_tracks_field_assignment(self, sample_character: Character, sample_scene: Scene):
+        """Test that reassigning profile or scene fields rebuilds the cached block."""
+        from src.agents.character import build_static_character_context
+
+        before = build_static_character_context(sample_character, sample_scene)
+        sample_character.memories.append("A new memory")
+        assert build_static_character_context(sample_character, sample_scene) is before
+
+        sample_character.description = "Now wears a silver cloak"
+        after_profile = build_static_character_context(sample_character, sample_scene)
+        assert "silver cloak" in after_profile
+
+        sample_scene.atmosphere = "Eerie silence"
+        after_scene = build_static_character_context(sample_character, sample_scene)
+        assert "Eerie silence" in after_scene
+        assert build_static_character_context(sample_character, sample_scene) is after_scene
+
+    def test_managers_default_to_shared_http_client(self, sample_story_world: StoryWorld):
+        """Test that managers without an explicit client share one connection pool."""
+        from agents.http_client import get_http_client
+
+        manager = CharacterManager(sample_story_world)
+        creation_manager = CharacterCreationManager(sample_story_world)
+        scenario_manager = ScenarioGenerationManager()
+        storyteller = StorytellerAgent()
+
+        assert manager.client is get_http_client()
+        assert creation_manager.client is manager.client
+        assert scenario_manager.client is manager.client
+        assert ScenarioGenerationManager().deps.client is manager.client
+        assert storyteller.scenario_manager.client is manager.client
+
+    @pytest.mark.asyncio
+    async def test_close_http_client_resets_shared_client(self):
+        """Test closing the shared client makes later callers get a fresh, open one."""
+        from agents.http_client import close_http_client, get_http_client
+
+        client = get_http_client()
+        await close_http_client()
+
+        assert client.is_closed
+        fresh = get_http_client()
+        assert fresh is not client
+        assert not fresh.is_closed
+
+    def test_aiohttp_transport_falls_back_without_extra(self):
+        """Test HTTP_TRANSPORT=aiohttp falls back to httpx when the extra is missing."""
+        import httpx
+        from agents import http_client
+
+        with patch.object(http_client, 'HTTP_TRANSPORT', 'aiohttp'), \
+                patch('agents.http_client.importlib.util.find_spec', return_value=None):
+            client = http_client.get_http_client.__wrapped__()
+
+        assert type(client) is httpx.AsyncClient
+
+    def test_prompt_cache_key_follows_profile(self, sample_character: Character, sample_scene: Scene):
+        """Test that the prompt cache key is stable until the profile changes."""
+        from src.agents.character import build_static_character_context, get_prompt_cache_key
+
+        before = get_prompt_cache_key(build_static_character_context(sample_character, sample_scene))
+        assert get_prompt_cache_key(build_static_character_context(sample_character, sample_scene)) == before
+
+        sample_character.set_relationship("Mallory", "sworn enemy")
+        after = get_prompt_cache_key(build_static_character_context(sample_character, sample_scene))
+
+        assert after != before
+
+    @pytest.mark.asyncio
+    async def test_embody_character_response_cache(self, story_deps: StoryDeps, sample_character: Character):
+        """Test identical prompts are served from the response cache at temperature 0."""
+        from src.agents.character import character_response_cache
+
+        story_deps.story_world.characters["Alice"] = sample_character
+        character_response_cache.clear()
+        memories = list(sample_character.memories)
+
+        with patch('src.agents.character.RESPONSE_CACHE_ENABLED', True), \
+                patch.object(get_character_agent(), 'run') as mock_run:
+            mock_response = MagicMock()
+            mock_response.output = "Cached hello"
+            mock_run.return_value = mock_response
+
+            mock_ctx = MagicMock()
+            mock_ctx.deps = story_deps
+
+            first = await embody_character(mock_ctx, "Alice", "greeting")
+            # Reset memories so the second prompt is byte-identical to the first
+            sample_character.memories = memories
+            second = await embody_character(mock_ctx, "Alice", "greeting")
+            third = await embody_character(mock_ctx, "Alice", "greeting")
+
+        assert first == second == third == "Cached hello"
+        # The third call sees the memory added by the second one, so it is a miss
+        assert mock_run.call_count == 2
+        assert mock_run.call_args.kwargs['model_settings']['temperature'] == 0.0
+        character_response_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_embody_character_offloads_large_profile(self, story_deps: StoryDeps):
+        """Test that only uncached, oversized profiles are built in a worker thread."""
+        import asyncio
+
+        character = Character("Sage", "x" * 70000, "wise", "slow")
+        story_deps.story_world.characters["Sage"] = character
+
+        with patch.object(get_character_agent(), 'run') as mock_run, \
+                patch('src.agents.character.asyncio.to_thread', wraps=asyncio.to_thread) as mock_to_thread:
+            mock_response = MagicMock()
+            mock_response.output = "Hmm."
+            mock_run.return_value = mock_response
+
+            mock_ctx = MagicMock()
+            mock_ctx.deps = story_deps
+
+            await embody_character(mock_ctx, "Sage", "first question")
+            await embody_character(mock_ctx, "Sage", "second question")
+
+        assert mock_to_thread.call_count == 1
+        assert "x" * 100 in mock_run.call_args.args[0][0]
+
+    @pytest.mark.asyncio
+    async def test_character_speaks_stream(self, sample_story_world: StoryWorld, mock_http_client):
+        """Test streaming a character response and recording memory at the end."""
+        from contextlib import asynccontextmanager
+
+        class FakeStream:
+            async def stream_text(self, delta: bool = False):
+                for chunk in ["Well ", "met, ", "traveler."]:
+                    yield chunk
+
+        @asynccontextmanager
+        async def fake_run_stream(*args, **kwargs):
+            yield FakeStream()
+
+        manager = CharacterManager(sample_story_world, mock_http_client)
+        memory_count = len(sample_story_world.characters["Alice"].memories)
+
+        with patch.object(get_character_agent(), 'run_stream', side_effect=fake_run_stream):
+            chunks = [chunk async for chunk in manager.character_speaks_stream("Alice", "a stranger arrives")]
+
+        assert "".join(chunks) == "Well met, traveler."
+        assert len(sample_story_world.characters["Alice"].memories) == memory_count + 1
+
+    def test_get_model_is_shared(self):
+        """Test that the model is built once and reused by every caller."""
+        from src.agents.model import get_model
+
+        assert get_model() is get_model()
+
     @pytest.mark.asyncio 
     async def test_character_manager_expected_use(self, sample_story_world: StoryWorld, mock_http_client):
         """Test CharacterManager basic functionality."""
@@ -188,6 +378,26 @@ class TestStorytellerAgent:
             # Meta-commands should be added as story development, not user input
             assert any("Story development:" in entry for entry in updated_world.history)
     
+    @pytest.mark.asyncio
+    async def test_continue_story_stream_yields_fragments(self, mock_http_client, sample_story_world: StoryWorld):
+        """Test streamed continuation yields the response and records it once complete."""
+        from pydantic_ai.models.test import TestModel
+
+        storyteller = StorytellerAgent(mock_http_client)
+        model = TestModel(call_tools=[], custom_output_text="The rain eases as you step outside.")
+
+        with storyteller.agent.override(model=model):
+            fragments = [
+                fragment async for fragment in
+                storyteller.continue_story_stream("I step outside", sample_story_world)
+            ]
+
+        assert ''.join(fragments) == "The rain eases as you step outside."
+        assert sample_story_world.history[-2:] == [
+            "User: I step outside",
+            "Narrator: The rain eases as you step outside."
+        ]
+
     @pytest.mark.asyncio
     async def test_refine_scenario_expected_use(self, mock_http_client, sample_story_world: StoryWorld):
         """Test scenario refinement based on feedback using new agent architecture."""
@@ -221,20 +431,70 @@ class TestStorytellerAgent:
         assert storyteller._is_meta_command("incomplete*") is False
         assert storyteller._is_meta_command("normal text") is False
         assert storyteller._is_meta_command("") is False
+        assert storyteller._is_meta_command("*") is False
+        assert storyteller._parse_meta_command("  *the door opens*  ") == "the door opens"
     
     def test_build_story_context(self, mock_http_client, sample_story_world: StoryWorld):
         """Test building story context for agent."""
         storyteller = StorytellerAgent(mock_http_client)
         
         user_input = "I look around the room"
-        context = storyteller._build_story_context(user_input, sample_story_world)
+        scene_context, turn_context = storyteller._build_story_context(user_input, sample_story_world)
         
-        assert "Current Scene:" in context
-        assert sample_story_world.current_scene.location in context
-        assert user_input in context
-        assert "Recent Story Events:" in context
+        assert "Current Scene:" in scene_context
+        assert sample_story_world.current_scene.location in scene_context
+        assert user_input in turn_context
+        assert "Recent Story Events:" in turn_context
+        assert user_input not in scene_context
+
+        next_scene_context, _ = storyteller._build_story_context("I open the door", sample_story_world)
+        assert next_scene_context == scene_context
     
 
+    @pytest.mark.asyncio
+    async def test_meta_command_response_cache(self, mock_http_client, sample_story_world: StoryWorld):
+        """Test a repeated meta-command in the same story state reuses the response."""
+        storyteller = StorytellerAgent(mock_http_client)
+        first_world = StoryWorld.from_dict(sample_story_world.to_dict())
+        second_world = StoryWorld.from_dict(sample_story_world.to_dict())
+
+        with patch('src.agents.storyteller.STORY_RESPONSE_CACHE_ENABLED', True), \
+                patch.object(storyteller.agent, 'run', AsyncMock(return_value=MagicMock(output="Thunder rolls."))) as mock_run:
+            first, _ = await storyteller.continue_story("*make it stormy*", first_world)
+            second, _ = await storyteller.continue_story("*make it stormy*", second_world)
+
+        assert mock_run.await_count == 1
+        assert mock_run.await_args.kwargs['model_settings'] == {'temperature': 0.0}
+        assert first == second == "Thunder rolls."
+        assert second_world.history[-1] == "Story development: Thunder rolls."
+
+    @pytest.mark.asyncio
+    async def test_create_scenario_creates_characters_concurrently(self, mock_http_client, sample_story_world: StoryWorld):
+        """Test character concepts are created concurrently, keeping concept order."""
+        import asyncio
+
+        storyteller = StorytellerAgent(mock_http_client)
+        in_flight = 0
+        peak = 0
+
+        async def create(concept, story_context=""):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return Character(name=concept, description="d", personality="p", speech_patterns="s")
+
+        with patch.object(storyteller.scenario_manager, 'create_scenario_from_concept',
+                          AsyncMock(return_value=(sample_story_world, ["A", "B", "C"]))), \
+                patch('src.agents.storyteller.CharacterCreationManager') as mock_manager_class:
+            mock_manager_class.return_value.create_character_from_concept = AsyncMock(side_effect=create)
+            story_world = await storyteller.create_scenario("A concept")
+
+        assert peak == 3
+        assert story_world.current_scene.active_characters == ["A", "B"]
+
+
 class TestCharacterCreationAgent:
     """Test cases for the character creation agent."""
     
@@ -280,6 +540,197 @@ class TestCharacterCreationAgent:
             assert len(characters) == 2
             assert all(char.name in sample_story_world.characters for char in characters)
 
+    @pytest.mark.asyncio
+    async def test_character_creator_uses_native_json_schema(self):
+        """Test the creator agent requests strict JSON schema output instead of a tool call."""
+        import json
+        from openai.types.chat import ChatCompletion
+        from pydantic_ai.models.openai import OpenAIModel
+        from pydantic_ai.providers.openai import OpenAIProvider
+        from src.agents.character_creator import get_character_creator_agent
+
+        content = json.dumps({
+            "name": "Mira", "description": "d", "personality": "p", "speech_patterns": "s", "context": ""
+        })
+        completion = ChatCompletion.model_validate({
+            "id": "1", "object": "chat.completion", "created": 0, "model": "gpt-4o-mini",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}]
+        })
+        client = MagicMock()
+        client.base_url = "https://api.openai.com/v1"
+        client.chat.completions.create = AsyncMock(return_value=completion)
+        model = OpenAIModel("gpt-4o-mini", provider=OpenAIProvider(openai_client=client))
+
+        character_creator_agent = get_character_creator_agent()
+        with character_creator_agent.override(model=model):
+            result = await character_creator_agent.run("Create a character: a sailor", deps=None)
+
+        assert result.output.name == "Mira"
+        request = client.chat.completions.create.call_args.kwargs
+        assert request["response_format"]["type"] == "json_schema"
+        assert request["response_format"]["json_schema"]["strict"] is True
+
+    @pytest.mark.asyncio
+    async def test_character_creation_starts_prompt_warmup(self, sample_story_world: StoryWorld, mock_http_client):
+        """Test a created character's prompt is prefilled in the background when enabled."""
+        import asyncio
+        from agents import character as character_module
+        from src.agents.character_creator import CharacterCreationRequest, get_character_creator_agent
+
+        manager = CharacterCreationManager(sample_story_world, mock_http_client)
+        creation_result = MagicMock()
+        creation_result.output = CharacterCreationRequest(
+            name="Nell", description="d", personality="p", speech_patterns="s"
+        )
+
+        with patch('src.agents.character_creator.CHARACTER_PROMPT_WARMUP', True), \
+                patch.object(get_character_creator_agent(), 'run', AsyncMock(return_value=creation_result)), \
+                patch.object(character_module.get_character_agent(), 'run', AsyncMock()) as mock_warm_run:
+            character = await manager.create_character_from_concept("a scout")
+            await asyncio.gather(*manager._warmup_tasks)
+
+        assert character.name == "Nell"
+        assert mock_warm_run.await_count == 1
+        assert mock_warm_run.call_args.kwargs['model_settings']['max_tokens'] == 1
+        assert not manager._warmup_tasks
+        assert list(sample_story_world.characters["Nell"].memories) == []
+
+    @pytest.mark.asyncio
+    async def test_create_multiple_characters_concurrent_skips_failures(self, sample_story_world: StoryWorld, mock_http_client):
+        """Test concepts are created concurrently and failed concepts are skipped."""
+        import asyncio
+
+        manager = CharacterCreationManager(sample_story_world, mock_http_client)
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake_create(concept: str, story_context: str = "") -> Character:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if concept == "broken":
+                raise RuntimeError("model error")
+            character = Character(concept.title(), "desc", "pers", "speech", [], {})
+            sample_story_world.add_character(character)
+            return character
+
+        with patch.object(manager, 'create_character_from_concept', side_effect=fake_create):
+            characters = await manager.create_multiple_characters(["knight", "broken", "wizard"])
+
+        assert [char.name for char in characters] == ["Knight", "Wizard"]
+        assert max_in_flight > 1
+        assert "Wizard" in sample_story_world.characters
+
+    @pytest.mark.asyncio
+    async def test_create_multiple_characters_all_failed(self, sample_story_world: StoryWorld, mock_http_client):
+        """Test an error is raised when no character could be created."""
+        manager = CharacterCreationManager(sample_story_world, mock_http_client)
+
+        with patch.object(manager, 'create_character_from_concept', AsyncMock(side_effect=RuntimeError("model error"))):
+            with pytest.raises(RuntimeError):
+                await manager.create_multiple_characters(["first", "second"])
+
+    @pytest.mark.asyncio
+    async def test_create_multiple_characters_propagates_cancellation(self, sample_story_world: StoryWorld, mock_http_client):
+        """Test a cancelled concept cancels the whole call instead of being skipped."""
+        import asyncio
+
+        manager = CharacterCreationManager(sample_story_world, mock_http_client)
+
+        async def fake_create(concept: str, story_context: str = "") -> Character:
+            if concept == "cancelled":
+                raise asyncio.CancelledError()
+            return Character(concept.title(), "desc", "pers", "speech", [], {})
+
+        with patch.object(manager, 'create_character_from_concept', side_effect=fake_create):
+            with pytest.raises(asyncio.CancelledError):
+                await manager.create_multiple_characters(["knight", "cancelled"])
+
+
+class TestBatchCharacterCreator:
+    """Test cases for Batch API character creation."""
+
+    def test_build_request_line(self):
+        """Test a concept renders to a chat completions batch line."""
+        from agents.batch_creator import BatchCharacterCreator
+
+        creator = BatchCharacterCreator(client=MagicMock(), model_name="gpt-4o-mini")
+        line = creator.build_request_line(3, "A grumpy innkeeper", "Medieval town")
+
+        assert line['custom_id'] == "char-3"
+        assert line['url'] == "/v1/chat/completions"
+        assert line['body']['model'] == "gpt-4o-mini"
+        assert "A grumpy innkeeper" in line['body']['messages'][1]['content']
+        assert line['body']['response_format']['type'] == "json_schema"
+        json_schema = line['body']['response_format']['json_schema']
+        assert json_schema['strict'] is True
+        assert json_schema['schema']['additionalProperties'] is False
+
+    @pytest.mark.asyncio
+    async def test_create_characters_expected_use(self):
+        """Test batch submission, polling and result parsing in concept order."""
+        import json
+        from agents.batch_creator import BatchCharacterCreator
+
+        def output_line(custom_id: str, name: str) -> str:
+            content = json.dumps({
+                "name": name, "description": "d", "personality": "p", "speech_patterns": "s"
+            })
+            return json.dumps({
+                "custom_id": custom_id,
+                "response": {"status_code": 200, "body": {"choices": [{"message": {"content": content}}]}}
+            })
+
+        failed_line = json.dumps({"custom_id": "char-1", "response": {"status_code": 500, "body": {}}})
+
+        client = MagicMock()
+        client.files.create = AsyncMock(return_value=MagicMock(id="file-in"))
+        client.batches.create = AsyncMock(return_value=MagicMock(id="batch-1"))
+        client.batches.retrieve = AsyncMock(side_effect=[
+            MagicMock(status="in_progress"),
+            MagicMock(status="completed", output_file_id="file-out"),
+        ])
+        client.files.content = AsyncMock(return_value=MagicMock(
+            text="\n".join([output_line("char-2", "Zed"), failed_line, output_line("char-0", "Ann")])
+        ))
+
+        creator = BatchCharacterCreator(client=client, poll_interval=0)
+        results = await creator.create_characters(["first", "second", "third"])
+
+        assert [r.name for r in results] == ["Ann", "Zed"]
+        assert client.batches.retrieve.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_create_characters_batch_failed(self):
+        """Test an error is raised when the batch does not complete."""
+        from agents.batch_creator import BatchCharacterCreator
+
+        client = MagicMock()
+        client.files.create = AsyncMock(return_value=MagicMock(id="file-in"))
+        client.batches.create = AsyncMock(return_value=MagicMock(id="batch-1"))
+        client.batches.retrieve = AsyncMock(return_value=MagicMock(status="expired", output_file_id=None))
+
+        creator = BatchCharacterCreator(client=client, poll_interval=0)
+        with pytest.raises(RuntimeError):
+            await creator.create_characters(["first"])
+
+    @pytest.mark.asyncio
+    async def test_manager_uses_batch_api(self, sample_story_world: StoryWorld, mock_http_client):
+        """Test the manager adds batch-created characters to the story world."""
+        from src.agents.character_creator import CharacterCreationRequest
+
+        manager = CharacterCreationManager(sample_story_world, mock_http_client)
+        batch_result = [CharacterCreationRequest(name="Bram", description="d", personality="p", speech_patterns="s")]
+
+        with patch('agents.batch_creator.BatchCharacterCreator.create_characters', AsyncMock(return_value=batch_result)):
+            with patch('agents.batch_creator.AsyncOpenAI'):
+                characters = await manager.create_multiple_characters(["a blacksmith"], use_batch_api=True)
+
+        assert [char.name for char in characters] == ["Bram"]
+        assert "Bram" in sample_story_world.characters
+
 
 class TestScenarioGenerationAgent:
     """Test cases for the scenario generation agent."""
@@ -331,4 +782,164 @@ class TestScenarioGenerationAgent:
             
             assert refined_world.premise == "Refined premise with personal stakes"
             assert "Personal vendetta" in refined_world.conflicts
-            assert any("refined" in entry.lower() for entry in refined_world.history)
\ No newline at end of file
+            assert any("refined" in entry.lower() for entry in refined_world.history)
+
+    def test_scenario_agent_is_shared(self, mock_http_client):
+        """Test managers reuse one lazily built scenario agent."""
+        from src.agents.scenario_generator import get_scenario_agent
+
+        first = ScenarioGenerationManager(mock_http_client)
+        second = ScenarioGenerationManager(mock_http_client)
+
+        assert first.agent is second.agent is get_scenario_agent()
+
+    @pytest.mark.asyncio
+    async def test_scenario_cache_serves_repeated_prompt(self, mock_http_client, tmp_path):
+        """Test a repeated concept is served from the SQLite scenario cache."""
+        from src.agents.response_cache import SQLiteResponseCache
+        from src.agents.scenario_generator import ScenarioGenerationRequest
+
+        scenario = ScenarioGenerationRequest(
+            premise="A heist on the moon",
+            setting="Lunar colony",
+            conflicts=["Oxygen is running out"],
+            opening_scene_location="Airlock",
+            opening_scene_description="Red lights flash",
+            opening_scene_atmosphere="Urgent",
+            character_concepts=["Safecracker"]
+        )
+        manager = ScenarioGenerationManager(mock_http_client)
+        agent = MagicMock()
+        agent.run = AsyncMock(return_value=MagicMock(output=scenario))
+
+        with patch('src.agents.scenario_generator.SCENARIO_CACHE_ENABLED', True), \
+                patch('src.agents.scenario_generator.scenario_response_cache', SQLiteResponseCache(str(tmp_path / "cache.db"))), \
+                patch('src.agents.scenario_generator.get_scenario_agent', return_value=agent):
+            first_world, _ = await manager.create_scenario_from_concept("moon heist")
+            second_world, concepts = await manager.create_scenario_from_concept("moon heist")
+
+        assert agent.run.await_count == 1
+        assert first_world.premise == second_world.premise == "A heist on the moon"
+        assert concepts == ["Safecracker"]
+
+    @pytest.mark.asyncio
+    async def test_scenario_prompts_start_with_fixed_instructions(self, mock_http_client):
+        """Test variable concept text comes after the shared instruction prefix."""
+        from src.agents import scenario_generator
+
+        ctx = MagicMock(deps=scenario_generator.ScenarioGenerationDeps(mock_http_client))
+        run = AsyncMock(return_value=MagicMock(premise="p", setting="s", conflicts=[], character_concepts=[]))
+
+        with patch.object(scenario_generator, '_run_scenario_agent', run):
+            await scenario_generator.generate_scenario(ctx, "a haunted {lighthouse}")
+            await scenario_generator.refine_scenario(ctx, {"premise": "p"}, "make it darker")
+
+        generate_prompt = run.await_args_list[0].args[0]
+        refine_prompt = run.await_args_list[1].args[0]
+        assert generate_prompt.startswith(scenario_generator.SCENARIO_REQUEST_INSTRUCTIONS)
+        assert "Initial Concept: a haunted {lighthouse}" in generate_prompt
+        assert generate_prompt.rstrip().endswith("Additional Requirements:")
+        assert refine_prompt.startswith(scenario_generator.SCENARIO_REFINEMENT_INSTRUCTIONS)
+        assert refine_prompt.rstrip().endswith("make it darker\n</feedback>")
+
+    @pytest.mark.asyncio
+    async def test_create_scenarios_batch_runs_concurrently(self, mock_http_client):
+        """Test scenario variations run concurrently within the concurrency bound."""
+        import asyncio
+
+        manager = ScenarioGenerationManager(mock_http_client)
+        in_flight = 0
+        peak = 0
+
+        async def create(concept, additional_requirements=""):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return MagicMock(premise=concept), [concept]
+
+        with patch('src.agents.scenario_generator.SCENARIO_GENERATION_CONCURRENCY', 2), \
+                patch.object(manager, 'create_scenario_from_concept', side_effect=create):
+            results = await manager.create_scenarios_batch(["a", "b", "c", "d"])
+
+        assert [world.premise for world, _ in results] == ["a", "b", "c", "d"]
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_refine_from_feedback_sends_scenario_as_json(self, mock_http_client, sample_story_world: StoryWorld):
+        """Test the current scenario is embedded in the refinement prompt as JSON."""
+        import json
+
+        manager = ScenarioGenerationManager(mock_http_client)
+        conflicts = list(sample_story_world.conflicts)
+        refined = MagicMock(premise="p", setting="s", conflicts=["c"])
+        with patch('src.agents.scenario_generator._run_scenario_agent', AsyncMock(return_value=refined)) as mock_run:
+            await manager.refine_scenario_from_feedback(sample_story_world, "More danger")
+
+        prompt = mock_run.await_args.args[0]
+        scenario_section = prompt.split("<scenario>\n", 1)[1].split("\n</scenario>", 1)[0]
+        scenario = json.loads(scenario_section)
+        assert scenario['conflicts'] == conflicts
+        assert 'opening_scene_location' in scenario
+
+    @pytest.mark.asyncio
+    async def test_stream_scenario_from_concept(self, mock_http_client):
+        """Test streamed scenario generation ends with the complete scenario."""
+        import json
+        from pydantic_ai import Agent
+        from pydantic_ai.models.function import DeltaToolCall, FunctionModel
+        from src.agents.scenario_generator import ScenarioGenerationDeps, ScenarioGenerationRequest
+        from src.agents.scenario_stream import stream_scenario
+
+        payload = json.dumps({
+            "premise": "A heist on the moon",
+            "setting": "Lunar colony",
+            "conflicts": ["Oxygen is running out"],
+            "opening_scene_location": "Airlock",
+            "opening_scene_description": "Red lights flash",
+            "opening_scene_atmosphere": "Urgent",
+            "character_concepts": ["Safecracker", "Pilot"]
+        })
+
+        async def stream_function(messages, info):
+            tool_name = info.output_tools[0].name
+            for i in range(0, len(payload), 16):
+                yield {0: DeltaToolCall(name=tool_name if i == 0 else None, json_args=payload[i:i + 16])}
+
+        agent = Agent(
+            FunctionModel(stream_function=stream_function),
+            deps_type=ScenarioGenerationDeps,
+            output_type=ScenarioGenerationRequest
+        )
+        manager = ScenarioGenerationManager(mock_http_client)
+
+        with patch('src.agents.scenario_stream.get_scenario_agent', return_value=agent):
+            partials = [scenario async for scenario in stream_scenario(manager.deps, "moon heist")]
+
+        story_world = manager.build_story_world(partials[-1])
+        assert partials[-1].character_concepts == ["Safecracker", "Pilot"]
+        assert story_world.premise == "A heist on the moon"
+        assert story_world.current_scene.location == "Airlock"
+
+
+class TestResponseCache:
+    """Test cases for the LLM response caches."""
+
+    @pytest.mark.asyncio
+    async def test_sqlite_response_cache_ttl_and_eviction(self, tmp_path):
+        """Test the SQLite response cache expires and evicts old entries."""
+        from src.agents.response_cache import SQLiteResponseCache
+
+        cache = SQLiteResponseCache(str(tmp_path / "cache.db"), max_entries=2)
+        await cache.put("a", "first")
+        await cache.put("b", "second")
+        assert await cache.get("a") == "first"
+
+        await cache.put("c", "third")
+        assert await cache.get("b") is None
+        assert await cache.get("a") == "first"
+        assert await cache.get("c") == "third"
+
+        expired = SQLiteResponseCache(str(tmp_path / "cache.db"), ttl_seconds=-1)
+        assert await expired.get("a") is None
@@ -8,7 +8,8 @@ import pytest
 from src.cli.interface import StorytellingCLI
 from src.cli.commands import CommandHandler
 from src.models.session import StorySession
-from src.models.story import StoryWorld, Scene
+from src.models.story import Character, StoryWorld, Scene
+from src.storage.models import SessionMetadata
 
 
 class TestStorytellingCLI:
@@ -25,33 +26,30 @@ class TestStorytellingCLI:
         assert cli.current_session is None
         assert cli.messages == []
     
-    @pytest.mark.asyncio
-    async def test_display_scenario_expected_use(self, sample_story_world: StoryWorld):
+    def test_display_scenario_expected_use(self, sample_story_world: StoryWorld):
         """Test displaying a created scenario."""
         cli = StorytellingCLI()
         
         # This should not raise an exception
-        await cli._display_scenario(sample_story_world)
+        cli._display_scenario(sample_story_world)
         # Test passes if no exception is raised
         assert True
     
-    @pytest.mark.asyncio
-    async def test_display_current_state_with_session(self, sample_session: StorySession):
+    def test_display_current_state_with_session(self, sample_session: StorySession):
         """Test displaying current state with active session."""
         cli = StorytellingCLI()
         cli.current_session = sample_session
         
         # This should not raise an exception
-        await cli._display_current_state()
+        cli._display_current_state()
         assert True
     
-    @pytest.mark.asyncio
-    async def test_display_current_state_no_session(self):
+    def test_display_current_state_no_session(self):
         """Test displaying current state without active session."""
         cli = StorytellingCLI()
         
         # Should handle gracefully when no session
-        await cli._display_current_state()
+        cli._display_current_state()
         assert True
     
     @pytest.mark.asyncio
@@ -73,7 +71,65 @@ class TestStorytellingCLI:
         with patch('builtins.input', return_value='r'):
             result = await cli._get_user_approval()
             assert result is False
+
+    @pytest.mark.asyncio
+    async def test_ainput_interrupted_read_answers_next_prompt(self):
+        """Test Ctrl+C during input raises KeyboardInterrupt and the pending read is reused."""
+        import asyncio
+        import threading
+
+        cli = StorytellingCLI()
+        line_typed = threading.Event()
+        prompts = []
+
+        def fake_input(prompt):
+            prompts.append(prompt)
+            line_typed.wait(5)
+            return "typed"
+
+        with patch('builtins.input', side_effect=fake_input), patch('builtins.print'):
+            asyncio.get_running_loop().call_later(0.05, asyncio.current_task().cancel)
+            with pytest.raises(KeyboardInterrupt):
+                await cli._ainput("first: ")
+
+            line_typed.set()
+            assert await cli._ainput("second: ") == "typed"
+
+        # Only one stdin read was started for both prompts
+        assert prompts == ["first: "]
     
+    @pytest.mark.asyncio
+    async def test_save_current_session_appends_new_messages(self, sample_session: StorySession):
+        """Test saves serialize messages structurally and only add those not saved yet."""
+        from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart, UserPromptPart
+
+        cli = StorytellingCLI()
+        cli.current_session = sample_session
+        sample_session.message_history = []
+        cli.messages = [ModelRequest(parts=[UserPromptPart(content="I open the door")])]
+
+        with patch.object(cli.storage, 'save_session'), patch('builtins.print'):
+            await cli._save_current_session()
+            cli.messages.append(ModelResponse(parts=[TextPart(content="It creaks.")]))
+            await cli._save_current_session()
+
+        history = sample_session.message_history
+        assert [entry["kind"] for entry in history] == ["request", "response"]
+        assert history[0]["parts"][0]["content"] == "I open the door"
+
+        # Loading the session restores the same messages
+        assert cli._restore_messages(sample_session) == cli.messages
+
+        sample_session.message_history = [{"type": "message", "content": "legacy"}]
+        assert cli._restore_messages(sample_session) == []
+        assert sample_session.message_history == []
+
+        # A history the CLI did not write is replaced rather than appended to
+        sample_session.message_history = [{"type": "message", "content": "legacy"}]
+        with patch.object(cli.storage, 'save_session'), patch('builtins.print'):
+            await cli._save_current_session()
+        assert cli._restore_messages(sample_session) == cli.messages
+
     @pytest.mark.asyncio
     async def test_save_current_session_with_session(self, sample_session: StorySession):
         """Test saving current session when session exists."""
@@ -104,12 +160,83 @@ class TestStorytellingCLI:
             await cli._save_current_session()
             assert True
     
+    @pytest.mark.asyncio
+    async def test_story_session_saves_when_cancelled_mid_stream(self, sample_session: StorySession):
+        """Test a cancellation during a streamed turn saves the session and propagates."""
+        import asyncio
+
+        cli = StorytellingCLI()
+        cli.current_session = sample_session
+
+        with patch.object(cli, '_ainput', AsyncMock(return_value='I open the door')), \
+                patch.object(cli, '_stream_story_response', AsyncMock(side_effect=asyncio.CancelledError)), \
+                patch.object(cli, '_save_current_session', AsyncMock()) as mock_save, \
+                patch('builtins.print'):
+            with pytest.raises(asyncio.CancelledError):
+                await cli._story_session()
+
+        mock_save.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_story_session_dispatches_commands(self, sample_session: StorySession):
+        """Test in-session commands are matched case-insensitively without reaching the storyteller."""
+        cli = StorytellingCLI()
+        cli.current_session = sample_session
+
+        with patch.object(cli, '_ainput', AsyncMock(side_effect=['Status', 'SAVE', '?', 'exit'])), \
+                patch.object(cli, '_save_current_session', AsyncMock()) as mock_save, \
+                patch.object(cli, '_display_help') as mock_help, \
+                patch('builtins.print'):
+            await cli._story_session()
+
+        assert mock_save.await_count == 2
+        mock_help.assert_called_once()
+        assert cli._storyteller is None
+
+    @pytest.mark.asyncio
+    async def test_stream_story_response_writes_whole_lines(self, sample_session: StorySession):
+        """Test streamed narrative is written line by line and returned in full."""
+        cli = StorytellingCLI()
+        cli.current_session = sample_session
+
+        async def fake_stream(user_input, story_world):
+            for fragment in ['The door ', 'creaks.\nA voice', ' calls out.']:
+                yield fragment
+
+        cli._storyteller = MagicMock(continue_story_stream=fake_stream)
+        with patch('cli.terminal_io.format_story_chunk', side_effect=lambda text: f"[{text}]") as mock_format, \
+                patch('sys.stdout') as mock_stdout:
+            response = await cli._stream_story_response("I knock")
+
+        assert response == "The door creaks.\nA voice calls out."
+        assert [c.args[0] for c in mock_format.call_args_list] == ["The door creaks.", "A voice calls out."]
+        assert mock_stdout.write.call_args_list[-1].args[0] == "[A voice calls out.]"
+
+    @pytest.mark.asyncio
+    async def test_session_listing_cached_until_storage_changes(self, file_storage, sample_session: StorySession):
+        """Test the session listing is reused until a save changes the storage directory."""
+        cli = StorytellingCLI()
+        cli.storage = file_storage
+
+        with patch.object(file_storage, 'list_sessions_meta', wraps=file_storage.list_sessions_meta) as mock_list:
+            assert await cli._list_sessions_meta() == []
+            assert await cli._list_sessions_meta() == []
+            assert mock_list.call_count == 1
+
+            cli.current_session = sample_session
+            with patch('builtins.print'):
+                await cli._save_current_session()
+            sessions = await cli._list_sessions_meta()
+
+        assert mock_list.call_count == 2
+        assert [meta.id for meta in sessions] == [sample_session.id]
+
     @pytest.mark.asyncio
     async def test_list_sessions_empty(self):
         """Test listing sessions when none exist."""
         cli = StorytellingCLI()
         
-        with patch.object(cli.storage, 'list_sessions', return_value=[]):
+        with patch.object(cli.storage, 'list_sessions_meta', return_value=[]):
             await cli._list_sessions()
             assert True
     
@@ -118,9 +245,14 @@ class TestStorytellingCLI:
         """Test listing sessions with existing data."""
         cli = StorytellingCLI()
         
-        with patch.object(cli.storage, 'list_sessions', return_value=[sample_session]):
+        meta = SessionMetadata.from_session(sample_session, 0, 0)
+        with patch.object(cli.storage, 'list_sessions_meta', return_value=[meta]), \
+                patch('builtins.print') as mock_print:
             await cli._list_sessions()
-            assert True
+
+        printed = "\n".join(str(call.args[0]) for call in mock_print.call_args_list if call.args)
+        assert sample_session.get_display_name() in printed
+        assert f"Characters: {len(sample_session.world.characters)}" in printed
 
 
 class TestCommandHandler:
@@ -131,49 +263,57 @@ class TestCommandHandler:
         handler = CommandHandler(file_storage)
         assert handler.storage == file_storage
     
-    @pytest.mark.asyncio
-    async def test_handle_info_command_with_session(self, file_storage, sample_session: StorySession):
+    def test_handle_info_command_with_session(self, file_storage, sample_session: StorySession):
         """Test info command with active session."""
         handler = CommandHandler(file_storage)
         
-        result = await handler.handle_info_command(sample_session)
+        result = handler.handle_info_command(sample_session)
         
         assert "SESSION INFORMATION" in result
         assert sample_session.id in result
         assert sample_session.world.premise in result
     
-    @pytest.mark.asyncio
-    async def test_handle_info_command_without_session(self, file_storage):
+    def test_handle_info_command_without_session(self, file_storage):
         """Test info command without active session."""
         handler = CommandHandler(file_storage)
         
-        with patch.object(file_storage, 'list_sessions', return_value=[]):
-            result = await handler.handle_info_command()
+        with patch.object(file_storage, 'list_sessions_meta', return_value=[]):
+            result = handler.handle_info_command()
             
             assert "SYSTEM INFORMATION" in result
             assert "Total sessions: 0" in result
     
-    @pytest.mark.asyncio
-    async def test_handle_characters_command_with_session(self, file_storage, sample_session: StorySession):
+    def test_handle_characters_command_with_session(self, file_storage, sample_session: StorySession):
         """Test characters command with active session."""
         handler = CommandHandler(file_storage)
         
-        result = await handler.handle_characters_command(sample_session)
+        result = handler.handle_characters_command(sample_session)
         
         assert "CHARACTERS IN CURRENT STORY" in result
         assert "Alice" in result  # From sample character
+
+    def test_handle_characters_command_layout(self, file_storage):
+        """Test characters are listed in order with a blank line between them."""
+        handler = CommandHandler(file_storage)
+        world = StoryWorld("Test", "Test", [], {}, Scene("", "", ""), [])
+        world.add_character(Character("Ann", "Smith", "Calm", "Plain"))
+        world.add_character(Character("Bob", "Baker", "Loud", "Brash"))
+
+        result = handler.handle_characters_command(StorySession.create_new(world))
+
+        assert "1. **Ann**" in result
+        assert "   Personality: Calm\n\n2. **Bob**" in result
+        assert result.endswith("   Personality: Loud\n")
     
-    @pytest.mark.asyncio
-    async def test_handle_characters_command_no_session(self, file_storage):
+    def test_handle_characters_command_no_session(self, file_storage):
         """Test characters command without active session."""
         handler = CommandHandler(file_storage)
         
-        result = await handler.handle_characters_command()
+        result = handler.handle_characters_command()
         
         assert "No active session" in result
     
-    @pytest.mark.asyncio
-    async def test_handle_characters_command_no_characters(self, file_storage):
+    def test_handle_characters_command_no_characters(self, file_storage):
         """Test characters command with session but no characters."""
         handler = CommandHandler(file_storage)
         
@@ -181,32 +321,41 @@ class TestCommandHandler:
         empty_world = StoryWorld("Test", "Test", [], {}, Scene("", "", ""), [])
         empty_session = StorySession.create_new(empty_world)
         
-        result = await handler.handle_characters_command(empty_session)
+        result = handler.handle_characters_command(empty_session)
         
         assert "No characters" in result
     
-    @pytest.mark.asyncio
-    async def test_handle_history_command_with_session(self, file_storage, sample_session: StorySession):
+    def test_handle_history_command_with_session(self, file_storage, sample_session: StorySession):
         """Test history command with active session."""
         handler = CommandHandler(file_storage)
         
-        result = await handler.handle_history_command(sample_session, count=5)
+        result = handler.handle_history_command(sample_session, count=5)
         
         assert "STORY HISTORY" in result
         # Should contain history from sample session
         assert len(result) > 0
     
-    @pytest.mark.asyncio
-    async def test_handle_history_command_no_session(self, file_storage):
+    def test_handle_history_command_tail(self, file_storage):
+        """Test history command shows only the latest entries, oldest first."""
+        handler = CommandHandler(file_storage)
+        world = StoryWorld("Test", "Test", [], {}, Scene("", "", ""), [])
+        for i in range(12):
+            world.add_history_entry(f"event {i}")
+
+        result = handler.handle_history_command(StorySession.create_new(world), count=3)
+
+        assert "1. event 9\n2. event 10\n3. event 11" in result
+        assert "... and 9 earlier entries" in result
+
+    def test_handle_history_command_no_session(self, file_storage):
         """Test history command without active session."""
         handler = CommandHandler(file_storage)
         
-        result = await handler.handle_history_command()
+        result = handler.handle_history_command()
         
         assert "No active session" in result
     
-    @pytest.mark.asyncio
-    async def test_handle_history_command_no_history(self, file_storage):
+    def test_handle_history_command_no_history(self, file_storage):
         """Test history command with session but no history."""
         handler = CommandHandler(file_storage)
         
@@ -214,26 +363,24 @@ class TestCommandHandler:
         empty_world = StoryWorld("Test", "Test", [], {}, Scene("", "", ""), [])
         empty_session = StorySession.create_new(empty_world)
         
-        result = await handler.handle_history_command(empty_session)
+        result = handler.handle_history_command(empty_session)
         
         assert "No story history" in result
     
-    @pytest.mark.asyncio
-    async def test_handle_scene_command_with_session(self, file_storage, sample_session: StorySession):
+    def test_handle_scene_command_with_session(self, file_storage, sample_session: StorySession):
         """Test scene command with active session."""
         handler = CommandHandler(file_storage)
         
-        result = await handler.handle_scene_command(sample_session)
+        result = handler.handle_scene_command(sample_session)
         
         assert "CURRENT SCENE" in result
         assert sample_session.world.current_scene.location in result
     
-    @pytest.mark.asyncio
-    async def test_handle_scene_command_no_session(self, file_storage):
+    def test_handle_scene_command_no_session(self, file_storage):
         """Test scene command without active session."""
         handler = CommandHandler(file_storage)
         
-        result = await handler.handle_scene_command()
+        result = handler.handle_scene_command()
         
         assert "No active session" in result
     
@@ -276,8 +423,19 @@ class TestCommandHandler:
             assert "exported" in result.lower()
             export_file = tmp_path / f"story_export_{sample_session.id[:8]}.json"
             assert export_file.exists()
+            assert StorySession.from_json(export_file.read_text()).id == sample_session.id
         finally:
             os.chdir(original_cwd)
+
+    def test_iter_export_lines(self, file_storage, sample_session: StorySession):
+        """Test text export lines are newline-terminated and include history."""
+        handler = CommandHandler(file_storage)
+        sample_session.world.add_history_entry("The door creaks open.")
+
+        lines = list(handler._iter_export_lines(sample_session))
+
+        assert all(line.endswith("\n") for line in lines)
+        assert lines[-1] == "The door creaks open.\n"
     
     @pytest.mark.asyncio
     async def test_handle_export_command_invalid_format(self, file_storage, sample_session: StorySession):
@@ -297,36 +455,103 @@ class TestCommandHandler:
         
         assert "No active session" in result
     
-    @pytest.mark.asyncio
-    async def test_handle_stats_command_with_session(self, file_storage, sample_session: StorySession):
+    def test_handle_stats_command_with_session(self, file_storage, sample_session: StorySession):
         """Test stats command with active session."""
         handler = CommandHandler(file_storage)
         
-        result = await handler.handle_stats_command(sample_session)
+        result = handler.handle_stats_command(sample_session)
         
         assert "SESSION STATISTICS" in result
         assert sample_session.id in result
         assert "Characters:" in result
         assert "History entries:" in result
+
+    def test_handle_stats_command_file_size(self, file_storage, sample_session: StorySession):
+        """Test stats report the session file size from the configured storage directory."""
+        handler = CommandHandler(file_storage)
+        file_storage.save_session(sample_session)
+
+        result = handler.handle_stats_command(sample_session)
+
+        file_size = (file_storage.storage_dir / f"{sample_session.id}.json").stat().st_size
+        assert f"File size: {file_size:,} bytes" in result
     
-    @pytest.mark.asyncio
-    async def test_handle_stats_command_no_session(self, file_storage):
+    def test_handle_stats_command_no_session(self, file_storage):
         """Test stats command without active session."""
         handler = CommandHandler(file_storage)
         
-        result = await handler.handle_stats_command()
+        result = handler.handle_stats_command()
         
         assert "No active session" in result
     
-    @pytest.mark.asyncio
-    async def test_handle_diagnostics_command(self, file_storage):
+    def test_handle_diagnostics_command(self, file_storage):
         """Test diagnostics command."""
         handler = CommandHandler(file_storage)
         
         with patch('src.cli.commands.validate_environment') as mock_validate:
             mock_validate.return_value = {"api_key_present": True, "LLM_MODEL": True}
             
-            result = await handler.handle_diagnostics_command()
+            result = handler.handle_diagnostics_command()
             
             assert "SYSTEM DIAGNOSTICS" in result
-            assert "Environment Variables:" in result
\ No newline at end of file
+            assert "Environment Variables:" in result
+
+
+class TestHelpers:
+    """Test cases for text helper functions."""
+
+    def test_preview_text(self):
+        """Test previews are cut at the limit and marked with an ellipsis."""
+        from src.utils.helpers import preview_text
+
+        assert preview_text("short") == "short"
+        assert preview_text("x" * 100) == "x" * 100
+        assert preview_text("x" * 101) == "x" * 100 + "..."
+        assert preview_text("abcdef", 3) == "abc..."
+        assert preview_text("") == ""
+
+    def test_truncate_text_is_cached(self):
+        """Test truncation results and that repeated calls hit the cache."""
+        from src.utils.helpers import truncate_text
+
+        truncate_text.cache_clear()
+        assert truncate_text("short", 10) == "short"
+        assert truncate_text("abcdefghij", 6) == "abc..."
+        assert truncate_text("abcdefghij", 6) == "abc..."
+        assert truncate_text.cache_info().hits == 1
+
+    def test_display_timestamp_uses_reference_time(self):
+        """Test timestamps in one listing can share a reference time."""
+        from datetime import datetime, timedelta
+        from src.utils.helpers import get_display_timestamp
+
+        now = datetime(2024, 1, 2, 12, 0)
+        assert get_display_timestamp(now - timedelta(days=2), now) == "2 days ago"
+        assert get_display_timestamp(now - timedelta(minutes=5), now) == "5 minutes ago"
+        assert get_display_timestamp(now, now) == "Just now"
+
+    def test_colored_dialogue_formats_each_speech(self):
+        """Test speech is parsed once per quote and recolored in place."""
+        from src.utils.helpers import format_story_with_colored_dialogue, parse_character_speech
+
+        text = 'Alice said "Look out!" and Bob: "Too late."'
+        assert parse_character_speech(text) == [("Alice", "Look out!"), ("Bob", "Too late.")]
+
+        formatted = format_story_with_colored_dialogue(text)
+        assert '"Look out!"' not in formatted
+        assert "Look out!" in formatted and "Too late." in formatted
+
+    def test_validate_environment_cached(self, monkeypatch):
+        """Test environment validation is reused until the cache is cleared."""
+        from src.utils import helpers
+
+        helpers.clear_environment_cache()
+        monkeypatch.setenv('LLM_MODEL', 'test-model')
+        assert helpers.validate_environment()['LLM_MODEL'] is True
+
+        monkeypatch.delenv('LLM_MODEL')
+        assert helpers.validate_environment()['LLM_MODEL'] is True
+
+        helpers.clear_environment_cache()
+        assert helpers.validate_environment()['LLM_MODEL'] is False
+        helpers.clear_environment_cache()
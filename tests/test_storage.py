@@ -7,6 +7,8 @@ import os
 from pathlib import Path
 from datetime import datetime, timedelta
 
+from unittest.mock import patch
+
 import pytest
 
 from src.storage.file_storage import FileStorage
@@ -116,6 +118,42 @@ class TestFileStorage:
         assert len(sessions) == 1
         assert sessions[0].id == sample_session.id
     
+    def test_list_sessions_meta_uses_index(self, populated_storage: FileStorage, sample_session: StorySession):
+        """Test session metadata is served from the index and kept in sync with the files."""
+        index_file = Path(populated_storage.storage_dir) / "_index.json"
+        assert index_file.exists()
+
+        # A fresh storage reads the index instead of loading each session file
+        storage = FileStorage(str(populated_storage.storage_dir))
+        with patch.object(storage, 'load_session') as mock_load:
+            metas = storage.list_sessions_meta()
+        mock_load.assert_not_called()
+        assert {meta.id for meta in metas} == {sample_session.id, "test-session-002", "test-session-003"}
+        assert all(metas[i].last_updated >= metas[i + 1].last_updated for i in range(len(metas) - 1))
+        assert len(storage.list_sessions()) == 3
+
+        # Files deleted or added behind the index's back are picked up
+        (Path(storage.storage_dir) / "test-session-002.json").unlink()
+        populated_storage.save_session(StorySession.create_new(
+            StoryWorld("New premise", "Setting", [], {}, Scene("", "", ""), []), "test-session-004"
+        ))
+        assert {meta.id for meta in storage.list_sessions_meta()} == {
+            sample_session.id, "test-session-003", "test-session-004"
+        }
+
+        storage.delete_session("test-session-003")
+        assert "test-session-003" not in {meta.id for meta in FileStorage(str(storage.storage_dir)).list_sessions_meta()}
+
+        # A same-size rewrite by another writer is picked up through the file's mtime
+        other = FileStorage(str(storage.storage_dir))
+        session = other.load_session("test-session-004")
+        session.world.premise = "Old premise"
+        other.save_session(session)
+        os.utime(Path(storage.storage_dir) / "test-session-004.json", ns=(2_000_000_000 * 10**9,) * 2)
+        meta = {meta.id: meta for meta in storage.list_sessions_meta()}["test-session-004"]
+        assert meta.display_name == other.load_session("test-session-004").get_display_name()
+        assert meta.file_mtime_ns == 2_000_000_000 * 10**9
+
     def test_delete_session_expected_use(self, populated_storage: FileStorage):
         """Test deleting an existing session."""
         # Verify session exists
@@ -212,4 +250,152 @@ class TestStorageModels:
         config = StorageConfig()
         assert config.storage_dir == "stories"
         assert config.max_file_size == 50 * 1024 * 1024
-        assert config.backup_enabled is True
\ No newline at end of file
+        assert config.backup_enabled is True
+
+
+class TestStoryModels:
+    """Test cases for the story world data models."""
+
+    def test_character_memories_bounded_round_trip(self):
+        """Test character memories stay bounded and serialize as a list."""
+        character = Character("Bob", "desc", "pers", "speech", [f"Memory {i}" for i in range(25)])
+
+        assert len(character.memories) == 20
+        assert character.recent_memories(2) == ["Memory 23", "Memory 24"]
+
+        character.memories.append("Memory 25")
+        data = character.to_dict()
+        assert isinstance(data["memories"], list)
+        assert data["memories"][0] == "Memory 6"
+
+        restored = Character.from_dict(json.loads(json.dumps(data)))
+        assert restored == character
+        assert restored.memories.maxlen == 20
+
+    def test_character_relationships_text_invalidation(self):
+        """Test the joined relationships text is rebuilt when relationships change."""
+        character = Character("Bob", "desc", "pers", "speech")
+        assert character.relationships_text == "None"
+
+        character.set_relationship("Alice", "friend")
+        assert character.relationships_text == "Alice: friend"
+
+        character.relationships = {"Carol": "rival"}
+        assert character.relationships_text == "Carol: rival"
+        assert "relationships_text" not in character.to_dict()
+
+    def test_scene_prompt_block_shared_until_changed(self):
+        """Test the scene prompt block is rendered once and rebuilt on change."""
+        scene = Scene("Harbor", "Ships creak at the docks", "Salty and cold")
+        block = scene.prompt_block
+
+        assert scene.prompt_block is block
+        assert "Current Scene: Harbor" in block
+
+        scene.atmosphere = "Stormy"
+        assert "Scene Atmosphere: Stormy" in scene.prompt_block
+        assert "prompt_block" not in scene.to_dict()
+
+        assert scene.active_characters_text == "None"
+        scene.active_characters = ["Alice", "Bob"]
+        assert scene.active_characters_text == "Alice, Bob"
+
+    def test_recent_history_window(self):
+        """Test recent history follows new entries and survives a round trip."""
+        world = StoryWorld(premise="p", setting="s", history=[f"event {i}" for i in range(8)])
+        assert world.recent_history(3) == ["event 5", "event 6", "event 7"]
+
+        world.add_history_entry("event 8")
+        assert world.recent_history() == [f"event {i}" for i in range(4, 9)]
+        assert world.recent_history(7) == [f"event {i}" for i in range(2, 9)]
+        assert len(world.history) == 9
+
+        restored = StoryWorld.from_dict(world.to_dict())
+        assert restored.recent_history(2) == ["event 7", "event 8"]
+        assert "_recent_history" not in world.to_dict()
+
+    def test_relevant_history_selects_entity_mentions(self):
+        """Test history mentioning entities in the query is selected ahead of unrelated events."""
+        world = StoryWorld(
+            premise="p",
+            setting="s",
+            current_scene=Scene("Harbor", "Docks", "Cold", props=["lantern"]),
+            history=["Alice finds a map", "Rain falls", "Bob sleeps", "Alice hides the lantern", "Gulls cry", "Waves crash"]
+        )
+        world.add_character(Character(name="Alice", description="d", personality="p", speech_patterns="s"))
+
+        # Two mentions of Alice, topped up with the latest unmatched earlier entry
+        assert world.relevant_history("I ask alice about it") == [
+            "Alice finds a map", "Bob sleeps", "Alice hides the lantern", "Gulls cry", "Waves crash"
+        ]
+        assert world.relevant_history("I light the Lantern", related=1) == [
+            "Alice hides the lantern", "Gulls cry", "Waves crash"
+        ]
+        assert world.relevant_history("I look around") == world.recent_history(5)
+
+        # Entities only match whole words
+        world.add_character(Character(name="Al", description="d", personality="p", speech_patterns="s"))
+        world.add_history_entry("Al waves from the pier")
+        world.add_history_entry("The tide is also rising")
+        world.add_history_entry("Nothing stirs")
+        assert world.relevant_history("I call to Al", related=1) == [
+            "Al waves from the pier", "The tide is also rising", "Nothing stirs"
+        ]
+        assert world.relevant_history("I also wait", related=1) == world.recent_history(3)
+
+
+class TestStorySession:
+    """Test cases for the story session model."""
+
+    def test_session_stats_cached_until_world_update(self):
+        """Test session stats are computed once and refreshed by update_world."""
+        world = StoryWorld("Premise", "Setting", ["conflict"], {}, Scene("Room", "", ""), [])
+        character = Character("Alice", "Curious", "Brave", "Formal")
+        character.memories.append("Met the narrator")
+        world.add_character(character)
+        session = StorySession.create_new(world)
+
+        stats = session.get_stats()
+        assert (stats.character_count, stats.history_length, stats.conflict_count, stats.total_memories) == (1, 0, 1, 1)
+
+        world.add_history_entry("Something happens")
+        assert session.get_stats() is stats
+
+        session.update_world(world)
+        assert session.get_stats().history_length == 1
+
+        session.world = StoryWorld("Other", "Setting", [], {}, Scene("Room", "", ""), [])
+        assert session.get_stats().character_count == 0
+
+    def test_session_json_bytes_round_trip(self, sample_session: StorySession):
+        """Test sessions serialize to indented UTF-8 JSON and load back from bytes."""
+        sample_session.world.add_history_entry("Café au lait ☕")
+
+        data = sample_session.to_json_bytes()
+
+        assert isinstance(data, bytes)
+        assert b'\n  "id"' in data
+        assert "Café au lait ☕".encode('utf-8') in data
+        restored = StorySession.from_json(data)
+        assert restored.world.history == sample_session.world.history
+        assert json.loads(sample_session.to_json())["id"] == sample_session.id
+
+    def test_session_created_display_cached(self, sample_session: StorySession):
+        """Test the creation timestamp is formatted once and refreshed on reassignment."""
+        sample_session.created_at = datetime(2024, 5, 1, 9, 30)
+        assert sample_session.created_display == "2024-05-01 09:30"
+        assert "created_display" not in sample_session.to_dict()
+
+        sample_session.created_at = datetime(2025, 1, 2, 3, 4)
+        assert sample_session.created_display == "2025-01-02 03:04"
+
+    def test_session_display_name_refreshed_on_world_update(self, sample_session: StorySession):
+        """Test the cached display name follows premise changes applied via update_world."""
+        world = sample_session.world
+        world.premise = "A short premise"
+        sample_session.update_world(world)
+        assert sample_session.display_name == "A short premise"
+
+        world.premise = "A much longer premise that needs truncating"
+        sample_session.update_world(world)
+        assert sample_session.get_display_name() == "A much longer premise that nee..."
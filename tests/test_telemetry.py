@@ -0,0 +1,36 @@
+"""Tests for the telemetry helpers."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from src.utils import telemetry
+
+
+class TestTelemetry:
+    """Test cases for tracing setup and trace spans."""
+
+    def test_setup_telemetry_skips_instrumentation_without_tracing(self, monkeypatch):
+        """Test instrumentation only runs when a token or ENABLE_TRACING is set."""
+        monkeypatch.delenv('LOGFIRE_TOKEN', raising=False)
+        for tracing, expected in (('', {}), ('true', {'pydantic_ai': True, 'openai': True, 'httpx': True})):
+            monkeypatch.setenv('ENABLE_TRACING', tracing)
+            with patch.object(telemetry, '_TELEMETRY_CONFIGURED', False), \
+                    patch.object(telemetry, '_INSTRUMENTED', {}), \
+                    patch.object(telemetry, 'logfire') as mock_logfire:
+                assert telemetry.setup_telemetry() == expected
+                assert mock_logfire.instrument_openai.called == bool(expected)
+
+    def test_trace_span_is_noop_without_tracing(self):
+        """Test trace_span only opens logfire spans when tracing is enabled."""
+        with patch.object(telemetry, 'tracing_enabled', return_value=False), \
+                patch.object(telemetry, 'logfire') as mock_logfire:
+            with telemetry.trace_span('Disabled', value=1) as span:
+                span.set_attribute('key', 'value')
+                span.set_attributes({'other': 2})
+            mock_logfire.span.assert_not_called()
+
+        with patch.object(telemetry, 'tracing_enabled', return_value=True), \
+                patch.object(telemetry, 'logfire') as mock_logfire:
+            telemetry.trace_span('Enabled', value=1)
+            mock_logfire.span.assert_called_once_with('Enabled', value=1)